@@ -0,0 +1,139 @@
+# abilities.py
+# Tabella delle abilità: ogni abilità è una definizione (tipo + numeri) e ogni
+# TIPO ha la sua funzione. I campioni indicano solo l'id dell'abilità
+# (data/champions.json); la definizione viene risolta UNA volta all'inizio
+# della battaglia (BattleCore.resolve_abilities) e il lancio è una chiamata
+# diretta dalla tabella, senza confronti di nomi.
+#
+# Nessun import di pygame: lo usano anche battle_core e champion_data.
+import math
+
+from events import LOG, INFO, CAST, DEATH
+
+# --- Tipi di abilità ---
+SINGLE = "single" # Danno al bersaglio attuale
+AREA = "area" # Danno ai nemici entro 'radius' da chi lancia
+HEAL = "heal" # Cura chi lancia
+LINE = "line" # Danno ai nemici su un segmento verso il bersaglio ('length' x 'width')
+
+# Abilità di chi non ne dichiara una
+DEFAULT_ABILITY = "cura"
+
+
+class AbilityDef:
+    """ Definizione immutabile di un'abilità; 'cast' è la funzione del suo tipo """
+    __slots__ = ("id", "label", "kind", "amount", "radius", "length", "width", "cast")
+
+    def __init__(self, ability_id, label, kind, amount, radius=0.0, length=0.0, width=0.0):
+        if kind not in KIND_HANDLERS:
+            raise ValueError(f"Tipo di abilità sconosciuto: {kind!r} (disponibili: {sorted(KIND_HANDLERS)})")
+        set_field = object.__setattr__
+        set_field(self, "id", ability_id)
+        set_field(self, "label", label) # Nome mostrato nel log
+        set_field(self, "kind", kind)
+        set_field(self, "amount", int(amount)) # Danno o cura
+        set_field(self, "radius", float(radius))
+        set_field(self, "length", float(length))
+        set_field(self, "width", float(width))
+        set_field(self, "cast", KIND_HANDLERS[kind])
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"AbilityDef è immutabile ({key})")
+
+    def __repr__(self):
+        return f"AbilityDef({self.id!r}, {self.kind})"
+
+
+# --- Query condivisa per gli effetti ad area ---
+def units_in_radius(team, index, x, y, radius):
+    """
+    Campioni vivi di 'team' a distanza strettamente minore di 'radius' da (x, y),
+    in ordine di squadra. Con lo SpatialGrid della squadra ('index') si
+    guardano solo le celle vicine invece dell'intera squadra.
+    """
+    if index is not None:
+        return index.query_radius(x, y, radius)
+    r2 = radius * radius
+    return [champ for champ in team
+            if champ.is_alive() and (champ.x - x) ** 2 + (champ.y - y) ** 2 < r2]
+
+
+def _damage_all(caster, ability, victims):
+    for enemy in victims:
+        enemy.take_damage(ability.amount)
+    if LOG.level <= INFO:
+        LOG.emit(CAST, INFO, caster.name, None, len(victims), ability.label)
+        for enemy in victims:
+            if not enemy.is_alive():
+                LOG.emit(DEATH, INFO, caster.name, enemy.name)
+
+
+# --- Funzioni per tipo: (chi lancia, definizione, nemici, alleati, indice dei nemici) ---
+def cast_single(caster, ability, enemy_team, friendly_team, enemy_index):
+    target = caster.target
+    if target and target.is_alive():
+        target.take_damage(ability.amount)
+        if LOG.level <= INFO:
+            LOG.emit(CAST, INFO, caster.name, target.name, ability.amount, ability.label)
+            if not target.is_alive():
+                LOG.emit(DEATH, INFO, caster.name, target.name)
+
+
+def cast_area(caster, ability, enemy_team, friendly_team, enemy_index):
+    _damage_all(caster, ability,
+                units_in_radius(enemy_team, enemy_index, caster.x, caster.y, ability.radius))
+
+
+def cast_heal(caster, ability, enemy_team, friendly_team, enemy_index):
+    caster.hp = min(caster.max_hp, caster.hp + ability.amount)
+    if LOG.level <= INFO:
+        LOG.emit(CAST, INFO, caster.name, caster.name, ability.amount, ability.label)
+
+
+def cast_line(caster, ability, enemy_team, friendly_team, enemy_index):
+    target = caster.target
+    if not target or not target.is_alive():
+        return
+    dx, dy = target.x - caster.x, target.y - caster.y
+    norm = math.hypot(dx, dy)
+    if norm == 0:
+        dx, dy, norm = (1.0 if caster.facing_right else -1.0), 0.0, 1.0
+    dx, dy = dx / norm, dy / norm
+    half_width = ability.width / 2
+    # Il segmento sta tutto nel cerchio di raggio length + width/2 attorno a chi lancia
+    victims = []
+    for enemy in units_in_radius(enemy_team, enemy_index, caster.x, caster.y,
+                                 ability.length + half_width):
+        ex, ey = enemy.x - caster.x, enemy.y - caster.y
+        along = ex * dx + ey * dy
+        if 0 <= along <= ability.length and abs(ex * dy - ey * dx) < half_width:
+            victims.append(enemy)
+    _damage_all(caster, ability, victims)
+
+
+KIND_HANDLERS = {SINGLE: cast_single, AREA: cast_area, HEAL: cast_heal, LINE: cast_line}
+
+
+# --- Registro ---
+ABILITIES = {} # id -> AbilityDef
+
+
+def register_ability(ability_id, label, kind, amount, radius=0.0, length=0.0, width=0.0):
+    """ Aggiunge (o sostituisce) un'abilità nel registro """
+    ability = AbilityDef(ability_id, label, kind, amount, radius, length, width)
+    ABILITIES[ability_id] = ability
+    return ability
+
+
+def get_ability(ability_id):
+    """ Definizione dell'abilità (None = abilità di default) """
+    try:
+        return ABILITIES[ability_id or DEFAULT_ABILITY]
+    except KeyError:
+        raise ValueError(f"Abilità sconosciuta: {ability_id!r}") from None
+
+
+register_ability("sfera_mistica", "Sfera Mistica", SINGLE, 150)
+register_ability("giudizio", "Giudizio", AREA, 100, radius=150)
+register_ability("cura", "Cura", HEAL, 50)
+register_ability("raffica_precisa", "Raffica Precisa", LINE, 120, length=500, width=60)
@@ -1,200 +1,64 @@
 # battle.py
-import pygame
-import random
-import copy
 import math
 
+import pygame
+
 # Importiamo da config.py
-from config import draw_text, TEXT_FONT, GREEN, RED, BLUE, BLACK, WHITE
+from config import draw_text, render_text, TEXT_FONT, GREEN, RED, BLUE, BLACK, WHITE
+
+# La logica headless della battaglia
+from battle_core import BattleCore, ARENA_BOUNDS
+from scheduler import FixedStepScheduler, SPEEDS
+from replay import ReplayPlayer
 
-# Importiamo la classe Champion aggiornata
-from champions import Champion, SPRITE_SIZE
+# --- Costanti di Rendering ---
+ARENA_RECT = ARENA_BOUNDS
+SPRITE_CELL = 84 # Lato di una cella dell'atlas (ci sta anche l'anello dell'abilità)
+SPELL_EFFECT_KEY = ("__spell__",)
 
-class BattleManager:
+# Tasti della velocità (1x, 2x, 4x, 16x)
+SPEED_KEYS = {pygame.K_1: SPEEDS[0], pygame.K_2: SPEEDS[1], pygame.K_3: SPEEDS[2], pygame.K_4: SPEEDS[3]}
+
+class BattleManager(BattleCore):
     """
     Gestisce la logica e il rendering della battaglia IN TEMPO REALE.
+    La logica vera e propria sta in BattleCore (battle_core.py):
+    qui aggiungiamo solo il ritmo (scheduler a passo fisso) e il disegno.
     """
-    def __init__(self, player_team_base, enemy_team_base, champions_database):
+    def __init__(self, player_team_base, enemy_team_base, champions_database, seed=None,
+                 use_board=False):
         # self.attack_sound = attack_sound
-        self.champions_database = champions_database
-        
-        # --- Copia i Campioni ---
-        # Creiamo copie da battaglia con la nuova logica
-        self.player_team = self.create_battle_copies(player_team_base)
-        self.enemy_team = self.create_battle_copies(enemy_team_base)
-        self.all_champs = self.player_team + self.enemy_team
-
-        # --- Posiziona i Campioni ---
-        # Posiziona le squadre sulla scacchiera
-        self.setup_board_positions()
-        
-        self.is_over = False
-        self.winner = None
-        self.clock = pygame.time.Clock() # Per calcolare il delta_time
-
-    # In battle.py, sostituisci l'intero metodo create_battle_copies (inizia circa alla riga 30)
-
-    def create_battle_copies(self, base_team):
-        """ 
-        Crea copie da battaglia dei campioni.
-        Questa funzione ORA FORZA i dati corretti presi dal database.
-        """
-        battle_team = []
-        for c in base_team:
-            
-            # --- IL MARTELLO ---
-            # Non ci fidiamo del campione 'c'. Cerchiamo il campione "vero"
-            # nel nostro database per recuperare i dati che potrebbero mancare.
-            
-            # 1. Trova il "template" corretto dal database
-            template = None
-            for db_champ in self.champions_database:
-                if db_champ.name == c.name:
-                    template = db_champ
-                    break
-            
-            if not template:
-                print(f"!!! ERRORE GRAVE: Impossibile trovare {c.name} nel database !!!")
-                continue # Salta questo campione
-
-            # 2. Creiamo una NUOVA istanza Champion usando i dati del template
-            #    e sovrascrivendo con i dati di 'c' (come HP, Livello)
-            
-            battle_copy = Champion(
-                c.name,
-                # Usa gli HP di 'c' se esistono, altrimenti quelli del template
-                getattr(c, 'base_hp', template.base_hp), 
-                getattr(c, 'base_attack', template.base_attack),
-                # template.image_path, # Sempre dal template
-                getattr(c, 'base_defense', template.base_defense),
-                template.crit_chance, # Sempre dal template
-                template.mana_max,
-                template.mana_start,
-                template.attack_speed,
-                template.attack_range,
-                # template.sprite_path, # <-- Preso a forza dal template!
-                # template.sprite_offset_y # <-- Preso a forza!
-            )
-
-            # 3. Applica i modificatori di livello (se 'c' era Lvl 2+)
-            battle_copy.level = getattr(c, 'level', 1)
-            if battle_copy.level > 1:
-                multiplier = 1.6 if battle_copy.level == 2 else 2.5
-                battle_copy.base_hp = int(battle_copy.base_hp * multiplier)
-                battle_copy.base_attack = int(battle_copy.base_attack * multiplier)
-            
-            # 4. Finalizza le statistiche di battaglia
-            battle_copy.max_hp = getattr(c, 'max_hp', battle_copy.base_hp) # Usa gli HP max se potenziati
-            battle_copy.hp = battle_copy.max_hp # Full vita
-            battle_copy.current_mana = battle_copy.mana_start
-            
-            # 5. Carica lo sprite (ora il percorso è garantito)
-            # if battle_copy.sprite_path:
-            #     try:
-            #         print(f"Caricamento FORZATO: {battle_copy.sprite_path}")
-            #         img = pygame.image.load(battle_copy.sprite_path).convert_alpha()
-            #         battle_copy.battle_sprite = pygame.transform.scale(img, SPRITE_SIZE)
-            #     except Exception as e:
-            #         print(f"--- ERRORE --- Impossibile caricare {battle_copy.sprite_path}: {e}")
-            #         battle_copy.battle_sprite = None
-            # else:
-            #     print(f"Attenzione: {battle_copy.name} non ha 'sprite_path' nel database.")
-            #     battle_copy.battle_sprite = None
-            
-            battle_team.append(battle_copy)
-        return battle_team
-
-    def setup_board_positions(self):
-        """ Assegna le posizioni X, Y iniziali ai campioni """
-        # Coordinate fisse per 3 slot (da migliorare in futuro)
-        player_positions = [(400, 300), (400, 400), (400, 500)]
-        enemy_positions = [(800, 300), (800, 400), (800, 500)]
-        
-        for i, champ in enumerate(self.player_team):
-            if i < len(player_positions):
-                champ.x, champ.y = player_positions[i]
-                
-        for i, champ in enumerate(self.enemy_team):
-            if i < len(enemy_positions):
-                champ.x, champ.y = enemy_positions[i]
+        super().__init__(player_team_base, enemy_team_base, champions_database, seed, use_board)
+        self.scheduler = FixedStepScheduler() # Passi fissi + avanti veloce
+        self.build_render_layers()
 
     def handle_event(self, event):
-        # Per ora, la battaglia è automatica, non gestiamo input
-        pass
+        """ La battaglia è automatica: solo velocità (1-4, TAB) e salto al risultato (INVIO) """
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key in SPEED_KEYS:
+            self.scheduler.set_speed(SPEED_KEYS[event.key])
+        elif event.key == pygame.K_TAB:
+            self.scheduler.cycle_speed()
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            self.skip_to_result()
 
-    def update(self):
-        """ Loop di update della battaglia, chiamato 60 volte al secondo """
+    def update(self, real_dt):
+        """
+        Avanza la battaglia di 'real_dt' secondi REALI (misurati dal loop del gioco,
+        che ha l'unico clock): lo scheduler li converte in passi fissi secondo la velocità.
+        """
         if self.is_over:
             return
-            
-        # Calcola il tempo passato (in secondi)
-        delta_time = self.clock.tick(60) / 1000.0
-        if delta_time > 0.1: delta_time = 0.1 # Limite massimo
+        step_dt = self.scheduler.step_dt
+        for _ in range(self.scheduler.advance(real_dt)):
+            self.step(step_dt)
+            if self.is_over:
+                break
 
-        # --- CICLO DI GIOCO PRINCIPALE ---
-        for champ in self.all_champs:
-            
-            if not champ.is_alive():
-                continue
-            
-            # 1. LOGICA BERSAGLIO
-            if not champ.target or not champ.target.is_alive():
-                if champ in self.player_team:
-                    champ.find_closest_target(self.enemy_team)
-                else:
-                    champ.find_closest_target(self.player_team)
-            
-            # Se non ci sono più bersagli, la battaglia è finita
-            if not champ.target:
-                continue
-
-            # Aggiorna la direzione in cui il campione sta guardando
-            if champ.target.x > champ.x:
-                champ.facing_right = True
-            else:
-                champ.facing_right = False
-                
-            # Aggiorna il timer dell'abilità
-            if champ.spell_animation_timer > 0:
-                champ.spell_animation_timer -= delta_time
-                if champ.spell_animation_timer <= 0:
-                    champ.spell_effect_image = None # Rimuovi l'effetto quando finisce
-
-            # 2. LOGICA AZIONE (Movimento o Attacco)
-            distance = champ.get_distance(champ.target)
-            
-            if distance > champ.attack_range:
-                # 2a. MUOVITI (se fuori range)
-                champ.move_towards_target(delta_time)
-            
-            else:
-                # 2b. ATTACCA (se in range)
-                champ.attack_timer += delta_time
-                
-                # Calcola il tempo necessario per un attacco
-                time_per_attack = 1.0 / champ.attack_speed
-                
-                if champ.attack_timer >= time_per_attack:
-                    champ.attack_timer = 0 # Resetta il timer
-                    
-                    # 3. LOGICA ABILITÀ
-                    if champ.current_mana >= champ.mana_max:
-                        # Lancia l'abilità!
-                        champ.cast_spell(self.enemy_team, self.player_team)
-                    else:
-                        # Altrimenti, attacco base
-                        champ.basic_attack(champ.target)
-                        # if self.attack_sound:
-                        #     try: self.attack_sound.play()
-                        #     except: pass # Evita crash se l'audio fallisce
-        
-        # --- CONTROLLO FINE BATTAGLIA ---
-        if not any(c.is_alive() for c in self.enemy_team):
-            self.is_over = True
-            self.winner = "player"
-        elif not any(c.is_alive() for c in self.player_team):
-            self.is_over = True
-            self.winner = "enemy"
+    def skip_to_result(self):
+        """ Simula fino alla fine senza disegnare (stesso risultato, passi identici) """
+        self.run(self.scheduler.step_dt)
 
     def draw_hp_bar(self, surface, champ):
         """ Disegna la barra HP e Mana sopra la pedina """
@@ -221,43 +85,90 @@ class BattleManager:
             pygame.draw.rect(surface, (40, 40, 40), (x - BAR_WIDTH/2, mana_y, BAR_WIDTH, BAR_HEIGHT))
             pygame.draw.rect(surface, BLUE, (x - BAR_WIDTH/2, mana_y, BAR_WIDTH * mana_ratio, BAR_HEIGHT))
 
-    def draw(self, surface):
-        """ Disegna l'intera battaglia (SENZA IMMAGINI - Solo forme geometriche) """
-        surface.fill((15, 15, 15)) # Sfondo scuro
-        
+    # --- Livelli pre-renderizzati ---
+    def build_render_layers(self):
+        """
+        Prepara i livelli statici della battaglia (una volta per battaglia):
+        l'arena viene "cotta" al primo draw, le pedine finiscono in un atlas.
+        """
+        self.arena_layer = None
+        player_set = set(self.player_team)
+        self.unit_sprite_keys = {}
+        samples = {}
+        for champ in self.all_champs:
+            key = (champ.name, champ in player_set, getattr(champ, 'level', 1))
+            self.unit_sprite_keys[champ] = key
+            samples.setdefault(key, champ)
+        self.atlas = SpriteAtlas(SPRITE_CELL)
+        for key, champ in samples.items():
+            self.atlas.add(key, lambda cell, c=champ, k=key: self.render_unit_sprite(cell, c, k[1]))
+        self.atlas.add(SPELL_EFFECT_KEY, self.render_spell_effect)
+        self.atlas.build()
+
+    def build_arena_layer(self, size):
+        """ Sfondo + campo di battaglia in una sola Surface """
+        layer = pygame.Surface(size).convert() if pygame.display.get_surface() else pygame.Surface(size)
+        layer.fill((15, 15, 15)) # Sfondo scuro
         # Disegna il "campo di battaglia" (rettangolo grigio scuro)
-        pygame.draw.rect(surface, (30, 30, 40), (100, 100, 1000, 600))
+        pygame.draw.rect(layer, (30, 30, 40), ARENA_RECT)
+        # Celle della scacchiera esagonale (se la battaglia la usa)
+        if self.board is not None:
+            board = self.board
+            corners = [(board.radius * math.cos(math.radians(60 * i)),
+                        board.radius * math.sin(math.radians(60 * i))) for i in range(6)]
+            half = board.cols // 2
+            for cell, (cx, cy) in enumerate(board.centers):
+                color = (40, 60, 45) if board.col_row(cell)[0] < half else (60, 40, 45)
+                pygame.draw.polygon(layer, color, [(cx + dx, cy + dy) for dx, dy in corners], width=2)
+        return layer
+
+    @staticmethod
+    def render_unit_sprite(cell, champ, is_player):
+        """ Disegna la pedina (SENZA IMMAGINI - Solo forme geometriche) al centro di 'cell' """
+        center = (SPRITE_CELL // 2, SPRITE_CELL // 2)
+
+        # 1. Disegna il corpo (Cerchio con il colore del campione)
+        # Usa il colore definito in champions.py
+        pygame.draw.circle(cell, champ.color, center, 25)
 
-        # --- DISEGNA I CAMPIONI (CERCHI) ---
+        # 2. Indicatore Squadra (Anello esterno sottile)
+        # Verde per Player, Rosso per Nemico (così si distinguono le squadre)
+        team_color = (0, 255, 0) if is_player else (255, 0, 0)
+        pygame.draw.circle(cell, team_color, center, 29, width=2)
+
+        # 3. Indicatore Livello (Bordo Oro interno se Lvl 2+)
+        if getattr(champ, 'level', 1) >= 2:
+            pygame.draw.circle(cell, (255, 215, 0), center, 25, width=3)
+
+        # 4. Iniziale del Nome (al centro del cerchio)
+        # (Es. "G" per Garen)
+        # Fix per Ezreal: Sfondo giallo richiede testo nero
+        text_color = BLACK if champ.name == "Ezreal" else WHITE
+        draw_text(champ.name[0], TEXT_FONT, text_color, cell, center[0], center[1])
+
+    @staticmethod
+    def render_spell_effect(cell):
+        """ EFFETTO ABILITÀ (Geometrico): un cerchio bianco vuoto attorno alla pedina """
+        center = (SPRITE_CELL // 2, SPRITE_CELL // 2)
+        pygame.draw.circle(cell, (255, 255, 255), center, 40, width=3)
+
+    def draw(self, surface):
+        """
+        Disegna l'intera battaglia: arena e pedine sono già pre-renderizzate,
+        per frame facciamo solo blit + barre HP/Mana + popup.
+        """
+        if self.arena_layer is None or self.arena_layer.get_size() != surface.get_size():
+            self.arena_layer = self.build_arena_layer(surface.get_size())
+        surface.blit(self.arena_layer, (0, 0))
+
+        # --- DISEGNA I CAMPIONI ---
         for champ in self.all_champs:
             if champ.is_alive():
-                
-                cx, cy = int(champ.x), int(champ.y)
-
-                # 1. Disegna il corpo (Cerchio con il colore del campione)
-                # Usa il colore definito in champions.py
-                pygame.draw.circle(surface, champ.color, (cx, cy), 25)
-                
-                # 2. Indicatore Squadra (Anello esterno sottile)
-                # Verde per Player, Rosso per Nemico (così si distinguono le squadre)
-                team_color = (0, 255, 0) if champ in self.player_team else (255, 0, 0)
-                pygame.draw.circle(surface, team_color, (cx, cy), 29, width=2)
-
-                # 3. Indicatore Livello (Bordo Oro interno se Lvl 2+)
-                if getattr(champ, 'level', 1) >= 2:
-                    pygame.draw.circle(surface, (255, 215, 0), (cx, cy), 25, width=3)
-
-                # 4. Iniziale del Nome (al centro del cerchio)
-                # (Es. "G" per Garen)
-                # Fix per Ezreal: Sfondo giallo richiede testo nero
-                text_color = BLACK if champ.name == "Ezreal" else WHITE
-                draw_text(champ.name[0], TEXT_FONT, text_color, surface, champ.x, champ.y)
-
-                # 5. EFFETTO ABILITÀ (Geometrico)
+                self.atlas.blit_centered(surface, self.unit_sprite_keys[champ], champ.x, champ.y)
+
                 # Se sta castando, disegniamo un "esplosione" (cerchio bianco vuoto attorno)
                 if champ.spell_animation_timer > 0:
-                    # Un cerchio bianco che pulsa/circonda il campione
-                    pygame.draw.circle(surface, (255, 255, 255), (cx, cy), 40, width=3)
+                    self.atlas.blit_centered(surface, SPELL_EFFECT_KEY, champ.x, champ.y)
 
                 # --- Disegna le barre HP/Mana ---
                 # (Richiama la tua funzione che disegna i rettangolini)
@@ -265,7 +176,7 @@ class BattleManager:
 
                 # --- Disegna i popup danno (Testo fluttuante) ---
                 for popup in list(champ.damage_popup_texts): 
-                    text_obj = TEXT_FONT.render(popup["text"], True, popup["color"])
+                    text_obj = render_text(popup["text"], TEXT_FONT, popup["color"])
                     
                     # Fai salire il testo nel tempo
                     popup["pos"][1] -= 0.5 
@@ -273,12 +184,75 @@ class BattleManager:
                     # Disegna il testo
                     popup_rect = text_obj.get_rect(center=(int(popup["pos"][0]), int(popup["pos"][1])))
                     surface.blit(text_obj, popup_rect)
-                    
-                    # Aggiorna timer
-                    popup["timer"] -= self.clock.get_time() / 1000.0
-                    if popup["timer"] <= 0:
-                        champ.damage_popup_texts.remove(popup)
+                    # (Il timer del popup viene aggiornato in BattleCore.step)
                         
+        # --- Velocità (sotto l'arena) ---
+        speed_text = f"Velocità x{self.scheduler.speed}   [1-4 / TAB] cambia   [INVIO] salta al risultato"
+        text_obj = render_text(speed_text, TEXT_FONT, (160, 160, 160))
+        surface.blit(text_obj, (ARENA_RECT[0], ARENA_RECT[1] + ARENA_RECT[3] + 15))
+
         # --- Disegna il terreno (opzionale, sopra i campioni per un effetto) ---
         # (Qui potremmo aggiungere erba, rocce, ecc. se vogliamo)
-        # pygame.draw.rect(surface, (50, 80, 50), (100, 100, 1000, 600), 5) # Bordo verde
\ No newline at end of file
+        # pygame.draw.rect(surface, (50, 80, 50), (100, 100, 1000, 600), 5) # Bordo verde
+
+
+class SpriteAtlas:
+    """
+    Tutte le pedine di una battaglia in UNA Surface, una cella quadrata per chiave.
+    Si registrano le chiavi con add(chiave, funzione_che_disegna_la_cella),
+    poi build() crea la Surface; per disegnare basta blit con l'area della cella.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.painters = {}
+        self.areas = {}
+        self.surface = None
+
+    def add(self, key, painter):
+        self.painters[key] = painter
+
+    def build(self):
+        size = self.cell_size
+        self.surface = pygame.Surface((max(1, len(self.painters)) * size, size), pygame.SRCALPHA)
+        for i, (key, painter) in enumerate(self.painters.items()):
+            area = pygame.Rect(i * size, 0, size, size)
+            painter(self.surface.subsurface(area))
+            self.areas[key] = area
+        if pygame.display.get_surface(): # Formato del display: blit più veloci
+            self.surface = self.surface.convert_alpha()
+
+    def blit_centered(self, surface, key, x, y):
+        half = self.cell_size // 2
+        surface.blit(self.surface, (int(x) - half, int(y) - half), self.areas[key])
+
+
+class ReplayViewer(BattleManager):
+    """
+    Mostra una replay (replay.py) con lo stesso disegno del BattleManager,
+    senza simulare nulla: update() avanza i frame registrati in tempo reale.
+    """
+    def __init__(self, replay, champions_database):
+        self.player = ReplayPlayer(replay, champions_database)
+        self.board = None # Le replay registrano solo le posizioni
+        self.scheduler = FixedStepScheduler()
+        self.time_debt = 0.0 # Tempo reale non ancora "consumato" dai frame
+        self.build_render_layers()
+
+    # Il disegno legge questi attributi: li prendiamo dal ReplayPlayer
+    player_team = property(lambda self: self.player.player_team)
+    enemy_team = property(lambda self: self.player.enemy_team)
+    all_champs = property(lambda self: self.player.all_champs)
+    is_over = property(lambda self: self.player.is_over)
+    winner = property(lambda self: self.player.winner)
+
+    def skip_to_result(self):
+        while not self.player.is_over:
+            self.player.step()
+
+    def step(self, delta_time):
+        """ Avanza tanti frame quanti ne stanno in 'delta_time' secondi """
+        self.time_debt += delta_time
+        frame_dts = self.player.replay.frame_dts
+        while not self.player.is_over and self.time_debt >= frame_dts[self.player.frame_index]:
+            self.time_debt -= frame_dts[self.player.frame_index]
+            self.player.step()
@@ -0,0 +1,302 @@
+# battle_core.py
+# Nucleo della battaglia SENZA pygame: niente clock, niente finestra.
+# Il BattleManager (battle.py) eredita da qui e aggiunge solo il rendering.
+
+import random
+
+# Registro dei campioni (champions.py e registry.py non importano pygame)
+from registry import ChampionRegistry
+# Indice spaziale per bersagli e abilità ad area
+from spatial import SpatialGrid
+# Scacchiera esagonale opzionale (celle, occupazione, pathfinding)
+from hexboard import HexBoard
+from events import LOG
+from replay import ReplayRecorder
+
+# Passo fisso di simulazione (60 tick al secondo, come il gioco)
+FIXED_DT = 1.0 / 60.0
+# Limite di sicurezza per le simulazioni headless (secondi di gioco)
+MAX_BATTLE_TIME = 300.0
+# Sotto questa dimensione di squadra la scansione lineare costa meno della griglia
+SPATIAL_MIN_UNITS = 20
+
+# --- Schieramento senza scacchiera ---
+ARENA_BOUNDS = (100, 100, 1000, 600) # x, y, larghezza, altezza del campo (battle.ARENA_RECT)
+FRONT_LINE_X = (400, 800) # Prima colonna del giocatore e del nemico
+FORMATION_SPACING = 100 # Distanza fra due pedine vicine (si stringe con squadre grandi)
+FORMATION_MARGIN = 30 # Distanza minima dai bordi dell'arena
+MIN_FORMATION_SPACING = 4
+# Le tre posizioni storiche: le squadre fino a 3 campioni si schierano come sempre
+FRONT_SLOTS_Y = (300, 400, 500)
+
+
+def formation_positions(count, left_side):
+    """
+    Posizioni (x, y) per 'count' campioni schierati a colonne: la prima colonna
+    è la prima linea, le altre vanno verso il bordo della propria metà; ogni
+    colonna è centrata in verticale. Se non ci stanno, la spaziatura si stringe.
+    """
+    front_x = FRONT_LINE_X[0] if left_side else FRONT_LINE_X[1]
+    if count <= len(FRONT_SLOTS_Y):
+        return [(front_x, y) for y in FRONT_SLOTS_Y[:count]]
+    ax, ay, aw, ah = ARENA_BOUNDS
+    depth = (front_x - ax - FORMATION_MARGIN) if left_side else (ax + aw - FORMATION_MARGIN - front_x)
+    height = ah - 2 * FORMATION_MARGIN
+    center_y = ay + ah / 2
+    direction = -1 if left_side else 1
+
+    spacing = FORMATION_SPACING
+    while True:
+        rows = int(height // spacing) + 1
+        columns = -(-count // rows)
+        if (columns - 1) * spacing <= depth or spacing <= MIN_FORMATION_SPACING:
+            break
+        spacing *= 0.9
+
+    positions = []
+    for column in range(columns):
+        in_column = min(rows, count - column * rows)
+        top = center_y - (in_column - 1) * spacing / 2
+        x = front_x + direction * column * spacing
+        positions.extend((x, top + row * spacing) for row in range(in_column))
+    return positions
+
+
+class BattleSetup:
+    """
+    Preparazione comune ai motori di battaglia: registro, seme e generatore,
+    copie da battaglia, abilità risolte, schieramento, stato finale.
+    Non simula nulla: BattleCore (passo fisso) ed EventBattle (event_battle.py,
+    a eventi) la estendono ognuno con il proprio run().
+    """
+    def __init__(self, player_team_base, enemy_team_base, champions_database, seed=None, board=None):
+        # Accetta sia un ChampionRegistry sia la lista del database
+        self.champions_database = champions_database
+        self.registry = ChampionRegistry.of(champions_database)
+
+        # --- Casualità della battaglia ---
+        # Ogni battaglia ha il suo generatore: stesso seme = stessa battaglia
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
+        # --- Copia i Campioni ---
+        self.player_team = self.create_battle_copies(player_team_base)
+        self.enemy_team = self.create_battle_copies(enemy_team_base)
+        self.all_champs = self.player_team + self.enemy_team
+        self.player_set = set(self.player_team) # Appartenenza alla squadra in O(1)
+        self.resolve_abilities()
+
+        # --- Posiziona i Campioni ---
+        self.board = board
+        self.setup_board_positions()
+
+        self.is_over = False
+        self.winner = None
+        self.elapsed_time = 0.0 # Secondi di battaglia simulati
+        self.ticks = 0
+
+    def create_battle_copies(self, base_team):
+        """
+        Crea copie da battaglia dei campioni.
+        Dal campione 'c' prendiamo solo nome e livello: le statistiche
+        arrivano dalla riga precalcolata del registro.
+        ValueError se un campione non è nel registro (come montecarlo.build_team).
+        """
+        battle_team = []
+        for c in base_team:
+            if c.name not in self.registry:
+                raise ValueError(f"Campione sconosciuto: {c.name}")
+            battle_team.append(self.registry.create(c.name, getattr(c, 'level', 1)))
+        return battle_team
+
+    def resolve_abilities(self):
+        """ Ogni campione risolve la sua abilità una volta: durante la battaglia niente lookup """
+        for champ in self.all_champs:
+            champ.resolve_ability()
+
+    def setup_board_positions(self):
+        """ Assegna le posizioni X, Y iniziali ai campioni """
+        if self.board is not None:
+            self.board.deploy(self.player_team, left_side=True)
+            self.board.deploy(self.enemy_team, left_side=False)
+            return
+
+        # Formazione a colonne per squadre di qualunque dimensione
+        for team, left_side in ((self.player_team, True), (self.enemy_team, False)):
+            for champ, (x, y) in zip(team, formation_positions(len(team), left_side)):
+                champ.x, champ.y = x, y
+
+
+class BattleCore(BattleSetup):
+    """
+    Logica della battaglia indipendente dal rendering.
+    Avanza di un delta_time arbitrario con step(), oppure gira
+    fino alla fine con run() a passo fisso, veloce quanto la CPU.
+    Con use_board=True i campioni stanno su una HexBoard (hexboard.py):
+    una pedina per cella e percorsi attorno agli ostacoli; altrimenti
+    si muovono in linea retta nello spazio libero.
+    """
+    def __init__(self, player_team_base, enemy_team_base, champions_database, seed=None,
+                 use_board=False):
+        super().__init__(player_team_base, enemy_team_base, champions_database, seed,
+                         HexBoard() if use_board else None)
+        self.recorder = None # ReplayRecorder opzionale (replay.py)
+        # Oltre questo tempo di gioco la battaglia finisce in pareggio, qualunque
+        # sia il modo in cui avanza (update() del BattleManager, run(), headless)
+        self.max_time = MAX_BATTLE_TIME
+
+        # --- Indici Spaziali (uno per squadra, solo per squadre grandi) ---
+        # Costruiti una volta: poi update() quando un campione si muove e remove() quando muore
+        self.rebuild_grids()
+
+    def rebuild_grids(self):
+        """ Da richiamare se le posizioni cambiano fuori da step() (es. uno schieramento diverso) """
+        self.player_grid = self.build_grid(self.player_team)
+        self.enemy_grid = self.build_grid(self.enemy_team)
+
+    @staticmethod
+    def build_grid(team):
+        """ SpatialGrid della squadra, o None se è abbastanza piccola da scansionarla """
+        if len(team) < SPATIAL_MIN_UNITS:
+            return None
+        grid = SpatialGrid()
+        grid.rebuild(team)
+        return grid
+
+    @staticmethod
+    def drop_dead(grid):
+        """ Toglie dalla griglia i campioni morti (dopo un'abilità, che può colpirne molti) """
+        if grid is not None:
+            for champ in [c for c in grid.cell_of if not c.is_alive()]:
+                grid.remove(champ)
+
+    def step(self, delta_time):
+        """ Avanza la battaglia di 'delta_time' secondi """
+        if self.is_over:
+            return
+
+        LOG.tick = self.ticks
+
+        board = self.board
+        if board is not None:
+            board.remove_dead() # Le celle dei morti tornano libere
+            board.begin_tick()
+
+        # --- CICLO DI GIOCO PRINCIPALE ---
+        for champ in self.all_champs:
+
+            if not champ.is_alive():
+                continue
+
+            is_player = champ in self.player_set
+            own_grid, enemy_grid = ((self.player_grid, self.enemy_grid) if is_player
+                                    else (self.enemy_grid, self.player_grid))
+
+            # 1. LOGICA BERSAGLIO
+            if not champ.target or not champ.target.is_alive():
+                champ.find_closest_target(self.enemy_team if is_player else self.player_team, enemy_grid)
+
+            # Se non ci sono più bersagli, la battaglia è finita
+            if not champ.target:
+                continue
+
+            # Aggiorna la direzione in cui il campione sta guardando
+            if champ.target.x > champ.x:
+                champ.facing_right = True
+            else:
+                champ.facing_right = False
+
+            # Aggiorna il timer dell'abilità
+            if champ.spell_animation_timer > 0:
+                champ.spell_animation_timer -= delta_time
+
+            # 2. LOGICA AZIONE (Movimento o Attacco)
+            if board is not None:
+                # Sulla scacchiera: di cella in cella, attacca solo da fermo
+                moving = board.advance(champ, champ.target, delta_time)
+            else:
+                moving = champ.get_distance(champ.target) > champ.attack_range
+                if moving:
+                    champ.move_towards_target(delta_time)
+
+            if moving:
+                # 2a. MUOVITI (se fuori range)
+                if own_grid is not None:
+                    own_grid.update(champ)
+
+            else:
+                # 2b. ATTACCA (se in range)
+                champ.attack_timer += delta_time
+
+                # Calcola il tempo necessario per un attacco
+                time_per_attack = 1.0 / champ.attack_speed
+
+                if champ.attack_timer >= time_per_attack:
+                    champ.attack_timer = 0 # Resetta il timer
+
+                    # 3. LOGICA ABILITÀ
+                    if champ.current_mana >= champ.mana_max:
+                        # Lancia l'abilità! (sugli avversari di CHI lancia)
+                        if is_player:
+                            champ.cast_spell(self.enemy_team, self.player_team, enemy_grid)
+                        else:
+                            champ.cast_spell(self.player_team, self.enemy_team, enemy_grid)
+                        self.drop_dead(enemy_grid)
+                    else:
+                        # Altrimenti, attacco base
+                        target = champ.target
+                        champ.basic_attack(target, self.rng)
+                        if enemy_grid is not None and not target.is_alive():
+                            enemy_grid.remove(target)
+
+        # --- INVECCHIAMENTO POPUP DANNO ---
+        # (Prima lo faceva draw(): così le liste non crescono all'infinito in headless)
+        for champ in self.all_champs:
+            if champ.damage_popup_texts:
+                for popup in list(champ.damage_popup_texts):
+                    popup["timer"] -= delta_time
+                    if popup["timer"] <= 0:
+                        champ.damage_popup_texts.remove(popup)
+
+        self.elapsed_time += delta_time
+        self.ticks += 1
+        if self.recorder is not None:
+            self.recorder.capture(delta_time)
+
+        # --- CONTROLLO FINE BATTAGLIA ---
+        if not any(c.is_alive() for c in self.enemy_team):
+            self.is_over = True
+            self.winner = "player"
+        elif not any(c.is_alive() for c in self.player_team):
+            self.is_over = True
+            self.winner = "enemy"
+        elif self.ticks >= int(self.max_time / delta_time):
+            self.is_over = True
+            self.winner = "draw"
+
+    def run(self, dt=FIXED_DT, max_time=MAX_BATTLE_TIME):
+        """
+        Simula la battaglia fino alla fine a passo fisso 'dt', senza attese.
+        Se si supera 'max_time' la battaglia finisce in pareggio (winner = "draw").
+        Restituisce il vincitore ("player", "enemy" o "draw").
+        """
+        self.max_time = max_time
+        while not self.is_over:
+            self.step(dt)
+        return self.winner
+
+
+def simulate_battle(player_team_base, enemy_team_base, champions_database,
+                    dt=FIXED_DT, max_time=MAX_BATTLE_TIME, seed=None, record=False,
+                    use_board=False):
+    """
+    Scorciatoia: crea un BattleCore, lo simula e restituisce il BattleCore finito.
+    Con record=True la replay è in battle.replay.
+    """
+    battle = BattleCore(player_team_base, enemy_team_base, champions_database, seed, use_board)
+    if record:
+        battle.recorder = ReplayRecorder(battle)
+    battle.run(dt, max_time)
+    if record:
+        battle.replay = battle.recorder.finish()
+    return battle
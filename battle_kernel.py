@@ -0,0 +1,344 @@
+# battle_kernel.py
+# Motore di battaglia VETTORIZZATO (NumPy, struct-of-arrays).
+# Tiene le colonne (hp, x, y, mana, attack_timer, target, ...) di N battaglie
+# insieme, con forma (battaglie, unità), e le fa avanzare tutte con un solo step().
+# Le regole sono le stesse di BattleCore/Champion (battle_core.py, champions.py),
+# ma le azioni di un tick vengono applicate in modo SIMULTANEO invece che
+# campione per campione: i risultati coincidono in senso statistico, non tick per tick.
+import numpy as np
+
+from registry import ChampionRegistry
+from battle_core import BattleCore, FIXED_DT, MAX_BATTLE_TIME
+from abilities import SINGLE, AREA, HEAL, LINE
+
+# --- Squadre ---
+PLAYER = 0
+ENEMY = 1
+PADDING = -1 # Slot vuoto (squadre più piccole del massimo)
+
+# --- Esito per battaglia ---
+RUNNING = 0
+PLAYER_WIN = 1
+ENEMY_WIN = 2
+DRAW = 3
+WINNER_NAMES = {PLAYER_WIN: "player", ENEMY_WIN: "enemy", DRAW: "draw"}
+
+# --- Abilità (stessa tabella di abilities.py: il tipo diventa un codice intero) ---
+ABILITY_HEAL = 0
+ABILITY_SINGLE = 1
+ABILITY_AOE = 2
+ABILITY_LINE = 3
+ABILITY_CODES = {HEAL: ABILITY_HEAL, SINGLE: ABILITY_SINGLE, AREA: ABILITY_AOE, LINE: ABILITY_LINE}
+MANA_PER_ATTACK = 10
+
+# Colonne per unità: nome -> dtype
+UNIT_COLUMNS = {
+    "team": np.int8,
+    "hp": np.int64,
+    "max_hp": np.int64,
+    "attack": np.int64,
+    "defense": np.int64,
+    "crit_chance": np.float64,
+    "mana": np.int64,
+    "mana_max": np.int64,
+    "time_per_attack": np.float64,
+    "attack_range": np.float64,
+    "move_speed": np.float64,
+    "ability": np.int8,
+    "ability_amount": np.int64,
+    "ability_radius": np.float64, # Raggio (area) o lunghezza (linea)
+    "ability_width": np.float64,
+    "x": np.float64,
+    "y": np.float64,
+    "attack_timer": np.float64,
+    "spell_timer": np.float64,
+    "target": np.int64,
+}
+
+
+def _team_key(team):
+    """ Chiave che identifica le copie da battaglia prodotte da una squadra base """
+    return tuple((c.name, getattr(c, 'level', 1)) for c in team)
+
+
+class BatchBattleKernel:
+    """
+    Simula un lotto di battaglie in parallelo con array NumPy.
+    'battles' è una lista di coppie (player_team_base, enemy_team_base),
+    le stesse squadre che si passerebbero a BattleCore.
+    """
+    def __init__(self, battles, champions_database, seed=None, dt=FIXED_DT):
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+        self.n_battles = len(battles)
+        self.ticks = 0
+
+        # --- Stato iniziale ---
+        # Le copie da battaglia vengono create da BattleCore una volta per
+        # ogni accoppiamento distinto, poi replicate con un indice.
+        registry = ChampionRegistry.of(champions_database) # Uno solo per tutti gli accoppiamenti
+        matchup_rows = []
+        matchup_index = {}
+        battle_matchup = np.empty(self.n_battles, dtype=np.int64)
+        for i, (player_team_base, enemy_team_base) in enumerate(battles):
+            key = (_team_key(player_team_base), _team_key(enemy_team_base))
+            if key not in matchup_index:
+                core = BattleCore(player_team_base, enemy_team_base, registry)
+                matchup_index[key] = len(matchup_rows)
+                matchup_rows.append(self._unit_rows(core))
+            battle_matchup[i] = matchup_index[key]
+
+        self.n_units = max((len(rows) for rows in matchup_rows), default=0)
+        templates = {name: np.zeros((len(matchup_rows), self.n_units), dtype=dtype)
+                     for name, dtype in UNIT_COLUMNS.items()}
+        templates["team"][:] = PADDING
+        templates["target"][:] = -1
+        for m, rows in enumerate(matchup_rows):
+            for u, row in enumerate(rows):
+                for name, value in row.items():
+                    templates[name][m, u] = value
+
+        # Colonne delle battaglie ancora attive (forma: attive x unità)
+        for name in UNIT_COLUMNS:
+            setattr(self, name, templates[name][battle_matchup])
+
+        # --- Risultati ---
+        self.battle_ids = np.arange(self.n_battles) # Id delle righe attive
+        self.winners = np.full(self.n_battles, RUNNING, dtype=np.int8)
+        self.durations = np.zeros(self.n_battles, dtype=np.float64)
+        self.running = np.ones(self.n_battles, dtype=bool)
+
+    @staticmethod
+    def _unit_rows(core):
+        """ Converte i campioni di un BattleCore in righe di colonne """
+        rows = []
+        for team_id, team in ((PLAYER, core.player_team), (ENEMY, core.enemy_team)):
+            for champ in team:
+                rows.append({
+                    "team": team_id,
+                    "hp": champ.hp,
+                    "max_hp": champ.max_hp,
+                    "attack": champ.base_attack,
+                    "defense": champ.base_defense,
+                    "crit_chance": champ.crit_chance,
+                    "mana": champ.current_mana,
+                    "mana_max": champ.mana_max,
+                    "time_per_attack": 1.0 / champ.attack_speed,
+                    "attack_range": champ.attack_range,
+                    "move_speed": champ.move_speed,
+                    "ability": ABILITY_CODES[champ.spell.kind],
+                    "ability_amount": champ.spell.amount,
+                    "ability_radius": champ.spell.length if champ.spell.kind == LINE else champ.spell.radius,
+                    "ability_width": champ.spell.width,
+                    "x": champ.x,
+                    "y": champ.y,
+                })
+        return rows
+
+    @property
+    def is_over(self):
+        return not self.running.any()
+
+    def step(self):
+        """ Avanza TUTTE le battaglie attive di un tick """
+        dt = self.dt
+        alive = (self.hp > 0) & self.running[:, None]
+
+        # 1. LOGICA BERSAGLIO (solo per chi non ha un bersaglio vivo)
+        has_target = self.target >= 0
+        target = np.where(has_target, self.target, 0)
+        target_alive = np.take_along_axis(alive, target, 1) & has_target
+        need_target = alive & ~target_alive
+        if need_target.any():
+            self._find_closest_targets(need_target, alive)
+            has_target = self.target >= 0
+            target = np.where(has_target, self.target, 0)
+
+        acting = alive & has_target
+        spell_active = acting & (self.spell_timer > 0)
+        self.spell_timer[spell_active] -= dt
+
+        # 2. LOGICA AZIONE (Movimento o Attacco)
+        dx = np.take_along_axis(self.x, target, 1) - self.x
+        dy = np.take_along_axis(self.y, target, 1) - self.y
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        moving = acting & (distance > self.attack_range)
+        step_len = np.zeros_like(distance)
+        np.divide(self.move_speed * dt, distance, out=step_len, where=moving & (distance > 0))
+        self.x += dx * step_len
+        self.y += dy * step_len
+
+        in_range = acting & ~moving
+        self.attack_timer[in_range] += dt
+        firing = in_range & (self.attack_timer >= self.time_per_attack)
+        self.attack_timer[firing] = 0.0
+
+        casting = firing & (self.mana >= self.mana_max)
+        attacking = firing & ~casting
+
+        damage = np.zeros_like(self.hp)
+
+        # 3a. ATTACCO BASE (con crit)
+        rows, cols = np.nonzero(attacking)
+        if rows.size:
+            victims = target[rows, cols]
+            crit = self.rng.random(rows.size) < self.crit_chance[rows, cols]
+            hit = self.attack[rows, cols] * np.where(crit, 2, 1) - self.defense[rows, victims]
+            np.add.at(damage, (rows, victims), np.maximum(1, hit))
+            self.mana[rows, cols] = np.minimum(self.mana_max[rows, cols],
+                                               self.mana[rows, cols] + MANA_PER_ATTACK)
+
+        # 3b. ABILITÀ
+        if casting.any():
+            self._cast_spells(casting, target, alive, damage)
+
+        np.maximum(self.hp - damage, 0, out=self.hp)
+        self.ticks += 1
+
+        # --- CONTROLLO FINE BATTAGLIA ---
+        alive = self.hp > 0
+        player_alive = (alive & (self.team == PLAYER)).any(axis=1)
+        enemy_alive = (alive & (self.team == ENEMY)).any(axis=1)
+        finished = self.running & ~(player_alive & enemy_alive)
+        if finished.any():
+            self._finish(finished, np.where(enemy_alive, ENEMY_WIN, PLAYER_WIN))
+
+    def _find_closest_targets(self, need_target, alive):
+        """ Nemico vivo più vicino (a parità di distanza vince l'ordine di squadra) """
+        rows = np.nonzero(need_target.any(axis=1))[0]
+        x = self.x[rows]
+        y = self.y[rows]
+        team = self.team[rows]
+        # d2[b, i, j] = distanza al quadrato fra l'unità i e l'unità j
+        d2 = (x[:, None, :] - x[:, :, None]) ** 2 + (y[:, None, :] - y[:, :, None]) ** 2
+        valid = alive[rows][:, None, :] & (team[:, None, :] != team[:, :, None])
+        d2 = np.where(valid, d2, np.inf)
+        closest = d2.argmin(axis=2)
+        found = valid.any(axis=2)
+
+        sub_target = self.target[rows]
+        sub_need = need_target[rows]
+        sub_target[sub_need] = np.where(found, closest, -1)[sub_need]
+        self.target[rows] = sub_target
+
+    def _cast_spells(self, casting, target, alive, damage):
+        """ Applica le abilità (stessa logica delle funzioni di abilities.py) """
+        # Danno al bersaglio
+        rows, cols = np.nonzero(casting & (self.ability == ABILITY_SINGLE))
+        if rows.size:
+            victims = target[rows, cols]
+            np.add.at(damage, (rows, victims), self.ability_amount[rows, cols] * alive[rows, victims])
+
+        # Danno ad area attorno a chi lancia (solo sulla squadra avversaria)
+        rows, cols = np.nonzero(casting & (self.ability == ABILITY_AOE))
+        if rows.size:
+            dx = self.x[rows] - self.x[rows, cols][:, None]
+            dy = self.y[rows] - self.y[rows, cols][:, None]
+            in_area = (dx * dx + dy * dy < self.ability_radius[rows, cols][:, None] ** 2) & alive[rows] \
+                & (self.team[rows] != self.team[rows, cols][:, None])
+            np.add.at(damage, rows, self.ability_amount[rows, cols][:, None] * in_area)
+
+        # Danno su un segmento verso il bersaglio
+        rows, cols = np.nonzero(casting & (self.ability == ABILITY_LINE))
+        if rows.size:
+            victims = target[rows, cols]
+            cx = self.x[rows, cols]
+            cy = self.y[rows, cols]
+            ux = self.x[rows, victims] - cx
+            uy = self.y[rows, victims] - cy
+            norm = np.sqrt(ux * ux + uy * uy)
+            ux = np.where(norm > 0, ux / np.where(norm > 0, norm, 1), 1.0)
+            uy = np.where(norm > 0, uy / np.where(norm > 0, norm, 1), 0.0)
+            ex = self.x[rows] - cx[:, None]
+            ey = self.y[rows] - cy[:, None]
+            along = ex * ux[:, None] + ey * uy[:, None]
+            across = np.abs(ex * uy[:, None] - ey * ux[:, None])
+            on_line = (along >= 0) & (along <= self.ability_radius[rows, cols][:, None]) \
+                & (across < self.ability_width[rows, cols][:, None] / 2) & alive[rows] \
+                & (self.team[rows] != self.team[rows, cols][:, None]) & alive[rows, victims][:, None]
+            np.add.at(damage, rows, self.ability_amount[rows, cols][:, None] * on_line)
+
+        # Cura su se stessi
+        heal = casting & (self.ability == ABILITY_HEAL)
+        self.hp[heal] = np.minimum(self.max_hp[heal], self.hp[heal] + self.ability_amount[heal])
+
+        self.mana[casting] = 0
+        self.spell_timer[casting] = 1.0
+
+    def _finish(self, finished, outcome):
+        """ Registra l'esito delle battaglie finite e compatta le righe attive """
+        ids = self.battle_ids[finished]
+        self.winners[ids] = outcome[finished]
+        self.durations[ids] = self.ticks * self.dt
+        self.running[finished] = False
+
+        # Compattiamo solo quando buona parte delle righe è ormai inutile
+        if self.running.sum() < 0.75 * len(self.running):
+            keep = self.running
+            for name in UNIT_COLUMNS:
+                setattr(self, name, getattr(self, name)[keep])
+            self.battle_ids = self.battle_ids[keep]
+            self.running = self.running[keep]
+
+    def run(self, max_time=MAX_BATTLE_TIME):
+        """
+        Simula tutte le battaglie fino alla fine.
+        Quelle che superano 'max_time' finiscono in pareggio (DRAW).
+        Restituisce l'array degli esiti (PLAYER_WIN, ENEMY_WIN, DRAW).
+        """
+        max_ticks = int(max_time / self.dt)
+        while self.running.any() and self.ticks < max_ticks:
+            self.step()
+        if self.running.any():
+            self._finish(self.running.copy(), np.full(len(self.running), DRAW, dtype=np.int8))
+        return self.winners
+
+    def summary(self):
+        """ Percentuali di vittoria e durata media delle battaglie concluse """
+        done = self.winners != RUNNING
+        total = max(1, int(done.sum()))
+        return {
+            "battles": int(done.sum()),
+            "player_win_rate": float((self.winners == PLAYER_WIN).sum()) / total,
+            "enemy_win_rate": float((self.winners == ENEMY_WIN).sum()) / total,
+            "draw_rate": float((self.winners == DRAW).sum()) / total,
+            "avg_duration": float(self.durations[done].mean()) if done.any() else 0.0,
+        }
+
+
+def run_batch(player_team_base, enemy_team_base, champions_database, n_battles, seed=None):
+    """ Scorciatoia: lo stesso accoppiamento ripetuto 'n_battles' volte """
+    kernel = BatchBattleKernel([(player_team_base, enemy_team_base)] * n_battles,
+                               champions_database, seed=seed)
+    kernel.run()
+    return kernel.summary()
+
+
+#--- CONFRONTO CON IL MOTORE SCALARE ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    from registry import get_registry
+    from battle_core import simulate_battle
+
+    database = get_registry()
+    by_name = {c.name: c for c in database}
+    player = [by_name["Vi"], by_name["Ahri"], by_name["Shen"]]
+    enemy = [by_name["Garen"], by_name["Ezreal"], by_name["Riven"]]
+
+    random.seed(0)
+    n_scalar = 300
+    start = time.perf_counter()
+    wins = sum(simulate_battle(player, enemy, database).winner == "player"
+               for _ in range(n_scalar))
+    scalar_time = time.perf_counter() - start
+
+    n_batch = 20000
+    start = time.perf_counter()
+    result = run_batch(player, enemy, database, n_batch, seed=0)
+    batch_time = time.perf_counter() - start
+
+    print(f"Scalare:    {wins / n_scalar:.3f} vittorie player ({n_scalar} battaglie, {scalar_time:.2f}s)")
+    print(f"Vettoriale: {result['player_win_rate']:.3f} vittorie player ({n_batch} battaglie, {batch_time:.2f}s)")
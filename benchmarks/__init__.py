@@ -0,0 +1,7 @@
+# benchmarks/
+# Benchmark riproducibili dei punti caldi (battaglia, shop, rendering).
+# Uso (dalla cartella del progetto):
+#   python -m benchmarks                      # esegue tutto e confronta con la baseline
+#   python -m benchmarks --save-baseline      # aggiorna benchmarks/baseline.json
+#   python -m benchmarks battle. --quick      # solo i benchmark che iniziano con "battle."
+from benchmarks.harness import BENCHMARKS, benchmark, run, compare, save, load
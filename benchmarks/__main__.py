@@ -0,0 +1,52 @@
+# benchmarks/__main__.py
+# python -m benchmarks [prefissi...] [--quick] [--out risultati.json]
+#                      [--baseline file.json] [--threshold 0.2] [--save-baseline]
+import argparse
+import os
+import sys
+
+from benchmarks.harness import run, save, load, compare, format_time, DEFAULT_THRESHOLD
+# I moduli registrano i loro benchmark all'import
+from benchmarks import bench_battle, bench_shop, bench_render  # noqa: F401
+from events import LOG, OFF
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark dei punti caldi con confronto sulla baseline.")
+    parser.add_argument("names", nargs="*", help='Prefissi dei benchmark da eseguire (es. "battle.")')
+    parser.add_argument("--quick", action="store_true", help="Meno ripetizioni (più rumore)")
+    parser.add_argument("--out", default="bench_results.json", help="Dove scrivere i risultati (JSON)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline con cui confrontare")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Rallentamento tollerato (0.2 = +20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Salva i risultati come nuova baseline")
+    args = parser.parse_args(argv)
+
+    LOG.configure(OFF) # Nessun evento durante le misure
+    results = run(args.names, args.quick, progress=print)
+    save(args.out, results)
+    print(f"Risultati in {args.out}")
+
+    if args.save_baseline:
+        save(args.baseline, results)
+        print(f"Baseline aggiornata: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("Nessuna baseline: usa --save-baseline per crearla")
+        return 0
+
+    regressions = compare(results, load(args.baseline), args.threshold)
+    if not regressions:
+        print(f"Nessuna regressione oltre il {args.threshold:.0%}")
+        return 0
+    print(f"REGRESSIONI (oltre il {args.threshold:.0%}):")
+    for name, before, now, ratio in regressions:
+        print(f"  {name:40s} {format_time(before)} -> {format_time(now)} (x{ratio:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# benchmarks/bench_battle.py
+# Battaglia: un tick di simulazione a 6/60/600 unità, ricerca dei bersagli, copie da battaglia,
+# scacchiera esagonale piena (pathfinding), battaglia intera col motore a eventi.
+import random
+
+from benchmarks.harness import benchmark
+from registry import get_registry
+from battle_core import BattleCore, FIXED_DT
+from hexboard import HEX_COLS, HEX_ROWS
+from event_battle import EventBattle
+
+SEED = 1234
+
+
+def make_team(size, rng):
+    registry = get_registry()
+    return [registry.create(rng.choice(registry.champions).name, rng.choice((1, 1, 2)))
+            for _ in range(size)]
+
+
+def make_battle(units, seed=SEED):
+    """
+    Battaglia con 'units' unità in totale (metà per squadra), schierate a griglia
+    nelle due metà dell'arena. Griglia fissa (non formation_positions): i numeri
+    restano confrontabili con la baseline anche se lo schieramento cambia.
+    """
+    rng = random.Random(seed)
+    half = units // 2
+    battle = BattleCore(make_team(half, rng), make_team(units - half, rng), get_registry(), seed)
+    for team, x_start in ((battle.player_team, 150), (battle.enemy_team, 650)):
+        columns = max(1, int(len(team) ** 0.5))
+        for i, champ in enumerate(team):
+            champ.x = x_start + (i % columns) * (400 / columns)
+            champ.y = 150 + (i // columns) * (500 / max(1, (len(team) + columns - 1) // columns))
+    battle.rebuild_grids()
+    return battle
+
+
+def tick_benchmark(units):
+    def setup():
+        state = {"battle": make_battle(units)}
+
+        def tick():
+            battle = state["battle"]
+            if battle.is_over: # Battaglia finita: se ne prepara una nuova identica
+                battle = state["battle"] = make_battle(units)
+            battle.step(FIXED_DT)
+        return tick
+    return setup
+
+
+# Lo stesso lavoro di BattleManager.update (senza clock.tick, che aspetterebbe il frame)
+for _units in (6, 60, 600):
+    benchmark(f"battle.tick_{_units}_units", repeat=5)(tick_benchmark(_units))
+
+
+@benchmark("battle.find_closest_target_60_units")
+def find_closest_target():
+    battle = make_battle(60)
+    seekers = battle.player_team
+
+    def run():
+        for champ in seekers:
+            champ.find_closest_target(battle.enemy_team, battle.enemy_grid)
+    return run
+
+
+@benchmark("battle.create_battle_copies_600_units")
+def create_battle_copies():
+    battle = make_battle(6)
+    team = make_team(600, random.Random(SEED))
+    return lambda: battle.create_battle_copies(team)
+
+
+@benchmark("battle.full_battle_3v3", group="macro", repeat=5)
+def full_battle():
+    registry = get_registry()
+    player = [registry.create("Vi", 2), registry.create("Ahri"), registry.create("Shen")]
+    enemy = [registry.create("Garen"), registry.create("Garen"), registry.create("Ezreal")]
+    return lambda: BattleCore(player, enemy, registry, SEED).run()
+
+
+@benchmark("battle.full_battle_3v3_events", group="macro", repeat=5)
+def full_battle_events():
+    """ La stessa battaglia di full_battle_3v3, a eventi discreti """
+    registry = get_registry()
+    player = [registry.create("Vi", 2), registry.create("Ahri"), registry.create("Shen")]
+    enemy = [registry.create("Garen"), registry.create("Garen"), registry.create("Ezreal")]
+    return lambda: EventBattle(player, enemy, registry, SEED).run()
+
+
+@benchmark("battle.tick_hex_board_full", repeat=5)
+def tick_hex_board_full():
+    """ Scacchiera 7x8 piena (una squadra per metà): costo per tick con pathfinding """
+    units = HEX_COLS * HEX_ROWS
+
+    def make():
+        rng = random.Random(SEED)
+        half = units // 2
+        return BattleCore(make_team(half, rng), make_team(units - half, rng), get_registry(),
+                          SEED, use_board=True)
+    state = {"battle": make()}
+
+    def tick():
+        battle = state["battle"]
+        if battle.is_over:
+            battle = state["battle"] = make()
+        battle.step(FIXED_DT)
+    return tick
@@ -0,0 +1,57 @@
+# benchmarks/bench_render.py
+# Rendering su una Surface fuori schermo (driver video "dummy": nessuna finestra).
+import contextlib
+import io
+import os
+import random
+
+from benchmarks.harness import benchmark
+
+SEED = 1234
+
+
+def offscreen():
+    """ pygame inizializzato senza finestra vera; restituisce una Surface grande come lo schermo """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from config import WIDTH, HEIGHT
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((WIDTH, HEIGHT))
+    return pygame.Surface((WIDTH, HEIGHT))
+
+
+@benchmark("render.shop_draw", requires="pygame")
+def shop_draw():
+    surface = offscreen()
+    import game
+    g = game.Game(SEED)
+    g.new_game()
+    shop = g.shop_manager
+    with contextlib.redirect_stdout(io.StringIO()): # ShopManager stampa i messaggi per il giocatore
+        for slot in range(3):
+            shop.buy_champion(shop.shop_champs[slot], slot)
+    return lambda: shop.draw(surface)
+
+
+def battle_draw_benchmark(units):
+    def setup():
+        surface = offscreen()
+        from battle import BattleManager
+        from benchmarks.bench_battle import make_battle, make_team
+        from registry import get_registry
+        rng = random.Random(SEED)
+        half = units // 2
+        battle = BattleManager(make_team(half, rng), make_team(units - half, rng), get_registry(), SEED)
+        # Stesse posizioni del benchmark di simulazione
+        layout = make_battle(units)
+        for champ, placed in zip(battle.all_champs, layout.all_champs):
+            champ.x, champ.y = placed.x, placed.y
+        for _ in range(30): # Qualche popup e barra già in movimento
+            battle.step(1 / 60)
+        return lambda: battle.draw(surface)
+    return setup
+
+
+for _units in (6, 60):
+    benchmark(f"render.battle_draw_{_units}_units", requires="pygame")(battle_draw_benchmark(_units))
@@ -0,0 +1,41 @@
+# benchmarks/bench_shop.py
+# Shop: estrazioni, lunghe sequenze di acquisti con merge, partita headless.
+from benchmarks.harness import benchmark
+from game_core import GameCore
+from headless import HeadlessGame, greedy_policy
+
+SEED = 1234
+
+
+@benchmark("shop.roll_shop")
+def roll_shop():
+    shop = GameCore(SEED).shop_manager
+    return lambda: shop.roll_shop(is_free=True)
+
+
+@benchmark("shop.merge_buy_sequence_1000", repeat=5)
+def merge_buy_sequence():
+    """ 1000 acquisti di fila (con merge e vendite per fare spazio) """
+    def run():
+        game = GameCore(SEED)
+        shop = game.shop_manager
+        for i in range(1000):
+            game.player_gold = 1000
+            if not shop.can_buy(shop.shop_champs[0]):
+                shop.sell_at("bench", 0)
+            shop.buy_champion(shop.shop_champs[0], 0)
+            shop.roll_shop(is_free=True)
+            if i % 100 == 99:
+                game.pool.reset() # Il pool non si esaurisce
+    return run
+
+
+@benchmark("shop.pool_roll_many_10000", repeat=5)
+def pool_roll_many():
+    game = GameCore(SEED)
+    return lambda: game.pool.roll_many(5, 10000, game.rng)
+
+
+@benchmark("game.headless_greedy_10_rounds", group="macro", repeat=3)
+def headless_game():
+    return lambda: HeadlessGame(SEED, max_rounds=10).play(greedy_policy)
@@ -0,0 +1,141 @@
+# benchmarks/harness.py
+# Registro dei benchmark, misurazione, salvataggio JSON e confronto con la baseline.
+import json
+import platform
+import statistics
+import sys
+import time
+
+# nome -> Benchmark (nell'ordine di registrazione)
+BENCHMARKS = {}
+
+# Tempo minimo di una ripetizione quando 'number' non è fissato
+MIN_REPEAT_TIME = 0.05
+# Rallentamento oltre il quale un benchmark è una regressione (0.20 = +20%)
+DEFAULT_THRESHOLD = 0.20
+
+
+class Benchmark:
+    """
+    Un benchmark: 'setup()' prepara lo stato (non misurato) e restituisce
+    la funzione da misurare. 'group' è "micro" (una singola operazione)
+    o "macro" (un pezzo di gioco intero).
+    """
+    def __init__(self, name, setup, group="micro", repeat=7, number=None, requires=None):
+        self.name = name
+        self.setup = setup
+        self.group = group
+        self.repeat = repeat
+        self.number = number
+        self.requires = requires # Modulo opzionale (es. "pygame"): se manca si salta
+
+    def available(self):
+        if not self.requires:
+            return True
+        try:
+            __import__(self.requires)
+        except ImportError:
+            return False
+        return True
+
+
+def benchmark(name, group="micro", repeat=7, number=None, requires=None):
+    """ Decoratore: registra la funzione di setup di un benchmark """
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, group, repeat, number, requires)
+        return setup
+    return register
+
+
+def autorange(func):
+    """ Quante chiamate servono per una ripetizione di almeno MIN_REPEAT_TIME """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= MIN_REPEAT_TIME:
+            return number
+        number *= 2
+
+
+def measure(bench, quick=False):
+    """ Misura un benchmark: secondi per chiamata (mediana, minimo, ripetizioni) """
+    func = bench.setup()
+    number = bench.number or autorange(func)
+    repeat = 3 if quick else bench.repeat
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "group": bench.group,
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(names=None, quick=False, progress=None):
+    """ Esegue i benchmark (tutti o quelli il cui nome inizia con uno di 'names') """
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and not any(name.startswith(prefix) for prefix in names):
+            continue
+        if not bench.available():
+            if progress:
+                progress(f"{name:40s} saltato (manca {bench.requires})")
+            continue
+        results[name] = measure(bench, quick)
+        if progress:
+            progress(f"{name:40s} {format_time(results[name]['median'])}")
+    return results
+
+
+def environment():
+    """ Dove sono stati misurati i risultati (i confronti hanno senso sulla stessa macchina) """
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def save(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Confronta le mediane con la baseline.
+    Restituisce [(nome, baseline, attuale, rapporto)] per i benchmark
+    più lenti di oltre 'threshold' (i nuovi benchmark non contano).
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["median"]:
+            continue
+        ratio = result["median"] / base["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["median"], result["median"], ratio))
+    return regressions
+
+
+def format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
@@ -0,0 +1,322 @@
+# bot.py
+# Avversari "bot": un giocatore con oro, shop e panchina propri che, a ogni
+# fase di shop, cerca la sequenza di acquisti/vendite migliore con una beam search
+# a tempo limitato (di default 50 ms: il client interattivo non si blocca).
+# Le azioni sono acquisto, vendita e reroll: il reroll chiude la sequenza
+# (lo shop nuovo non si conosce) e vale quanto le copie utili che si aspetta.
+#
+# Le sequenze si valutano con una stima ANALITICA della battaglia (legge quadratica
+# di Lanchester: forza = DPS totale x HP totali), senza simulare nulla.
+# Gli stati già valutati stanno in una tabella di trasposizione indicizzata
+# sullo stato "canonico" (oro, unità possedute, carte in vendita).
+import random
+import time
+from collections import Counter
+
+from registry import ChampionRegistry, MAX_LEVEL
+from pool import MAX_PLAYER_LEVEL, copies_for_level
+from shop_core import ShopCore, BUY_COST, REROLL_COST, SELL_PRICE
+from game_core import STARTING_GOLD, BASE_GOLD, WIN_GOLD, BOARD_SLOTS, BENCH_SLOTS
+
+# Tempo massimo per una fase di shop del bot (secondi)
+BOT_TIME_BUDGET = 0.050
+BEAM_WIDTH = 8
+MAX_DEPTH = 6 # Azioni per ricerca
+MAX_REROLLS = 6 # Reroll per round
+# Pesi della valutazione (la probabilità di vittoria vale da 0 a 1)
+GOLD_WEIGHT = 0.004 # Oro tenuto da parte...
+GOLD_CAP = 10 # ...fino a questa soglia: oltre non vale nulla e si spende
+PROGRESS_WEIGHT = 0.06 # Avanzamento verso i merge (vedi merge_progress)
+# Oltre questa dimensione la tabella di trasposizione si svuota
+CACHE_LIMIT = 50000
+
+
+class BattleEstimator:
+    """
+    Stima veloce dell'esito di una battaglia fra due squadre [(nome, livello), ...].
+    Forza di Lanchester: (somma dei DPS) x (somma degli HP).
+    """
+    def __init__(self, champions_database):
+        self.registry = ChampionRegistry.of(champions_database)
+        self.unit_cache = {} # (nome, livello) -> (hp, dps)
+
+    def unit(self, key):
+        stats = self.unit_cache.get(key)
+        if stats is None:
+            name, level = key
+            row = self.registry.stats(name, level)
+            template = self.registry.template(name)
+            dps = row.attack * template.attack_speed * (1 + template.crit_chance)
+            stats = self.unit_cache[key] = (row.hp, dps)
+        return stats
+
+    def strength(self, team):
+        total_hp = 0
+        total_dps = 0.0
+        for key in team:
+            hp, dps = self.unit(key)
+            total_hp += hp
+            total_dps += dps
+        return total_hp * total_dps
+
+    def unit_strength(self, key):
+        hp, dps = self.unit(key)
+        return hp * dps
+
+    def win_probability(self, team, enemy_team):
+        """ Probabilità (stimata) che 'team' batta 'enemy_team' """
+        mine = self.strength(team)
+        theirs = self.strength(enemy_team)
+        if mine + theirs == 0:
+            return 0.5
+        return mine / (mine + theirs)
+
+    def best_board(self, units, slots):
+        """ I 'slots' campioni più forti fra quelli posseduti """
+        return sorted(units, key=self.unit_strength, reverse=True)[:slots]
+
+
+class BotPlayer:
+    """
+    Giocatore controllato dal computer. Ha gli stessi dati di un giocatore
+    (oro, livello, scacchiera, panchina) e uno ShopCore sul pool condiviso,
+    quindi compra e vende con le stesse regole (e toglie copie al giocatore!).
+    """
+    def __init__(self, champions_database, pool, seed=None, time_budget=BOT_TIME_BUDGET,
+                 beam_width=BEAM_WIDTH, max_depth=MAX_DEPTH):
+        self.rng = random.Random(seed)
+        self.registry = ChampionRegistry.of(champions_database)
+        self.estimator = BattleEstimator(self.registry)
+        self.time_budget = time_budget
+        self.beam_width = beam_width
+        self.max_depth = max_depth
+        self.cache = {} # Tabella di trasposizione: stato canonico -> valutazione
+        self.cache_hits = 0
+        self.rerolls = 0 # Reroll fatti nella fase di shop corrente
+        self.card_chances = {} # nome -> probabilità di una carta dello shop (per ricerca)
+        self.board_slots = BOARD_SLOTS
+        self.bench_slots = BENCH_SLOTS
+        self.reset_player()
+        self.shop_manager = ShopCore(self, self.registry, seed=self.rng.getrandbits(64), pool=pool)
+
+    def reset_player(self):
+        self.player_gold = STARTING_GOLD
+        self.player_level = 1
+        self.board = []
+        self.bench = []
+
+    def new_game(self):
+        """ Nuova partita (il pool condiviso lo resetta chi lo possiede) """
+        self.reset_player()
+        self.shop_manager.reset()
+
+    # --- Fase di shop ---
+    def play_shop_phase(self, reference_board=()):
+        """
+        Compra, vende e piazza entro il tempo limite. 'reference_board' è la
+        squadra avversaria conosciuta (quella del giocatore) usata per valutare.
+        Restituisce la scacchiera con cui il bot va in battaglia.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        reference = [(c.name, getattr(c, 'level', 1)) for c in reference_board if c]
+        self.rerolls = 0
+        while True:
+            plan = self.search(reference, deadline)
+            self.apply(plan)
+            # Un piano che finisce con un reroll continua sullo shop nuovo
+            if not plan or plan[-1][0] != "reroll" or time.perf_counter() >= deadline:
+                break
+        self.arrange_board()
+        return self.board
+
+    def end_round(self, won, round_number):
+        """ Economia di fine round (stesse regole del giocatore) e nuovo shop """
+        self.player_gold += BASE_GOLD + (WIN_GOLD if won else 0)
+        self.player_level = min(MAX_PLAYER_LEVEL, 1 + round_number // 2)
+        self.shop_manager.roll_shop(is_free=True)
+
+    # --- Ricerca ---
+    def owned_units(self):
+        return tuple(sorted((c.name, c.level) for c in self.board + self.bench))
+
+    def search(self, reference, deadline):
+        """
+        Beam search sulle sequenze di azioni ("buy", slot) / ("sell", unità) / ("reroll", None).
+        Restituisce la sequenza migliore trovata prima di 'deadline'.
+        """
+        self.card_chances = {} # Il pool e il livello cambiano fra una ricerca e l'altra
+        shop = tuple(c.name if c else None for c in self.shop_manager.shop_champs)
+        root = (self.player_gold, self.owned_units(), shop)
+        best_plan, best_score = (), self.evaluate(root, reference)
+        beam = [(best_score, root, ())]
+        for _ in range(self.max_depth):
+            children = []
+            for _, state, plan in beam:
+                for action, child in self.expand(state):
+                    if time.perf_counter() >= deadline:
+                        return best_plan
+                    score = self.evaluate(child, reference)
+                    children.append((score, child, plan + (action,)))
+                    if score > best_score:
+                        best_score, best_plan = score, plan + (action,)
+            if not children:
+                break
+            # Stati uguali raggiunti con ordini diversi: se ne tiene uno solo
+            unique = {}
+            for entry in children:
+                if entry[1] not in unique or entry[0] > unique[entry[1]][0]:
+                    unique[entry[1]] = entry
+            beam = sorted(unique.values(), key=lambda e: e[0], reverse=True)[:self.beam_width]
+        return best_plan
+
+    def expand(self, state):
+        """ Azioni valide da 'state' e stati risultanti (dopo un reroll shop = None: fine) """
+        gold, units, shop = state
+        if shop is None:
+            return
+        capacity = self.board_slots + self.bench_slots
+        counts = Counter(units)
+        if gold >= BUY_COST:
+            seen = set()
+            for slot, name in enumerate(shop):
+                if name is None or name in seen:
+                    continue
+                seen.add(name)
+                if len(units) >= capacity and counts[(name, 1)] < 2:
+                    continue # Niente spazio e nessun merge
+                new_shop = shop[:slot] + (None,) + shop[slot + 1:]
+                yield ("buy", slot), (gold - BUY_COST, self.add_unit(units, name), new_shop)
+        for key in counts:
+            remaining = list(units)
+            remaining.remove(key)
+            yield ("sell", key), (gold + SELL_PRICE, tuple(remaining), shop)
+        if self.rerolls < MAX_REROLLS and gold >= REROLL_COST + BUY_COST:
+            yield ("reroll", None), (gold - REROLL_COST, units, None)
+
+    @staticmethod
+    def add_unit(units, name):
+        """ Aggiunge un Lvl 1 e applica i merge a catena (come ShopCore) """
+        units = list(units)
+        key = (name, 1)
+        units.append(key)
+        while units.count(key) >= 3:
+            for _ in range(3):
+                units.remove(key)
+            key = (name, key[1] + 1)
+            units.append(key)
+        return tuple(sorted(units))
+
+    def evaluate(self, state, reference):
+        """ Valutazione con tabella di trasposizione """
+        key = (state, tuple(reference))
+        score = self.cache.get(key)
+        gold, units, shop = state
+        if score is not None:
+            self.cache_hits += 1
+        else:
+            board = self.estimator.best_board(units, self.board_slots)
+            if reference:
+                score = self.estimator.win_probability(board, reference)
+            else:
+                score = self.estimator.strength(board) / (1.0 + self.estimator.strength(board))
+            score += GOLD_WEIGHT * min(gold, GOLD_CAP) + PROGRESS_WEIGHT * self.merge_progress(units)
+            if len(self.cache) >= CACHE_LIMIT:
+                self.cache.clear()
+            self.cache[key] = score
+        if shop is None:
+            # Dipende dal pool e dal livello del momento: fuori dalla tabella
+            score += self.reroll_value(gold, units)
+        return score
+
+    @staticmethod
+    def merge_progress(units):
+        """
+        Avanzamento verso i merge: per ogni campione, stelle già fatte più
+        copie possedute / copie necessarie per la stella successiva.
+        Cresce con ogni copia comprata (Lvl 1 + Lvl 1 = 2/3, un Lvl 2 = 1 + 3/9...).
+        """
+        copies = Counter()
+        for name, level in units:
+            copies[name] += copies_for_level(level)
+        progress = 0.0
+        for owned in copies.values():
+            owned = min(owned, copies_for_level(MAX_LEVEL))
+            stars = 1
+            while copies_for_level(stars + 1) <= owned:
+                stars += 1
+            progress += stars - 1 + owned / copies_for_level(stars + 1)
+        return progress
+
+    def card_chance(self, name):
+        """ Probabilità che una carta dello shop sia 'name' (pool condiviso, livello del bot) """
+        chance = self.card_chances.get(name)
+        if chance is None:
+            pool = self.shop_manager.pool
+            champ_id = self.registry.id_of(name)
+            tier = self.registry.templates[champ_id].tier
+            chance = 0.0
+            if pool.tier_totals[tier] > 0:
+                odds = pool.level_odds[min(max(self.player_level, 1), MAX_PLAYER_LEVEL)]
+                chance = odds[pool.tiers.index(tier)] * pool.counts[champ_id] / pool.tier_totals[tier]
+            self.card_chances[name] = chance
+        return chance
+
+    def reroll_value(self, gold, units):
+        """
+        Valore atteso di uno shop nuovo: le copie dei campioni posseduti che ci si
+        aspetta di trovare (e di potersi permettere), ognuna pesata come in merge_progress
+        meno l'oro che costa comprarla (gratis solo sopra GOLD_CAP, come in evaluate).
+        """
+        budget = gold // BUY_COST
+        if budget <= 0:
+            return 0.0
+        buy_cost = GOLD_WEIGHT * min(BUY_COST, max(0, BUY_COST - (gold - GOLD_CAP)))
+        full = len(units) >= self.board_slots + self.bench_slots
+        counts = Counter(units)
+        copies = Counter()
+        for name, level in units:
+            copies[name] += copies_for_level(level)
+        hits = 0.0
+        gain = 0.0
+        for name, owned in copies.items():
+            if owned >= copies_for_level(MAX_LEVEL) or (full and counts[(name, 1)] < 2):
+                continue # Già al massimo, o niente posto per una copia che non fa merge
+            needed = copies_for_level(MAX_LEVEL)
+            while needed // 3 > owned:
+                needed //= 3
+            value = PROGRESS_WEIGHT / needed - buy_cost
+            if value <= 0:
+                continue # Non la comprerebbe nemmeno trovandola
+            expected = self.shop_manager.shop_size * self.card_chance(name)
+            hits += expected
+            gain += expected * value
+        if hits == 0:
+            return 0.0
+        return gain * min(1.0, budget / hits)
+
+    # --- Esecuzione del piano sul vero shop ---
+    def apply(self, plan):
+        shop = self.shop_manager
+        for action, arg in plan:
+            if action == "reroll":
+                shop.roll_shop()
+                self.rerolls += 1
+            elif action == "buy":
+                self.arrange_board() # Fa spazio in panchina prima di comprare
+                shop.buy_champion(shop.shop_champs[arg], arg)
+            else:
+                name, level = arg
+                for where in ("bench", "board"):
+                    champs = getattr(self, where)
+                    index = next((i for i, c in enumerate(champs) if c.name == name and c.level == level), None)
+                    if index is not None:
+                        shop.sell_at(where, index)
+                        break
+
+    def arrange_board(self):
+        """ In scacchiera i campioni più forti, in panchina gli altri """
+        units = self.board + self.bench
+        units.sort(key=lambda c: self.estimator.unit_strength((c.name, c.level)), reverse=True)
+        self.board[:] = units[:self.board_slots]
+        self.bench[:] = units[self.board_slots:]
+        self.shop_manager.copy_index.rebuild(self.board, self.bench)
@@ -0,0 +1,215 @@
+# bot_client.py
+# Client "bot" del server (server.py) per le prove di carico in locale:
+# tanti client asyncio, uno per lobby, giocano partite intere con una
+# policy semplice sullo stato che ricevono (compra finché c'è oro e spazio,
+# porta la panchina in scacchiera, conferma) e misurano la latenza di ogni
+# richiesta, dall'invio alla risposta.
+#
+# Uso:
+#   python bot_client.py --local --lobbies 200          # server nello stesso processo
+#   python bot_client.py --port 8765 --lobbies 500 --rounds 10
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import protocol
+from game_core import BOARD_SLOTS, BENCH_SLOTS
+from shop_core import BUY_COST
+from server import LobbyServer, DEFAULT_HOST, DEFAULT_PORT, percentiles
+
+KIND_NAMES = {protocol.JOIN: "join", protocol.BUY: "buy", protocol.SELL: "sell",
+              protocol.REROLL: "reroll", protocol.PLACE: "place", protocol.READY: "ready"}
+# Pausa massima prima di ogni azione (un giocatore vero non manda tutto insieme)
+THINK_TIME = 0.01
+# Apertura delle connessioni distribuita su questo intervallo (secondi)
+RAMP_TIME = 1.0
+
+
+class ServerError(Exception):
+    """ Il server ha risposto ERROR a una richiesta """
+    def __init__(self, code):
+        super().__init__(protocol.ERROR_NAMES.get(code, str(code)))
+        self.code = code
+
+
+class BotClient:
+    """ Una connessione = una lobby. latencies[tipo] = tempi di risposta in secondi """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, seed=None, think_time=THINK_TIME):
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.think_time = think_time
+        self.reader = None
+        self.writer = None
+        self.request_id = 0
+        self.state = None
+        self.rounds = 0
+        self.wins = 0
+        self.errors = 0
+        self.latencies = {}
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.write(protocol.encode(protocol.LEAVE, self.request_id + 1))
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def request(self, kind, payload=b""):
+        """ Manda una richiesta e aspetta la risposta; ServerError se è un ERROR """
+        if self.think_time:
+            await asyncio.sleep(self.rng.random() * self.think_time)
+        self.request_id = (self.request_id + 1) & 0xFFFF
+        start = time.perf_counter()
+        self.writer.write(protocol.encode(kind, self.request_id, payload))
+        await self.writer.drain()
+        reply_kind, reply_id, reply = await protocol.read_message(self.reader)
+        self.latencies.setdefault(kind, []).append(time.perf_counter() - start)
+        if reply_id != self.request_id:
+            raise protocol.ProtocolError(f"Risposta {reply_id} alla richiesta {self.request_id}")
+        if reply_kind == protocol.ERROR:
+            self.errors += 1
+            raise ServerError(reply[0] if reply else 0)
+        if reply_kind == protocol.RESULT:
+            result = protocol.decode_result(reply)
+            self.state = result["state"]
+            return result
+        self.state = protocol.decode_state(reply)
+        return self.state
+
+    async def try_request(self, kind, payload=b""):
+        """ Come request(), ma un'azione rifiutata restituisce None """
+        try:
+            return await self.request(kind, payload)
+        except ServerError as error:
+            if error.code == protocol.ERR_GAME_OVER:
+                raise
+            return None
+
+    # --- Policy ---
+    async def shop_phase(self):
+        """ Compra finché c'è oro e posto in panchina, poi riempie la scacchiera """
+        for slot in range(len(self.state["shop"])):
+            state = self.state
+            if state["gold"] < BUY_COST or len(state["bench"]) >= BENCH_SLOTS:
+                break
+            if state["shop"][slot] is not None:
+                await self.try_request(protocol.BUY, protocol.buy_payload(slot))
+        while self.state["bench"] and len(self.state["board"]) < BOARD_SLOTS:
+            if await self.try_request(protocol.PLACE, protocol.place_payload("bench", 0, "board")) is None:
+                break
+        # Panchina piena: si vende l'ultimo arrivato per fare spazio
+        if len(self.state["bench"]) >= BENCH_SLOTS:
+            await self.try_request(protocol.SELL, protocol.sell_payload("bench", len(self.state["bench"]) - 1))
+
+    async def play(self, rounds):
+        """ Entra in una lobby e gioca fino a 'rounds' round (o fino alla fine della partita) """
+        await self.connect()
+        try:
+            await self.request(protocol.JOIN, protocol.join_payload(self.seed or 0))
+            while self.rounds < rounds and self.state["hp"] > 0:
+                await self.shop_phase()
+                result = await self.request(protocol.READY)
+                self.rounds += 1
+                self.wins += result["winner"] == "player"
+        except ServerError as error:
+            if error.code != protocol.ERR_GAME_OVER:
+                raise
+        finally:
+            await self.close()
+        return self
+
+
+# --- Prova di carico ---
+async def _run_bot(client, delay, rounds):
+    await asyncio.sleep(delay)
+    return await client.play(rounds)
+
+
+async def load_test(host=DEFAULT_HOST, port=DEFAULT_PORT, lobbies=100, rounds=10, seed=0,
+                    think_time=THINK_TIME, ramp_time=RAMP_TIME, local=False, workers=None):
+    """
+    'lobbies' client in parallelo, ognuno in una lobby sua.
+    Con local=True il server gira nello stesso processo (su una porta libera).
+    Restituisce il riepilogo (dizionario).
+    """
+    server = None
+    if local:
+        server = await LobbyServer("127.0.0.1", 0, max_lobbies=lobbies, workers=workers).start()
+        host, port = "127.0.0.1", server.port
+    seed_rng = random.Random(seed)
+    clients = [BotClient(host, port, seed_rng.getrandbits(63) or 1, think_time) for _ in range(lobbies)]
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(_run_bot(client, ramp_time * i / lobbies, rounds)
+                                         for i, client in enumerate(clients)),
+                                       return_exceptions=True)
+    finally:
+        if server:
+            await server.close()
+    elapsed = time.perf_counter() - start
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    latencies = {}
+    for client in clients:
+        for kind, samples in client.latencies.items():
+            latencies.setdefault(KIND_NAMES.get(kind, str(kind)), []).extend(samples)
+    messages = sum(len(samples) for samples in latencies.values())
+    total_rounds = sum(client.rounds for client in clients)
+    return {
+        "lobbies": lobbies,
+        "failed": len(failures),
+        "first_failure": repr(failures[0]) if failures else None,
+        "elapsed_s": elapsed,
+        "messages": messages,
+        "messages_per_second": messages / elapsed,
+        "rounds": total_rounds,
+        "rounds_per_second": total_rounds / elapsed,
+        "rejected": sum(client.errors for client in clients),
+        "latency_ms": {name: {str(p): value * 1e3 for p, value in percentiles(samples).items()}
+                       for name, samples in sorted(latencies.items())},
+    }
+
+
+def print_summary(summary):
+    print(f"Lobby: {summary['lobbies']} ({summary['failed']} fallite)  "
+          f"in {summary['elapsed_s']:.1f}s")
+    if summary["first_failure"]:
+        print(f"Primo errore: {summary['first_failure']}")
+    print(f"Messaggi: {summary['messages']} ({summary['messages_per_second']:.0f}/s), "
+          f"rifiutati {summary['rejected']}")
+    print(f"Round: {summary['rounds']} ({summary['rounds_per_second']:.1f}/s)")
+    print(f"{'richiesta':<10s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")
+    for name, stats in summary["latency_ms"].items():
+        print(f"{name:<10s} {stats['50']:>8.2f} {stats['95']:>8.2f} {stats['99']:>8.2f} {stats['max']:>8.2f}")
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bot client: prova di carico del server in locale")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--lobbies", type=int, default=100, help="Client (lobby) in parallelo")
+    parser.add_argument("--rounds", type=int, default=10, help="Round giocati da ogni client")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--think", type=float, default=THINK_TIME, help="Pausa massima prima di ogni azione (s)")
+    parser.add_argument("--ramp", type=float, default=RAMP_TIME, help="Secondi per aprire tutte le connessioni")
+    parser.add_argument("--local", action="store_true", help="Avvia il server in questo processo")
+    parser.add_argument("--workers", type=int, default=None, help="Processi del server locale")
+    parser.add_argument("--json", default=None, help="Salva il riepilogo in questo file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(load_test(args.host, args.port, args.lobbies, args.rounds, args.seed,
+                                    args.think, args.ramp, args.local, args.workers))
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
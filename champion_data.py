@@ -0,0 +1,257 @@
+# champion_data.py
+# Definizioni dei campioni lette da un file dati (data/champions.json) invece
+# che scritte nel codice. Il JSON viene validato UNA volta e "compilato" in una
+# cache binaria (marshal) accanto al file: finché il sorgente non cambia
+# (mtime + dimensione, oppure lo stesso hash SHA-256) ogni processo carica la
+# cache in pochi millisecondi, senza rifare parsing e validazione.
+# La cache vale solo per le stesse regole di validazione (validation_key():
+# schema e id delle abilità registrate): un'abilità rinominata o tolta da
+# abilities.py invalida la cache invece di arrivare fino alla battaglia.
+#
+# Nessun import di pygame: lo usano anche i processi di simulazione.
+import hashlib
+import json
+import marshal
+import os
+import time
+
+from abilities import ABILITIES
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DATA_PATH = os.path.join(DATA_DIR, "champions.json")
+# Cambia se cambia il formato delle righe compilate o il codice di validazione
+# (invalida le cache vecchie; schema e abilità sono già in validation_key())
+CACHE_VERSION = 2
+
+# Classi di gittata di default (il file dati può ridefinirle in "range_classes")
+RANGE_CLASSES = {"melee": 80, "ranged": 300, "sniper": 500}
+MAX_TIER = 3
+
+# Schema di un campione: campo -> (tipi ammessi, obbligatorio, default)
+CHAMPION_SCHEMA = {
+    "name": ((str,), True, None),
+    "hp": ((int,), True, None),
+    "attack": ((int,), True, None),
+    "defense": ((int,), False, 0),
+    "crit_chance": ((int, float), False, 0.1),
+    "mana_max": ((int,), False, 100),
+    "mana_start": ((int,), False, 0),
+    "attack_speed": ((int, float), False, 0.7),
+    "range": ((str,), True, None),
+    "tier": ((int,), False, 1),
+    "ability": ((str,), True, None),
+    "color": ((list,), False, None),
+}
+
+
+class ChampionDataError(ValueError):
+    """ File dati non valido: il messaggio dice dove (es. champions[3].hp) """
+
+
+def validation_key():
+    """
+    Impronta delle regole di validazione: versione, schema, gittate e tier
+    ammessi, id delle abilità registrate. Si calcola a ogni caricamento
+    (costa pochi microsecondi) perché register_ability() può aggiungerne altre.
+    """
+    schema = [(field, tuple(t.__name__ for t in types), required, repr(default))
+              for field, (types, required, default) in sorted(CHAMPION_SCHEMA.items())]
+    material = repr((CACHE_VERSION, schema, sorted(RANGE_CLASSES.items()), MAX_TIER, sorted(ABILITIES)))
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def cache_path_for(path):
+    """ data/champions.json -> data/.champions.json.cache """
+    folder, base = os.path.split(path)
+    return os.path.join(folder, f".{base}.cache")
+
+
+# --- Validazione ---
+def _check_type(value, types, where):
+    # bool è un int per Python, ma "hp": true è sicuramente un errore
+    if isinstance(value, bool) or not isinstance(value, types):
+        expected = "/".join(t.__name__ for t in types)
+        raise ChampionDataError(f"{where}: atteso {expected}, trovato {type(value).__name__} ({value!r})")
+
+
+def _validate_champion(entry, index, range_classes):
+    where = f"champions[{index}]"
+    if not isinstance(entry, dict):
+        raise ChampionDataError(f"{where}: atteso un oggetto")
+    unknown = set(entry) - set(CHAMPION_SCHEMA)
+    if unknown:
+        raise ChampionDataError(f"{where}: campi sconosciuti {sorted(unknown)}")
+
+    values = {}
+    for field, (types, required, default) in CHAMPION_SCHEMA.items():
+        if field not in entry:
+            if required:
+                raise ChampionDataError(f"{where}.{field}: campo obbligatorio mancante")
+            values[field] = default
+            continue
+        _check_type(entry[field], types, f"{where}.{field}")
+        values[field] = entry[field]
+
+    where = f"champions[{index}] ({values['name']})"
+    if not values["name"]:
+        raise ChampionDataError(f"{where}.name: vuoto")
+    for field in ("hp", "attack", "mana_max"):
+        if values[field] <= 0:
+            raise ChampionDataError(f"{where}.{field}: deve essere > 0")
+    for field in ("defense", "mana_start"):
+        if values[field] < 0:
+            raise ChampionDataError(f"{where}.{field}: deve essere >= 0")
+    if not 0 <= values["crit_chance"] <= 1:
+        raise ChampionDataError(f"{where}.crit_chance: deve essere tra 0 e 1")
+    if values["attack_speed"] <= 0:
+        raise ChampionDataError(f"{where}.attack_speed: deve essere > 0")
+    if values["mana_start"] > values["mana_max"]:
+        raise ChampionDataError(f"{where}.mana_start: supera mana_max")
+    if values["range"] not in range_classes:
+        raise ChampionDataError(f"{where}.range: {values['range']!r} non è tra {sorted(range_classes)}")
+    if not 1 <= values["tier"] <= MAX_TIER:
+        raise ChampionDataError(f"{where}.tier: deve essere tra 1 e {MAX_TIER}")
+    if values["ability"] not in ABILITIES:
+        raise ChampionDataError(f"{where}.ability: {values['ability']!r} non è tra {sorted(ABILITIES)}")
+
+    color = values["color"]
+    if color is not None:
+        if len(color) != 3 or any(isinstance(c, bool) or not isinstance(c, int) or not 0 <= c <= 255
+                                  for c in color):
+            raise ChampionDataError(f"{where}.color: servono 3 interi 0-255")
+        color = tuple(color)
+
+    # Riga compilata: gli stessi nomi dei parametri di Champion/ChampionTemplate
+    return {
+        "name": values["name"],
+        "hp": values["hp"],
+        "attack": values["attack"],
+        "defense": values["defense"],
+        "crit_chance": float(values["crit_chance"]),
+        "mana_max": values["mana_max"],
+        "mana_start": values["mana_start"],
+        "attack_speed": float(values["attack_speed"]),
+        "attack_range": range_classes[values["range"]],
+        "tier": values["tier"],
+        "ability": values["ability"],
+        "color": color,
+    }
+
+
+def validate(document):
+    """ Valida il documento JSON; restituisce le righe compilate (lista di dict) """
+    if not isinstance(document, dict):
+        raise ChampionDataError("radice: atteso un oggetto")
+    range_classes = document.get("range_classes", RANGE_CLASSES)
+    if not isinstance(range_classes, dict) or not range_classes:
+        raise ChampionDataError("range_classes: atteso un oggetto non vuoto")
+    for name, pixels in range_classes.items():
+        _check_type(pixels, (int,), f"range_classes.{name}")
+        if pixels <= 0:
+            raise ChampionDataError(f"range_classes.{name}: deve essere > 0")
+
+    entries = document.get("champions")
+    if not isinstance(entries, list) or not entries:
+        raise ChampionDataError("champions: attesa una lista non vuota")
+
+    rows = []
+    seen = set()
+    for index, entry in enumerate(entries):
+        row = _validate_champion(entry, index, range_classes)
+        if row["name"] in seen:
+            raise ChampionDataError(f"champions[{index}].name: {row['name']!r} duplicato")
+        seen.add(row["name"])
+        rows.append(row)
+    return rows
+
+
+def compile_source(raw, path="<dati>"):
+    """ Byte del JSON -> righe validate """
+    try:
+        document = json.loads(raw)
+    except ValueError as e:
+        raise ChampionDataError(f"{path}: JSON non valido ({e})") from None
+    return validate(document)
+
+
+# --- Cache compilata ---
+def _read_cache(cache_path, key):
+    """ (versione, chiave di validazione, mtime_ns, dimensione, sha256, righe) oppure None """
+    try:
+        with open(cache_path, "rb") as f:
+            # marshal.loads sui byte: marshal.load da file legge a pezzetti ed è ~50 volte più lento
+            cached = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(cached, tuple) or len(cached) != 6 or cached[0] != CACHE_VERSION \
+            or cached[1] != key:
+        return None
+    return cached
+
+
+def _write_cache(cache_path, key, stat, digest, rows):
+    """ Scrittura atomica: più processi possono ricompilare insieme senza corrompere la cache """
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(marshal.dumps((CACHE_VERSION, key, stat.st_mtime_ns, stat.st_size, digest, rows)))
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Cartella in sola lettura: si lavora senza cache
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def load_champion_data(path=DATA_PATH, use_cache=True):
+    """
+    Righe dei campioni (dict con i parametri di Champion), nell'ordine del file.
+    (La cache conta solo se è stata scritta con la stessa validation_key().)
+    1. cache con stessi mtime e dimensione del sorgente -> usata subito
+    2. sorgente "toccato" ma con lo stesso hash -> cache usata, intestazione aggiornata
+    3. altrimenti -> parsing + validazione, nuova cache
+    """
+    stat = os.stat(path)
+    cache_path = cache_path_for(path)
+    key = validation_key()
+    cached = _read_cache(cache_path, key) if use_cache else None
+    if cached and cached[2] == stat.st_mtime_ns and cached[3] == stat.st_size:
+        return cached[5]
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached[4] == digest:
+        rows = cached[5]
+    else:
+        rows = compile_source(raw, path)
+    if use_cache:
+        _write_cache(cache_path, key, stat, digest, rows)
+    return rows
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Valida il file dei campioni e ne ricompila la cache")
+    parser.add_argument("path", nargs="?", default=DATA_PATH, help="file JSON dei campioni")
+    parser.add_argument("--check", action="store_true", help="valida soltanto, senza scrivere la cache")
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        if args.check:
+            with open(args.path, "rb") as f:
+                rows = compile_source(f.read(), args.path)
+        else:
+            rows = load_champion_data(args.path)
+        elapsed = time.perf_counter() - start
+    except ChampionDataError as e:
+        raise SystemExit(f"Errore: {e}")
+
+    print(f"{len(rows)} campioni validi ({elapsed * 1e3:.2f} ms)")
+    for row in rows:
+        print(f"  T{row['tier']} {row['name']:<12s} HP {row['hp']:>4d}  ATK {row['attack']:>3d}  "
+              f"range {row['attack_range']:>3d}  abilità {row['ability']}")
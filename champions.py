@@ -1,69 +1,166 @@
 # champions.py
-import pygame
 import random
 import os
 import math
 
-# --- DEFINIZIONE COLORI (Greyboxing) ---
-# Assegniamo un colore unico a ogni campione per distinguerli
-CHAMP_COLORS = {
-    "Garen": (0, 0, 200),      # Blu (Tank)
-    "Vi": (200, 0, 200),       # Viola (Bruiser)
-    "Ahri": (255, 105, 180),   # Rosa (Mago)
-    "Ezreal": (255, 255, 0),   # Giallo (ADC)
-    "Aurelion": (0, 0, 100),   # Blu Notte (Drago)
-    "Riven": (200, 100, 100),  # Rosso chiaro (Combattente)
-    "Shen": (100, 0, 200)      # Viola scuro (Tank)
-}
+from events import LOG, DEBUG, INFO, ATTACK, CRIT, DEATH
+from abilities import get_ability
+
+# --- COLORI (Greyboxing) ---
+# Ogni campione ha il suo colore in data/champions.json; questo è per chi non ce l'ha
 DEFAULT_COLOR = (128, 128, 128) # Grigio default
 
+# Lista vuota condivisa: i campioni che non vengono mai colpiti non allocano nulla
+EMPTY_POPUPS = ()
+
+class ChampionTemplate:
+    """
+    Dati STATICI di un campione, condivisi da tutte le sue copie (flyweight).
+    Immutabile: una volta creato non cambia più.
+    """
+    __slots__ = ("name", "color", "hp", "attack", "defense", "crit_chance",
+                 "mana_max", "mana_start", "attack_speed", "attack_range", "move_speed", "tier",
+                 "ability")
+
+    def __init__(self, name, hp, attack,
+                 defense=0, crit_chance=0.1,
+                 mana_max=100, mana_start=0, attack_speed=0.7, attack_range=1, move_speed=100,
+                 tier=1, ability=None, color=None):
+        set_field = object.__setattr__
+        set_field(self, "name", name)
+        set_field(self, "color", tuple(color) if color else DEFAULT_COLOR)
+        set_field(self, "hp", int(hp))
+        set_field(self, "attack", int(attack))
+        set_field(self, "defense", int(defense))
+        set_field(self, "crit_chance", float(crit_chance))
+        set_field(self, "mana_max", int(mana_max))
+        set_field(self, "mana_start", int(mana_start))
+        set_field(self, "attack_speed", float(attack_speed)) # Attacchi al secondo
+        set_field(self, "attack_range", int(attack_range)) # 1 = melee, >1 = ranged
+        set_field(self, "move_speed", move_speed) # Pixel al secondo
+        set_field(self, "tier", int(tier)) # Rarità nello shop (1 = più comune)
+        set_field(self, "ability", ability) # Id dell'abilità (data/champions.json)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"ChampionTemplate è immutabile ({key})")
+
+    def __repr__(self):
+        return f"ChampionTemplate({self.name!r})"
+
+
 class Champion:
     """
     Classe che rappresenta un campione con statistiche di base e di combattimento.
+    Le statistiche statiche stanno nel suo ChampionTemplate (condiviso);
+    qui teniamo solo livello, statistiche scalate e stato di combattimento.
     """
+    __slots__ = ("template", "level", "base_hp", "base_attack", "base_defense",
+                 "hp", "max_hp", "current_mana", "x", "y", "target", "attack_timer",
+                 "is_casting", "facing_right", "damage_popup_texts", "popups_added",
+                 "spell_animation_timer", "spell")
+
     def __init__(self, name, hp, attack,
                  defense=0, crit_chance=0.1, 
-                 mana_max=100, mana_start=0, attack_speed=0.7, attack_range=1):
-        
-        # --- Statistiche Base ---
-        self.name = name
-        # self.image_path = image_path
-        # self.sprite_path = sprite_path
-        self.level = 1
-        self.color = CHAMP_COLORS.get(name, DEFAULT_COLOR)
-        
+                 mana_max=100, mana_start=0, attack_speed=0.7, attack_range=1, tier=1,
+                 ability=None, color=None):
+        template = ChampionTemplate(name, hp, attack, defense, crit_chance,
+                                    mana_max, mana_start, attack_speed, attack_range,
+                                    tier=tier, ability=ability, color=color)
+        self._reset(template, 1, template.hp, template.attack, template.defense)
+
+    @classmethod
+    def from_template(cls, template, level=1, base_hp=None, base_attack=None, base_defense=None):
+        """
+        Crea una copia leggera che CONDIVIDE il template (nessun dato statico copiato).
+        Le statistiche scalate, se non passate, sono quelle del template.
+        """
+        champ = cls.__new__(cls)
+        champ._reset(template, level,
+                     template.hp if base_hp is None else base_hp,
+                     template.attack if base_attack is None else base_attack,
+                     template.defense if base_defense is None else base_defense)
+        return champ
+
+    def _reset(self, template, level, base_hp, base_attack, base_defense):
+        self.template = template
+        self.level = level
+
         # Statistiche che scalano
-        self.base_hp = int(hp)
-        self.base_attack = int(attack)
-        self.base_defense = int(defense)
-        self.crit_chance = float(crit_chance)
-        
-        # --- Statistiche Auto-Battler ---
-        self.mana_max = int(mana_max)
-        self.mana_start = int(mana_start)
-        self.attack_speed = float(attack_speed) # Attacchi al secondo
-        self.attack_range = int(attack_range) # 1 = melee, >1 = ranged
-        
+        self.base_hp = int(base_hp)
+        self.base_attack = int(base_attack)
+        self.base_defense = int(base_defense)
+
         # --- Stato di Combattimento (variabili) ---
         self.hp = self.base_hp
         self.max_hp = self.base_hp
-        self.current_mana = self.mana_start
-        
+        self.current_mana = template.mana_start
+
         self.x = 0 # Posizione reale (pixel)
         self.y = 0
         self.target = None # Il nemico che sta bersagliando
         self.attack_timer = 0.0 # Timer per la velocità d'attacco
         self.is_casting = False
-        self.move_speed = 100 # Pixel al secondo
+        self.facing_right = True # Per il flip orizzontale
 
         # --- Grafica ---
-        # self.image = None # L'immagine della carta (per lo shop)
-        # self.battle_sprite = None # L'immagine del campione in battaglia
-        # self.sprite_offset_y = sprite_offset_y  # Offset verticale per il rendering del sprite
-        # self.facing_right = True # Per il flip orizzontale
-        self.damage_popup_texts = [] # Lista di (text, color, pos, timer) per i popup danno
+        # Lista di popup danno, creata solo al primo colpo subito
+        self.damage_popup_texts = EMPTY_POPUPS
+        self.popups_added = 0 # Contatore totale (serve a chi registra le replay)
         self.spell_animation_timer = 0 # Timer per le animazioni abilità
-        # self.spell_effect_image = None # Immagine per l'effetto dell'abilità
+        self.spell = None # AbilityDef risolta a inizio battaglia (abilities.py)
+
+    # --- Statistiche statiche (lette dal template) ---
+    @property
+    def name(self):
+        return self.template.name
+
+    @property
+    def color(self):
+        return self.template.color
+
+    @property
+    def crit_chance(self):
+        return self.template.crit_chance
+
+    @property
+    def mana_max(self):
+        return self.template.mana_max
+
+    @property
+    def mana_start(self):
+        return self.template.mana_start
+
+    @property
+    def attack_speed(self):
+        return self.template.attack_speed
+
+    @property
+    def attack_range(self):
+        return self.template.attack_range
+
+    @property
+    def move_speed(self):
+        return self.template.move_speed
+
+    @property
+    def tier(self):
+        return self.template.tier
+
+    @property
+    def ability(self):
+        return self.template.ability
+
+    def add_damage_popup(self, text, color):
+        """ Aggiunge un popup (testo fluttuante) sopra la testa del campione """
+        if self.damage_popup_texts is EMPTY_POPUPS:
+            self.damage_popup_texts = []
+        self.popups_added += 1
+        self.damage_popup_texts.append({
+            "text": text,
+            "color": color,
+            "pos": [self.x, self.y - 40], # Sopra la testa
+            "timer": 1.0 # Dura 1 secondo
+        })
         
     def is_alive(self):
         return self.hp > 0
@@ -75,8 +172,16 @@ class Champion:
         """ Calcola la distanza (euclidea) da un altro campione """
         return math.sqrt((self.x - other_champ.x)**2 + (self.y - other_champ.y)**2)
 
-    def find_closest_target(self, enemy_team):
-        """ Trova il nemico vivo più vicino """
+    def find_closest_target(self, enemy_team, spatial_index=None):
+        """
+        Trova il nemico vivo più vicino.
+        Se viene passato uno SpatialGrid della squadra nemica, usa quello
+        invece della scansione lineare.
+        """
+        if spatial_index is not None:
+            self.target = spatial_index.nearest(self.x, self.y)
+            return
+
         closest_dist = float('inf')
         closest_enemy = None
         
@@ -107,12 +212,15 @@ class Champion:
         self.x += dir_x * self.move_speed * delta_time
         self.y += dir_y * self.move_speed * delta_time
 
-    def basic_attack(self, target):
-        """ Esegue un attacco base """
+    def basic_attack(self, target, rng=None):
+        """
+        Esegue un attacco base.
+        'rng' è il generatore della battaglia (random.Random); senza, si usa il modulo random.
+        """
         if not target or not target.is_alive():
             return
             
-        crit = random.random() < self.crit_chance
+        crit = (rng or random).random() < self.crit_chance
         damage = self.base_attack * (2 if crit else 1) - target.base_defense
         damage = max(1, int(damage))
         
@@ -120,52 +228,36 @@ class Champion:
 
         # Aggiungi il popup del danno
         text_color = (255, 0, 0) if crit else (255, 255, 0) # Rosso per crit, Giallo per normale
-        target.damage_popup_texts.append({
-            "text": str(damage),
-            "color": text_color,
-            "pos": [target.x, target.y - 40], # Sopra la testa
-            "timer": 1.0 # Dura 1 secondo
-        })
+        target.add_damage_popup(str(damage), text_color)
         
         # Guadagna mana
         self.current_mana = min(self.mana_max, self.current_mana + 10)
         
-        print(f"{self.name} attacca {target.name} per {damage} danni. (Mana: {self.current_mana})")
+        if LOG.level <= DEBUG:
+            LOG.emit(CRIT if crit else ATTACK, DEBUG, self.name, target.name, damage, self.current_mana)
         if not target.is_alive():
-            print(f"💀 {target.name} è stato sconfitto!\n")
+            if LOG.level <= INFO:
+                LOG.emit(DEATH, INFO, self.name, target.name)
             self.target = None # Cerca un nuovo bersaglio
 
-    def cast_spell(self, enemy_team, friendly_team):
-        """ Esegue l'abilità speciale! """
-        print(f"✨✨✨ {self.name} USA L'ABILITÀ SPECIAL! ✨✨✨")
+    def resolve_ability(self):
+        """ Risolve l'id dell'abilità nella sua definizione (una volta per battaglia) """
+        self.spell = get_ability(self.template.ability)
+        return self.spell
+
+    def cast_spell(self, enemy_team, friendly_team, enemy_index=None):
+        """
+        Esegue l'abilità speciale!
+        'enemy_team' è la squadra AVVERSARIA di chi lancia, 'friendly_team' la sua;
+        'enemy_index' (opzionale) è lo SpatialGrid di 'enemy_team' per le abilità ad area.
+        """
+        spell = self.spell or self.resolve_ability()
         self.is_casting = True
         self.spell_animation_timer = 1.0 # L'animazione dura 1 secondo
-        
-        # --- QUI VA LA LOGICA DELLE ABILITÀ ---
-        if self.name == "Ahri":
-            if self.target and self.target.is_alive():
-                print(f"Ahri lancia una Sfera Mistica su {self.target.name}!")
-                self.target.take_damage(150) # Danno magico
-                
-                # img = pygame.image.load(os.path.join("images", "ahri_q.png")).convert_alpha()
-                # self.spell_effect_image = pygame.transform.scale(img, SPELL_EFFECT_SIZE)
-
-        elif self.name == "Garen":
-            print("Garen usa GIUDIZIO!")
-            for enemy in enemy_team:
-                if enemy.is_alive() and self.get_distance(enemy) < 150: 
-                    enemy.take_damage(100)
-            
-            # img = pygame.image.load(os.path.join("images", "garen_e.png")).convert_alpha()
-            # self.spell_effect_image = pygame.transform.scale(img, SPELL_EFFECT_SIZE)
-        
-        else:
-            print(f"{self.name} si cura di 50 HP!")
-            self.hp = min(self.max_hp, self.hp + 50)
-            
-            # img = pygame.image.load(os.path.join("images", "heal_effect.png")).convert_alpha()
-            # self.spell_effect_image = pygame.transform.scale(img, SPELL_EFFECT_SIZE)
-        
+
+        # Funzione del tipo di abilità (tabella in abilities.py)
+        spell.cast(self, spell, enemy_team, friendly_team, enemy_index)
+
         # Fine abilità
         self.current_mana = 0
         self.is_casting = False # Per ora è istantanea
@@ -175,42 +267,10 @@ SPELL_EFFECT_SIZE = (50, 50)
 
 def get_available_champions():
     """
-    Restituisce una lista di campioni disponibili con TUTTE le stats.
-    Range: 1 = Melee (50px), 3 = Ranged (300px), 5 = Long Ranged (500px)
+    Restituisce una lista di campioni disponibili con TUTTE le stats,
+    letti da data/champions.json (validato e compilato in cache, vedi champion_data.py).
+    Range: classi "melee" (80px), "ranged" (300px), "sniper" (500px)
+    Tier: rarità nello shop (1 = comune, 3 = raro), vedi pool.py
     """
-    # base_path = os.path.join("images")
-
-    # Range in pixel reali
-    R_MELEE = 80 
-    R_RANGED = 300
-    R_SNIPER = 500
-
-    return [
-        # Garen
-        Champion("Garen", 650, 50, defense=10, crit_chance=0.1, 
-                 mana_max=100, mana_start=0, attack_speed=0.6, attack_range=R_MELEE),
-        
-        # Vi
-        Champion("Vi", 600, 60, defense=8, crit_chance=0.1, 
-                 mana_max=80, mana_start=0, attack_speed=0.7, attack_range=R_MELEE),
-                 
-        # Ahri
-        Champion("Ahri", 500, 40, defense=5, crit_chance=0.2, 
-                 mana_max=70, mana_start=10, attack_speed=0.75, attack_range=R_RANGED),
-
-        # Ezreal
-        Champion("Ezreal", 500, 45, defense=4, crit_chance=0.25, 
-                 mana_max=60, mana_start=0, attack_speed=0.8, attack_range=R_SNIPER),
-
-        # Aurelion
-        Champion("Aurelion", 700, 30, defense=5, crit_chance=0.2, 
-                 mana_max=120, mana_start=40, attack_speed=0.65, attack_range=R_RANGED),
-
-        # Riven
-        Champion("Riven", 550, 55, defense=8, crit_chance=0.15, 
-                 mana_max=100, mana_start=0, attack_speed=0.7, attack_range=R_MELEE),
-                 
-        # Shen
-        Champion("Shen", 700, 45, defense=12, crit_chance=0.1, 
-                 mana_max=100, mana_start=50, attack_speed=0.65, attack_range=R_MELEE),
-    ]
\ No newline at end of file
+    from champion_data import load_champion_data
+    return [Champion(**row) for row in load_champion_data()]
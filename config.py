@@ -1,9 +1,9 @@
 # config.py
-import pygame
+from collections import OrderedDict
 
-# Inizializza solo i moduli che servono (font)
-# pygame.init() verrà chiamato in game.py
-pygame.font.init() 
+# pygame NON si importa qui: chi usa config solo per le costanti (o le regole
+# del gioco, che non ne hanno bisogno) non paga l'avvio di SDL.
+# I font si caricano al primo accesso (vedi __getattr__ in fondo).
 
 # --- Costanti di Gioco ---
 WIDTH, HEIGHT = 1400, 900
@@ -19,24 +19,80 @@ RED = (200, 60, 60)
 GOLD = (230, 180, 30)
 
 # --- Font ---
-# (Questi ora vengono caricati qui una sola volta)
-try:
-    TITLE_FONT = pygame.font.Font(None, 80)
-    BUTTON_FONT = pygame.font.Font(None, 50)
-    TEXT_FONT = pygame.font.Font(None, 30)
-except Exception as e:
-    print(f"Errore caricamento font: {e}")
-    # Fallback in caso di errore
-    TITLE_FONT = pygame.font.SysFont("Arial", 80)
-    BUTTON_FONT = pygame.font.SysFont("Arial", 50)
-    TEXT_FONT = pygame.font.SysFont("Arial", 30)
+# Nome -> dimensione. Vengono caricati una sola volta, al primo uso
+FONT_SIZES = {
+    "TITLE_FONT": 80,
+    "BUTTON_FONT": 50,
+    "TEXT_FONT": 30,
+}
+
+def load_font(size):
+    """ Font di default di pygame (inizializza pygame.font se serve) """
+    import pygame
+    if not pygame.font.get_init():
+        pygame.font.init()
+    try:
+        return pygame.font.Font(None, size)
+    except Exception as e:
+        print(f"Errore caricamento font: {e}")
+        # Fallback in caso di errore
+        return pygame.font.SysFont("Arial", size)
+
+
+# --- Cache dei Testi Renderizzati ---
+# Quasi tutti i testi (titoli, bottoni, popup) sono uguali frame dopo frame:
+# li rasterizziamo una volta e riusiamo la Surface.
+TEXT_CACHE_SIZE = 512
+
+class TextSurfaceCache:
+    """ Cache LRU di Surface renderizzate, con chiave (testo, font, colore) """
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color, antialias=True):
+        """ Come font.render, ma riusa la Surface se l'ha già creata (NON modificarla!) """
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False) # Butta il meno usato di recente
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+TEXT_CACHE = TextSurfaceCache()
+
+def render_text(text, font, color):
+    """ Surface del testo, presa dalla cache globale """
+    return TEXT_CACHE.render(text, font, color)
 
 
 # --- Funzione Utile (Utility) ---
 def draw_text(text, font, color, surface, x, y, center=True):
     """ Funzione helper per disegnare testo centrato o allineato a sinistra. """
     try:
-        text_obj = font.render(text, True, color)
+        text_obj = render_text(text, font, color)
         text_rect = text_obj.get_rect()
         if center:
             text_rect.center = (x, y)
@@ -44,4 +100,14 @@ def draw_text(text, font, color, surface, x, y, center=True):
             text_rect.topleft = (x, y)
         surface.blit(text_obj, text_rect)
     except Exception as e:
-        print(f"Errore in draw_text: {e}")
\ No newline at end of file
+        print(f"Errore in draw_text: {e}")
+
+
+# --- Caricamento pigro dei font ---
+def __getattr__(name):
+    """ config.TEXT_FONT & co.: il font si crea al primo accesso e poi resta nel modulo """
+    if name in FONT_SIZES:
+        font = load_font(FONT_SIZES[name])
+        globals()[name] = font
+        return font
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
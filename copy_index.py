@@ -0,0 +1,90 @@
+# copy_index.py
+# Indice delle copie possedute da un giocatore, aggiornato a ogni operazione
+# (compra, vendi, trascina, merge) invece di ricalcolato scansionando
+# scacchiera e panchina: "ho già 3 copie di Vi Lvl 1?" costa O(1).
+#
+# Un campione sta in 'board' o in 'bench' (i nomi delle liste in Game) a
+# un certo slot: merge e vendite sostituiscono o tolgono per slot, senza
+# cercare il campione nella lista. Mentre viene trascinato è fuori dall'indice.
+# Chi toglie o inserisce in mezzo a una lista (gli slot dopo scorrono)
+# chiama reindex() da quello slot in poi.
+
+
+class CopyIndex:
+    """
+    - copies[(nome, livello)]: le copie possedute, in ordine di arrivo
+      (un dict usato come insieme ordinato: inserimento e rimozione O(1))
+    - location[campione]: ('board' o 'bench', slot nella lista)
+    """
+    def __init__(self):
+        self.copies = {}
+        self.location = {}
+
+    @staticmethod
+    def key_of(champ):
+        return (champ.name, getattr(champ, 'level', 1))
+
+    def clear(self):
+        self.copies.clear()
+        self.location.clear()
+
+    def rebuild(self, board, bench):
+        """ Ricostruisce l'indice da zero (nuova partita, liste sostituite...) """
+        self.clear()
+        for where, champs in (("board", board), ("bench", bench)):
+            for slot, champ in enumerate(champs):
+                if champ:
+                    self.add(champ, where, slot)
+
+    def add(self, champ, where, slot):
+        self.copies.setdefault(self.key_of(champ), {})[champ] = None
+        self.location[champ] = (where, slot)
+
+    def remove(self, champ):
+        """ Toglie il campione dall'indice (se c'è) """
+        if self.location.pop(champ, None) is None:
+            return
+        key = self.key_of(champ)
+        group = self.copies[key]
+        del group[champ]
+        if not group:
+            del self.copies[key]
+
+    def move(self, champ, where, slot):
+        """ Il campione ha cambiato lista o slot (drag & drop, scambio) """
+        if champ in self.location:
+            self.location[champ] = (where, slot)
+
+    def reindex(self, where, champs, start=0):
+        """ Riallinea gli slot di 'champs' da 'start' in poi (dopo un pop o un insert) """
+        location = self.location
+        for slot in range(start, len(champs)):
+            if champs[slot] in location:
+                location[champs[slot]] = (where, slot)
+
+    def where(self, champ):
+        """ 'board', 'bench' o None se non è nell'indice """
+        found = self.location.get(champ)
+        return found[0] if found else None
+
+    def slot_of(self, champ):
+        """ (lista, slot) o None se non è nell'indice """
+        return self.location.get(champ)
+
+    def count(self, name, level=1):
+        group = self.copies.get((name, level))
+        return len(group) if group else 0
+
+    def merge_candidates(self, champ):
+        """
+        Le 3 copie da fondere per il livello di 'champ' (le più vecchie),
+        o None se non ce ne sono abbastanza.
+        """
+        group = self.copies.get(self.key_of(champ))
+        if not group or len(group) < 3:
+            return None
+        trio = []
+        for copy in group: # Si fermano dopo 3: costo costante
+            trio.append(copy)
+            if len(trio) == 3:
+                return trio
@@ -0,0 +1,35 @@
+# core.py
+# Le regole del gioco in un solo import, SENZA pygame:
+# campioni e registro, battaglia, pool, shop, economia, bot.
+# È quello che devono importare i processi di lavoro (Monte Carlo, partite
+# headless, server): si carica in pochi millisecondi e non serve un display.
+#
+# La UI (game.py, battle.py, shop.py, config.py per i font) si importa solo
+# quando si disegna davvero.
+from champions import Champion, ChampionTemplate, get_available_champions
+from registry import ChampionRegistry, StatRow, get_registry, LEVEL_MULTIPLIERS, MAX_LEVEL
+from battle_core import BattleCore, simulate_battle, FIXED_DT, MAX_BATTLE_TIME
+from pool import ChampionPool, copies_for_level
+from copy_index import CopyIndex
+from shop_core import ShopCore, BUY_COST, REROLL_COST, SELL_PRICE
+from game_core import GameCore
+from bot import BotPlayer, BattleEstimator
+from events import LOG
+
+__all__ = [
+    "Champion", "ChampionTemplate", "get_available_champions",
+    "ChampionRegistry", "StatRow", "get_registry", "LEVEL_MULTIPLIERS", "MAX_LEVEL",
+    "BattleCore", "simulate_battle", "FIXED_DT", "MAX_BATTLE_TIME",
+    "ChampionPool", "copies_for_level",
+    "CopyIndex",
+    "ShopCore", "BUY_COST", "REROLL_COST", "SELL_PRICE",
+    "GameCore",
+    "BotPlayer", "BattleEstimator",
+    "LOG",
+]
+
+
+#--- CONTROLLO: python core.py ---
+if __name__ == "__main__":
+    import sys
+    print(f"pygame importato: {'pygame' in sys.modules}")
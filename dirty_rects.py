@@ -0,0 +1,53 @@
+# dirty_rects.py
+# Tracciamento delle zone "sporche" dello schermo: invece di ridisegnare e
+# fare flip() di tutta la finestra a ogni frame, le schermate dicono quali
+# rettangoli sono cambiati e il loop aggiorna solo quelli.
+import pygame
+
+
+class DirtyRegions:
+    """
+    Raccoglie i rettangoli da aggiornare nel frame corrente.
+    track(nome, chiave, rect) confronta la "chiave" di una regione con quella
+    del frame precedente e segna il rect solo se è cambiata.
+    """
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.rects = []
+        self.full = True # Il primo frame va sempre disegnato tutto
+        self.last_keys = {}
+
+    def mark(self, rect):
+        """ Segna un rettangolo come da aggiornare """
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def mark_all(self):
+        """ Ridisegno completo (cambi di stato, finestra ri-esposta...) """
+        # Le chiavi restano: dopo un ridisegno completo lo schermo le rispecchia già
+        self.full = True
+
+    def track(self, name, key, rect):
+        """ Segna 'rect' se la chiave della regione 'name' è cambiata. Restituisce True se sporca """
+        if self.last_keys.get(name, _MISSING) == key:
+            return False
+        self.last_keys[name] = key
+        self.mark(rect)
+        return True
+
+    def has_changes(self):
+        return self.full or bool(self.rects)
+
+    def consume(self):
+        """ Rettangoli da passare a pygame.display.update(); svuota lo stato """
+        if self.full:
+            rects = [self.screen_rect.copy()]
+        else:
+            rects = self.rects
+        self.rects = []
+        self.full = False
+        return rects
+
+
+_MISSING = object()
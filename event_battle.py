@@ -0,0 +1,291 @@
+# event_battle.py
+# Battaglia a EVENTI DISCRETI (headless, niente pygame).
+# Il motore a passo fisso (BattleCore.step) visita ogni unità a ogni tick anche
+# quando non succede niente. Qui invece ogni unità ha UN prossimo evento in una
+# coda con priorità (heapq) e la simulazione salta direttamente da un evento
+# all'altro:
+# - FIRE: il prossimo attacco (o lancio dell'abilità, se il mana è pieno)
+# - PLAN: il momento in cui bisogna ridecidere cosa fare, cioè
+#     * l'arrivo a distanza d'attacco, calcolato in forma chiusa dalle velocità
+#       (|D + W t| = range, un'equazione di secondo grado)
+#     * l'uscita dal range di un bersaglio che si allontana
+#     * una correzione di rotta periodica se il bersaglio si muove (inseguimento)
+# Fra due eventi le unità in movimento vanno in linea retta a velocità costante.
+#
+# Le regole sono quelle di BattleCore (stessi campioni, abilità, timer d'attacco
+# che avanza solo in range): gli esiti coincidono in senso statistico, non tick
+# per tick (i tempi sono continui invece che multipli di FIXED_DT).
+import heapq
+import math
+
+from battle_core import BattleSetup, FIXED_DT, MAX_BATTLE_TIME
+
+FIRE = 0
+PLAN = 1
+
+# Ogni quanto chi insegue un bersaglio in movimento corregge la direzione (secondi)
+REAIM_INTERVAL = 0.25
+# Tolleranza sulle distanze (gli arrivi calcolati cadono esattamente sul bordo del range)
+RANGE_EPSILON = 1e-6
+# Anticipo minimo di un evento PLAN (evita cicli di eventi allo stesso istante)
+MIN_EVENT_GAP = 1e-6
+# Chi si avvicina si ferma un po' DENTRO il range (come il passo fisso, che ci entra
+# di una frazione di passo): se il bersaglio si allontana, l'uscita non è immediata
+# e non si alternano all'infinito arrivo e uscita sul bordo
+ARRIVAL_MARGIN = 1.0
+
+
+class UnitState:
+    """ Stato "continuo" di un'unità: velocità, timer d'attacco, evento in coda """
+    __slots__ = ("champ", "is_player", "vx", "vy", "in_range", "in_range_since",
+                 "attack_timer", "version", "chasing", "removed")
+
+    def __init__(self, champ, is_player):
+        self.champ = champ
+        self.is_player = is_player
+        self.vx = 0.0
+        self.vy = 0.0
+        self.in_range = False
+        self.in_range_since = 0.0 # Da quando è in range (il timer avanza da lì)
+        self.attack_timer = champ.attack_timer # Timer accumulato prima di in_range_since
+        self.version = 0 # Gli eventi con versione diversa sono scaduti
+        self.chasing = None # Campione che sta inseguendo (per l'indice inverso)
+        self.removed = False # Morto e già tolto dalla simulazione
+
+
+def contact_time(dx, dy, wx, wy, reach):
+    """
+    Primo t >= 0 in cui |(dx, dy) + (wx, wy) t| <= reach (None se non succede).
+    (dx, dy) = posizione relativa del bersaglio, (wx, wy) = sua velocità relativa.
+    """
+    c = dx * dx + dy * dy - reach * reach
+    if c <= 0:
+        return 0.0
+    a = wx * wx + wy * wy
+    b = 2 * (dx * wx + dy * wy)
+    if a == 0 or b >= 0: # Fermi o in allontanamento
+        return None
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None
+    return (-b - math.sqrt(disc)) / (2 * a)
+
+
+def exit_time(dx, dy, wx, wy, reach):
+    """ Primo t > 0 in cui |(dx, dy) + (wx, wy) t| > reach, partendo da dentro (None = mai) """
+    a = wx * wx + wy * wy
+    if a == 0:
+        return None
+    b = 2 * (dx * wx + dy * wy)
+    c = dx * dx + dy * dy - reach * reach
+    disc = max(0.0, b * b - 4 * a * c)
+    return max(0.0, (-b + math.sqrt(disc)) / (2 * a))
+
+
+class EventBattle(BattleSetup):
+    """
+    Stessa preparazione di BattleCore (BattleSetup: copie, posizioni, abilità,
+    seme), ma run() avanza di evento in evento invece che a passo fisso.
+    Solo headless: non ha step() e niente scacchiera esagonale né replay.
+    """
+    def __init__(self, player_team_base, enemy_team_base, champions_database, seed=None):
+        super().__init__(player_team_base, enemy_team_base, champions_database, seed)
+        self.now = 0.0
+        self.queue = [] # (tempo, sequenza, tipo, stato, versione)
+        self.sequence = 0 # A parità di tempo vince l'evento inserito prima
+        self.events_processed = 0
+        self.states = {champ: UnitState(champ, champ in self.player_set) for champ in self.all_champs}
+        self.chasers = {champ: set() for champ in self.all_champs} # bersaglio -> chi lo insegue
+
+    # --- Coda ---
+    def schedule(self, when, kind, state):
+        self.sequence += 1
+        heapq.heappush(self.queue, (when, self.sequence, kind, state, state.version))
+
+    def advance_to(self, when):
+        """ Sposta in linea retta le unità in movimento fino all'istante 'when' """
+        elapsed = when - self.now
+        if elapsed > 0:
+            for state in self.states.values():
+                if state.vx or state.vy:
+                    state.champ.x += state.vx * elapsed
+                    state.champ.y += state.vy * elapsed
+        self.now = when
+
+    # --- Decisioni ---
+    def set_chasing(self, state, target):
+        if state.chasing is not target:
+            if state.chasing is not None:
+                self.chasers[state.chasing].discard(state)
+            if target is not None:
+                self.chasers[target].add(state)
+            state.chasing = target
+
+    def set_velocity(self, state, vx, vy):
+        """ Cambia velocità; chi insegue questa unità deve ricalcolare i suoi tempi """
+        if vx == state.vx and vy == state.vy:
+            return
+        state.vx, state.vy = vx, vy
+        for chaser in list(self.chasers[state.champ]):
+            self.plan(chaser)
+
+    def leave_range(self, state):
+        if state.in_range:
+            state.attack_timer += self.now - state.in_range_since
+            state.in_range = False
+
+    def plan(self, state):
+        """ Decide cosa fa l'unità da adesso e mette in coda il suo prossimo evento """
+        champ = state.champ
+        state.version += 1 # Il vecchio evento non vale più
+        if not champ.is_alive():
+            return
+
+        if not champ.target or not champ.target.is_alive():
+            champ.find_closest_target(self.enemy_team if state.is_player else self.player_team)
+        target = champ.target
+        self.set_chasing(state, target)
+        if target is None:
+            self.leave_range(state)
+            self.set_velocity(state, 0.0, 0.0)
+            return
+
+        target_state = self.states[target]
+        dx, dy = target.x - champ.x, target.y - champ.y
+        distance = math.hypot(dx, dy)
+        champ.facing_right = target.x > champ.x
+
+        if distance > champ.attack_range + RANGE_EPSILON:
+            # Fuori range: in linea retta verso la posizione ATTUALE del bersaglio
+            self.leave_range(state)
+            speed = champ.move_speed
+            vx, vy = dx / distance * speed, dy / distance * speed
+            when = contact_time(dx, dy, target_state.vx - vx, target_state.vy - vy,
+                                max(0.0, champ.attack_range - ARRIVAL_MARGIN))
+            if target_state.vx or target_state.vy:
+                # Il bersaglio si muove: la rotta va corretta ogni tanto
+                when = REAIM_INTERVAL if when is None else min(when, REAIM_INTERVAL)
+            if when is not None:
+                self.schedule(self.now + max(when, MIN_EVENT_GAP), PLAN, state)
+            self.set_velocity(state, vx, vy)
+        else:
+            # In range: fermo, il timer d'attacco avanza
+            if not state.in_range:
+                state.in_range = True
+                state.in_range_since = self.now
+            fire_at = state.in_range_since + (1.0 / champ.attack_speed - state.attack_timer)
+            leave = exit_time(dx, dy, target_state.vx, target_state.vy, champ.attack_range + RANGE_EPSILON)
+            if leave is not None and self.now + leave < fire_at:
+                self.schedule(self.now + max(leave, MIN_EVENT_GAP), PLAN, state)
+            else:
+                self.schedule(max(fire_at, self.now), FIRE, state)
+            self.set_velocity(state, 0.0, 0.0)
+
+    def fire(self, state):
+        """ Attacco base o abilità (come in BattleCore.step) """
+        champ = state.champ
+        state.attack_timer = 0.0
+        state.in_range_since = self.now
+        if champ.current_mana >= champ.mana_max:
+            if state.is_player:
+                champ.cast_spell(self.enemy_team, self.player_team)
+            else:
+                champ.cast_spell(self.player_team, self.enemy_team)
+        else:
+            champ.basic_attack(champ.target, self.rng)
+
+        # I morti escono dalla coda; chi li inseguiva cerca un nuovo bersaglio
+        for other in (self.player_team if not state.is_player else self.enemy_team):
+            other_state = self.states[other]
+            if not other.is_alive() and not other_state.removed:
+                self.on_death(other_state)
+        self.plan(state)
+
+    def on_death(self, state):
+        state.removed = True
+        state.version += 1 # Nessun evento futuro
+        state.vx = state.vy = 0.0
+        self.set_chasing(state, None)
+        for chaser in list(self.chasers[state.champ]):
+            chaser.champ.target = None
+            self.plan(chaser)
+
+    # --- Simulazione ---
+    def run(self, dt=FIXED_DT, max_time=MAX_BATTLE_TIME):
+        """
+        Simula fino alla fine saltando da un evento al successivo.
+        'dt' serve solo a contare i tick equivalenti (battle.ticks).
+        Restituisce il vincitore ("player", "enemy" o "draw").
+        """
+        for state in self.states.values():
+            self.plan(state)
+
+        queue = self.queue
+        while not self.is_over:
+            if not queue or queue[0][0] > max_time:
+                self.advance_to(max_time if queue else self.now)
+                self.is_over = True
+                self.winner = "draw"
+                break
+            when, _, kind, state, version = heapq.heappop(queue)
+            if version != state.version:
+                continue # Evento scaduto
+            self.advance_to(when)
+            self.events_processed += 1
+            if kind == FIRE:
+                self.fire(state)
+            else:
+                self.plan(state)
+
+            if not any(c.is_alive() for c in self.enemy_team):
+                self.is_over = True
+                self.winner = "player"
+            elif not any(c.is_alive() for c in self.player_team):
+                self.is_over = True
+                self.winner = "enemy"
+
+        self.elapsed_time = self.now
+        self.ticks = int(self.now / dt)
+        for champ in self.all_champs: # In headless nessuno disegna i popup
+            champ.damage_popup_texts = []
+        return self.winner
+
+
+def simulate_event_battle(player_team_base, enemy_team_base, champions_database,
+                          max_time=MAX_BATTLE_TIME, seed=None):
+    """ Come battle_core.simulate_battle, ma con il motore a eventi """
+    battle = EventBattle(player_team_base, enemy_team_base, champions_database, seed)
+    battle.run(max_time=max_time)
+    return battle
+
+
+#--- CONFRONTO CON IL MOTORE A PASSO FISSO ---
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from registry import get_registry
+    from battle_core import simulate_battle
+    from montecarlo import parse_composition, build_team
+
+    parser = argparse.ArgumentParser(description="Confronta il motore a eventi con quello a passo fisso")
+    parser.add_argument("player", nargs="?", default="Vi:2,Ahri,Shen")
+    parser.add_argument("enemy", nargs="?", default="Garen,Ezreal,Riven")
+    parser.add_argument("-n", "--battles", type=int, default=500)
+    args = parser.parse_args()
+
+    database = get_registry()
+    player = build_team(parse_composition(args.player), database)
+    enemy = build_team(parse_composition(args.enemy), database)
+
+    results = {}
+    for label, simulate in (("passo fisso", simulate_battle), ("eventi", simulate_event_battle)):
+        start = time.perf_counter()
+        battles = [simulate(player, enemy, database, seed=seed) for seed in range(args.battles)]
+        elapsed = time.perf_counter() - start
+        wins = sum(b.winner == "player" for b in battles) / args.battles
+        duration = sum(b.elapsed_time for b in battles) / args.battles
+        results[label] = elapsed
+        print(f"{label:<12s} win rate {wins:6.1%}  durata media {duration:5.1f}s  "
+              f"{elapsed / args.battles * 1e3:7.3f} ms/battaglia")
+    print(f"Speedup: x{results['passo fisso'] / results['eventi']:.1f}")
@@ -0,0 +1,183 @@
+# events.py
+# Log strutturato degli eventi di gioco (attacchi, abilità, morti, merge, reroll...).
+# Sostituisce le print() nei punti caldi: gli eventi finiscono in un ring buffer
+# preallocato e, se il livello lo consente, nei "sink" collegati (console, file, memoria).
+#
+# Nei punti caldi si controlla il livello PRIMA di costruire l'evento:
+#     if LOG.level <= DEBUG:
+#         LOG.emit(ATTACK, DEBUG, ...)
+# così, a log spento, il costo è un solo confronto.
+import json
+from collections import deque
+
+# --- Livelli ---
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100 # Nessun evento passa
+
+# --- Tipi di evento ---
+ATTACK = "attack"
+CRIT = "crit"
+CAST = "cast"
+DEATH = "death"
+MERGE = "merge"
+REROLL = "reroll"
+BATTLE_START = "battle_start"
+
+# Dimensione di default del ring buffer
+DEFAULT_CAPACITY = 4096
+
+
+class Event:
+    """
+    Record di un evento. Gli oggetti Event del ring buffer vengono riusati:
+    un sink che vuole conservarli deve copiarli (es. con as_dict()).
+    """
+    __slots__ = ("seq", "tick", "kind", "level", "source", "target", "value", "detail")
+
+    def __init__(self):
+        self.seq = -1
+        self.tick = 0
+        self.kind = None
+        self.level = 0
+        self.source = None # Nome di chi agisce
+        self.target = None # Nome di chi subisce
+        self.value = 0 # Danno, cura, livello... dipende dal tipo
+        self.detail = None # Informazione aggiuntiva (es. mana, nome abilità)
+
+    def as_dict(self):
+        return {
+            "seq": self.seq,
+            "tick": self.tick,
+            "kind": self.kind,
+            "level": self.level,
+            "source": self.source,
+            "target": self.target,
+            "value": self.value,
+            "detail": self.detail,
+        }
+
+
+def format_event(event):
+    """ Messaggio leggibile (lo stesso delle vecchie print) """
+    kind = event.kind
+    if kind == ATTACK or kind == CRIT:
+        crit = " CRITICO" if kind == CRIT else ""
+        return (f"{event.source} attacca {event.target} per {event.value} danni{crit}. "
+                f"(Mana: {event.detail})")
+    if kind == CAST:
+        return f"✨✨✨ {event.source} USA L'ABILITÀ SPECIAL! ({event.detail}) ✨✨✨"
+    if kind == DEATH:
+        return f"💀 {event.target} è stato sconfitto!\n"
+    if kind == MERGE:
+        return f"MERGE DI {event.source} -> Lvl {event.value}! {event.detail or ''}".rstrip()
+    if kind == REROLL:
+        return f"Shop ricaricato. {event.detail or ''}".rstrip()
+    if kind == BATTLE_START:
+        return f"--- INIZIO ROUND {event.value} --- {event.detail or ''}".rstrip()
+    return f"[{kind}] {event.source} {event.target} {event.value} {event.detail}"
+
+
+# --- Sink ---
+class ConsoleSink:
+    """ Stampa gli eventi su stdout """
+    def write(self, event):
+        print(format_event(event))
+
+    def close(self):
+        pass
+
+
+class JsonlSink:
+    """ Scrive un evento JSON per riga su file (bufferizzato) """
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, event):
+        self.file.write(json.dumps(event.as_dict(), ensure_ascii=False))
+        self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+
+class MemorySink:
+    """ Conserva gli ultimi 'maxlen' eventi come dizionari (per analisi e debug) """
+    def __init__(self, maxlen=None):
+        self.events = deque(maxlen=maxlen)
+
+    def write(self, event):
+        self.events.append(event.as_dict())
+
+    def close(self):
+        pass
+
+
+class EventLog:
+    """
+    Ring buffer preallocato di Event + lista di sink.
+    'level' è la soglia: gli eventi con livello minore vengono scartati.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, level=OFF, sinks=None):
+        self.capacity = capacity
+        self.buffer = [Event() for _ in range(capacity)]
+        self.next_seq = 0
+        self.level = level
+        self.sinks = list(sinks or [])
+        self.tick = 0 # Aggiornato da chi simula (es. BattleCore)
+
+    def configure(self, level=None, sinks=None):
+        """ Cambia soglia e/o sink in un colpo solo """
+        if level is not None:
+            self.level = level
+        if sinks is not None:
+            for sink in self.sinks:
+                if sink not in sinks:
+                    sink.close()
+            self.sinks = list(sinks)
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+        sink.close()
+
+    def emit(self, kind, level, source=None, target=None, value=0, detail=None):
+        """ Registra un evento (se supera la soglia) e lo passa ai sink """
+        if level < self.level:
+            return None
+        seq = self.next_seq
+        self.next_seq = seq + 1
+        event = self.buffer[seq % self.capacity]
+        event.seq = seq
+        event.tick = self.tick
+        event.kind = kind
+        event.level = level
+        event.source = source
+        event.target = target
+        event.value = value
+        event.detail = detail
+        for sink in self.sinks:
+            sink.write(event)
+        return event
+
+    def recent(self, count=None):
+        """ Gli ultimi eventi ancora nel buffer, dal più vecchio, come dizionari """
+        available = min(self.next_seq, self.capacity)
+        if count is None or count > available:
+            count = available
+        first = self.next_seq - count
+        return [self.buffer[seq % self.capacity].as_dict() for seq in range(first, self.next_seq)]
+
+    def clear(self):
+        self.next_seq = 0
+
+
+# Log globale: spento di default (le simulazioni headless non pagano nulla).
+# Il gioco interattivo lo accende con LOG.configure(INFO, [ConsoleSink()]).
+LOG = EventLog()
@@ -0,0 +1,152 @@
+# frame_timing.py
+# Tempi di ogni fase del frame (eventi, update, draw, flip, attesa) con
+# l'orologio ad alta risoluzione. Gli ultimi frame restano in memoria:
+# - overlay a schermo (F3 nel gioco) con percentili del tempo di frame
+# - esportazione in formato "Chrome trace event" (F4), da aprire con
+#   chrome://tracing o https://ui.perfetto.dev
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Frame conservati (10 secondi a 60 FPS)
+DEFAULT_HISTORY = 600
+FRAME_BUDGET = 1.0 / 60.0
+DEFAULT_TRACE_PATH = "frame_trace.json"
+
+
+class FrameRecord:
+    """ Un frame: inizio, durata e fasi [(nome, inizio, durata), ...] in secondi """
+    __slots__ = ("index", "start", "duration", "phases")
+
+    def __init__(self, index, start):
+        self.index = index
+        self.start = start
+        self.duration = 0.0
+        self.phases = []
+
+
+class FrameTimer:
+    """
+    Uso nel loop:
+        timer.begin_frame()
+        with timer.phase("events"): ...
+        with timer.phase("update"): ...
+        timer.end_frame()
+    """
+    def __init__(self, history=DEFAULT_HISTORY, clock=time.perf_counter):
+        self.clock = clock
+        self.frames = deque(maxlen=history)
+        self.current = None
+        self.frame_count = 0
+        self.origin = clock() # Zero dei timestamp esportati
+
+    def begin_frame(self):
+        if self.current is not None:
+            self.end_frame()
+        self.current = FrameRecord(self.frame_count, self.clock())
+
+    @contextmanager
+    def phase(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                self.current.phases.append((name, start, self.clock() - start))
+
+    def end_frame(self):
+        frame = self.current
+        if frame is None:
+            return
+        frame.duration = self.clock() - frame.start
+        self.frames.append(frame)
+        self.frame_count += 1
+        self.current = None
+
+    # --- Statistiche ---
+    def percentiles(self, points=(50, 95, 99)):
+        """ {p: secondi} sui frame conservati (nearest-rank) + "max" """
+        durations = sorted(frame.duration for frame in self.frames)
+        if not durations:
+            return {}
+        stats = {}
+        for p in points:
+            rank = max(0, min(len(durations) - 1, int(round(p / 100 * len(durations))) - 1))
+            stats[p] = durations[rank]
+        stats["max"] = durations[-1]
+        return stats
+
+    def phase_averages(self):
+        """ {fase: secondi medi per frame} (le fasi assenti in un frame contano 0) """
+        totals = {}
+        for frame in self.frames:
+            for name, _, duration in frame.phases:
+                totals[name] = totals.get(name, 0.0) + duration
+        count = len(self.frames) or 1
+        return {name: total / count for name, total in totals.items()}
+
+    def hitches(self, budget=FRAME_BUDGET, factor=2.0):
+        """ Frame che hanno superato 'factor' volte il budget """
+        return [frame for frame in self.frames if frame.duration > budget * factor]
+
+    # --- Esportazione ---
+    def chrome_trace(self):
+        """ Dizionario nel formato Chrome trace event (tempi in microsecondi) """
+        events = []
+        for frame in self.frames:
+            events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                "ts": (frame.start - self.origin) * 1e6, "dur": frame.duration * 1e6,
+                "args": {"index": frame.index},
+            })
+            for name, start, duration in frame.phases:
+                events.append({
+                    "name": name, "cat": "phase", "ph": "X", "pid": 1, "tid": 1,
+                    "ts": (start - self.origin) * 1e6, "dur": duration * 1e6,
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path=DEFAULT_TRACE_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+# --- Overlay (pygame importato solo qui) ---
+OVERLAY_POS = (10, 10)
+OVERLAY_LINE = 18
+
+
+def overlay_lines(timer):
+    """ Righe di testo dell'overlay """
+    stats = timer.percentiles()
+    if not stats:
+        return ["Frame timing: nessun dato"]
+    lines = [f"Frame ms  p50 {stats[50] * 1e3:5.2f}  p95 {stats[95] * 1e3:5.2f}  "
+             f"p99 {stats[99] * 1e3:5.2f}  max {stats['max'] * 1e3:5.2f}",
+             f"Hitch (>{2 * FRAME_BUDGET * 1e3:.0f} ms): {len(timer.hitches())}/{len(timer.frames)}"]
+    for name, average in sorted(timer.phase_averages().items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<14s} {average * 1e3:6.2f} ms")
+    return lines
+
+
+_overlay_font = None
+
+
+def draw_overlay(surface, timer):
+    """ Disegna l'overlay in alto a sinistra; restituisce il rect occupato """
+    import pygame
+    global _overlay_font
+    if _overlay_font is None:
+        _overlay_font = pygame.font.SysFont("consolas", 15)
+    lines = overlay_lines(timer)
+    rect = pygame.Rect(OVERLAY_POS[0] - 4, OVERLAY_POS[1] - 4, 420, len(lines) * OVERLAY_LINE + 8)
+    background = pygame.Surface(rect.size, pygame.SRCALPHA)
+    background.fill((0, 0, 0, 180))
+    surface.blit(background, rect.topleft)
+    for i, line in enumerate(lines):
+        # Niente cache dei testi: i numeri cambiano a ogni frame
+        text = _overlay_font.render(line, True, (255, 255, 255))
+        surface.blit(text, (OVERLAY_POS[0], OVERLAY_POS[1] + i * OVERLAY_LINE))
+    return rect
@@ -1,12 +1,15 @@
 # game.py
 import pygame
 import sys
-import random
 
 # Importa le classi manager
-from champions import get_available_champions, Champion
+from game_core import GameCore
 from shop import ShopManager
 from battle import BattleManager
+from events import LOG, INFO, BATTLE_START, ConsoleSink
+from replay import ReplayRecorder
+from dirty_rects import DirtyRegions
+from frame_timing import FrameTimer, draw_overlay
 
 # Importa TUTTE le costanti e le utility da config.py
 from config import (
@@ -26,43 +29,57 @@ from config import (
 #     attack_sound = None
 
 # --- Inizializzazione Pygame ---
-pygame.init()
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Mini TFT - by andreazapp-dev")
+# Non all'import: la finestra si apre solo quando si crea il Game
+SCREEN = None
+
+def init_display():
+    """ Inizializza pygame e apre la finestra (una volta sola) """
+    global SCREEN
+    if SCREEN is None:
+        pygame.init()
+        SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Mini TFT - by andreazapp-dev")
+    return SCREEN
+
+# Eventi che chiedono di ridisegnare la finestra (pygame 1 e 2)
+EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
 
 
 # --- CLASSE PRINCIPALE DEL GIOCO ---
 
-class Game:
+class Game(GameCore):
     """
-    Gestisce lo stato generale del gioco (Menu, Shop, Battle),
-    i dati del giocatore e il ciclo di gioco principale.
+    Gestisce lo stato generale del gioco (Menu, Shop, Battle)
+    e il ciclo di gioco principale. Dati del giocatore ed economia
+    stanno in GameCore.
     """
-    def __init__(self):
-        self.screen = SCREEN
+    def __init__(self, seed=None):
+        self.screen = init_display()
         self.clock = pygame.time.Clock()
         self.running = True
         
         self.game_state = "MAIN_MENU"
         
-        self.champions_database = get_available_champions() 
-        
-        # Dati persistenti del Giocatore
-        self.player_gold = 20
-        self.player_hp = 100
-        self.player_level = 1
-        self.board_slots = 3 
-        self.bench_slots = 5 
-        self.board = [] 
-        self.bench = []
-        self.round_number = 1
+        # Dati del giocatore, pool e shop (ShopManager, vedi create_shop);
+        # l'avversario è un bot che compra dallo stesso pool
+        super().__init__(seed, use_bot=True)
         
         # Manager di gioco
-        self.shop_manager = ShopManager(self, self.champions_database) # <-- Aggiungi database
         self.battle_manager = None
         
-        # Variabile per tenere traccia del vincitore dell'ultima battaglia
-        self.last_battle_winner = None
+        # Rendering a rettangoli sporchi (vedi render())
+        self.dirty = DirtyRegions(self.screen.get_rect())
+        self.drawn_state = None # Stato disegnato nell'ultimo frame
+        
+        self.last_replay = None # Replay dell'ultima battaglia (replay.Replay)
+
+        # Tempi delle fasi del frame (F3 = overlay, F4 = esporta trace per chrome://tracing)
+        self.frame_timer = FrameTimer()
+        self.show_timing = False
+        self.overlay_rect = None # Dove è stato disegnato l'overlay l'ultima volta
+
+    def create_shop(self, seed):
+        return ShopManager(self, self.registry, seed=seed, pool=self.pool)
 
     def run(self):
         """ Il loop di gioco principale, non bloccante. """
@@ -73,45 +90,96 @@ class Game:
         #     except Exception as e:
         #         print(f"Errore play musica: {e}")
             
+        timer = self.frame_timer
+        real_dt = 0.0 # Tempo reale dell'ultimo frame (UNICO clock del gioco)
         while self.running:
+            timer.begin_frame()
             # 1. Gestisci Eventi
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    
-                if self.game_state == "MAIN_MENU":
-                    self.handle_menu_events(event)
-                elif self.game_state == "SHOP":
-                    self.shop_manager.handle_event(event)
-                elif self.game_state == "BATTLE" and self.battle_manager:
-                    self.battle_manager.handle_event(event)
-                elif self.game_state == "RESULT":
-                    self.handle_result_events(event)
+            with timer.phase("events"):
+                events = pygame.event.get()
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    if event.type in EXPOSE_EVENTS:
+                        self.dirty.mark_all() # La finestra va ridisegnata tutta
+                    if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+                        self.handle_timing_keys(event)
+                        continue
+                        
+                    if self.game_state == "MAIN_MENU":
+                        self.handle_menu_events(event)
+                    elif self.game_state == "SHOP":
+                        self.shop_manager.handle_event(event)
+                    elif self.game_state == "BATTLE" and self.battle_manager:
+                        self.battle_manager.handle_event(event)
+                    elif self.game_state == "RESULT":
+                        self.handle_result_events(event)
 
             # 2. Aggiorna Logica
             if self.game_state == "BATTLE" and self.battle_manager:
-                self.battle_manager.update()
+                with timer.phase("update"):
+                    self.battle_manager.update(real_dt)
                 if self.battle_manager.is_over:
                     self.end_battle(self.battle_manager.winner)
 
             # 3. Disegna (Render)
+            self.render()
+            with timer.phase("idle"): # Attesa del prossimo frame (60 FPS)
+                real_dt = self.clock.tick(60) / 1000.0
+            timer.end_frame()
+        
+        pygame.quit()
+        sys.exit()
+
+    def render(self):
+        """
+        Disegna solo se serve. La battaglia è animata e va ridisegnata sempre;
+        menu, shop e risultati aggiornano solo i rettangoli cambiati
+        (e nulla se lo schermo è fermo). Ogni cambio di stato = ridisegno completo.
+        """
+        if self.game_state != self.drawn_state:
+            self.drawn_state = self.game_state
+            self.dirty.mark_all()
+
+        timer = self.frame_timer
+        if self.game_state == "BATTLE" and self.battle_manager:
+            with timer.phase("draw:battle"):
+                self.battle_manager.draw(self.screen)
+                if self.show_timing:
+                    self.overlay_rect = draw_overlay(self.screen, timer)
+            with timer.phase("flip"):
+                pygame.display.flip()
+            return
+
+        with timer.phase(f"draw:{self.game_state.lower()}"):
+            if self.game_state == "SHOP":
+                self.shop_manager.collect_dirty(self.dirty)
+            if self.show_timing and self.overlay_rect:
+                self.dirty.mark(self.overlay_rect) # I numeri dell'overlay cambiano a ogni frame
+            if not self.dirty.has_changes():
+                return # Niente è cambiato: niente da disegnare
+
             self.screen.fill((20, 20, 20))
-            
             if self.game_state == "MAIN_MENU":
                 self.draw_main_menu()
             elif self.game_state == "SHOP":
                 self.shop_manager.draw(self.screen)
-            elif self.game_state == "BATTLE" and self.battle_manager:
-                self.battle_manager.draw(self.screen)
             elif self.game_state == "RESULT":
                 self.draw_result_screen()
-            
-            pygame.display.flip()
-            self.clock.tick(60)
-        
-        pygame.quit()
-        sys.exit()
+            if self.show_timing:
+                self.overlay_rect = draw_overlay(self.screen, timer)
+                self.dirty.mark(self.overlay_rect)
+        with timer.phase("present"):
+            pygame.display.update(self.dirty.consume())
+
+    def handle_timing_keys(self, event):
+        """ F3: mostra/nascondi i tempi del frame. F4: esporta la trace (Chrome trace event) """
+        if event.key == pygame.K_F3:
+            self.show_timing = not self.show_timing
+            self.dirty.mark_all() # Compare o sparisce l'overlay
+        else:
+            path = self.frame_timer.export_chrome_trace()
+            print(f"Trace dei frame salvata in {path} (apribile con chrome://tracing)")
 
     # --- Gestione Stato: MAIN_MENU ---
     def draw_main_menu(self):
@@ -129,78 +197,38 @@ class Game:
             # Assicurati che play_button_rect esista
             if hasattr(self, 'play_button_rect') and self.play_button_rect.collidepoint(event.pos):
                 self.game_state = "SHOP"
-                # Resettiamo i dati del giocatore per una nuova partita
-                self.player_gold = 20
-                self.player_hp = 100
-                self.board = [] # Board vuoto
-                self.bench = [] # Panchina vuota
-                self.shop_manager.reset() # Ricarica lo shop
-                self.round_number = 1   
+                self.new_game() # Oro, HP, scacchiera, panchina, pool e shop da capo
 
     # --- Gestione Stato: BATTLE ---
     def start_battle(self):
-        print(f"--- INIZIO ROUND {self.round_number} ---")
-        print("Avvio battaglia con:", [c.name for c in self.board])
-        
-        enemy_team_to_battle = []
-        
-        for _ in range(3): # Scegli 3 nemici
-            # Usa il database che abbiamo già caricato
-            base_champ = random.choice(self.champions_database) # <-- Modifica qui
-            
-            if random.random() < 0.10: 
-                print(f"Nemico potenziato: {base_champ.name} Lvl 2!")
-                upgraded = Champion(
-                    base_champ.name, 
-                    int(base_champ.hp * 1.6), 
-                    int(base_champ.attack * 1.6), 
-                    base_champ.image_path,
-                    int(getattr(base_champ, 'defense', 0) * 1.6),
-                    getattr(base_champ, 'crit_chance', 0.1),
-                    # Copiamo TUTTI i dati base, inclusi sprite!
-                    getattr(base_champ, 'mana_max', 100),
-                    getattr(base_champ, 'mana_start', 0),
-                    getattr(base_champ, 'attack_speed', 0.7),
-                    getattr(base_champ, 'attack_range', 1),
-                    # getattr(base_champ, 'sprite_path', None), 
-                    # getattr(base_champ, 'sprite_offset_y', 0)
-                )
-                upgraded.level = 2
-                upgraded.max_hp = upgraded.hp
-                enemy_team_to_battle.append(upgraded)
-            else:
-                enemy_team_to_battle.append(base_champ)
+        enemy_team_to_battle = self.enemy_team_for_round() # Il bot fa il suo shop (max 50 ms)
         
+        if LOG.level <= INFO:
+            LOG.emit(BATTLE_START, INFO, value=self.round_number,
+                     detail=f"Avvio battaglia con: {[c.name for c in self.board]} "
+                            f"contro {[f'{c.name} Lvl {c.level}' for c in enemy_team_to_battle]}")
+
         # Passa il database anche al BattleManager
-        self.battle_manager = BattleManager(self.board, enemy_team_to_battle, self.champions_database) # <-- Aggiungi database
+        self.battle_manager = BattleManager(self.board, enemy_team_to_battle, self.registry,
+                                            seed=self.rng.getrandbits(64), use_board=True)
+        self.battle_manager.recorder = ReplayRecorder(self.battle_manager)
         self.game_state = "BATTLE"
 
     def end_battle(self, winner):
         # pygame.mixer.music.stop()
         self.last_battle_winner = winner
         self.game_state = "RESULT"
+        if self.battle_manager and self.battle_manager.recorder:
+            self.last_replay = self.battle_manager.recorder.finish()
         
-        # Logica ricompense: 5 gold base, +3 per la vittoria
-        base_gold = 5
-        win_gold = 3
-        
+        # Logica ricompense (oro, HP, round, reroll gratuito): vedi GameCore
+        gold_earned = self.apply_battle_result(winner)
         if winner == "player":
-            gold_earned = base_gold + win_gold
-            self.player_gold += gold_earned
             print(f"Vittoria! Oro: {self.player_gold} (+{gold_earned})")
         else:
-            gold_earned = base_gold
-            self.player_gold += gold_earned
-            self.player_hp -= 10 # Danno al giocatore
             print(f"Sconfitta! Oro: {self.player_gold} (+{gold_earned}), HP: {self.player_hp}")
         
-        # Incrementa il round
-        self.round_number += 1
-        
-        # Ricarica gratuita dello shop per il prossimo round
-        self.shop_manager.roll_shop(is_free=True)
-        
-        if self.player_hp <= 0:
+        if self.is_game_over():
             print("Sei stato sconfitto! GAME OVER")
             # Se il giocatore perde, lo rimandiamo al menu principale
             self.game_state = "MAIN_MENU"
@@ -224,5 +252,7 @@ class Game:
 
 #--- AVVIO DEL GIOCO ---
 if __name__ == "__main__":
+    # Eventi di gioco in console (gli attacchi singoli sono DEBUG e restano spenti)
+    LOG.configure(INFO, [ConsoleSink()])
     game = Game()
     game.run()
\ No newline at end of file
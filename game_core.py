@@ -0,0 +1,117 @@
+# game_core.py
+# Dati del giocatore e regole dell'economia SENZA pygame.
+# Game (game.py) eredita da qui e aggiunge finestra, input e stati della UI;
+# HeadlessGame (headless.py) la guida con azioni programmatiche.
+import random
+
+from registry import get_registry
+from pool import ChampionPool, MAX_PLAYER_LEVEL
+from shop_core import ShopCore
+
+# --- Regole dell'economia ---
+STARTING_GOLD = 20
+STARTING_HP = 100
+BASE_GOLD = 5 # Oro a fine round
+WIN_GOLD = 3 # Bonus per la vittoria
+LOSS_DAMAGE = 10 # HP persi per una sconfitta
+BOARD_SLOTS = 3
+BENCH_SLOTS = 5
+ENEMY_TEAM_SIZE = 3
+ENEMY_LEVEL_UP_CHANCE = 0.10 # Probabilità di un nemico Lvl 2
+
+
+class GameCore:
+    """
+    Stato di una partita per un giocatore: oro, HP, livello, scacchiera,
+    panchina, round, pool condiviso e shop.
+    Tutta la casualità deriva da 'seed': stessa partita = stessi eventi.
+    Con use_bot=True l'avversario è un BotPlayer (bot.py) che fa economia
+    sullo stesso pool; altrimenti ogni round è una squadra casuale.
+    """
+    def __init__(self, seed=None, use_bot=False):
+        # Generatore principale: da qui derivano i semi di shop e battaglie
+        self.rng = random.Random(seed)
+
+        # Registro dei campioni: costruito una volta, statistiche per livello già pronte
+        self.registry = get_registry()
+        self.champions_database = self.registry.champions
+        # Pool condiviso dei campioni (copie finite per tier)
+        self.pool = ChampionPool(self.registry)
+
+        # Dati persistenti del Giocatore
+        self.board_slots = BOARD_SLOTS
+        self.bench_slots = BENCH_SLOTS
+        self.reset_player()
+
+        # Shop del giocatore (ShopManager nella versione con finestra)
+        self.shop_manager = self.create_shop(self.rng.getrandbits(64))
+        self.last_battle_winner = None
+
+        # Avversario
+        self.opponent = None
+        if use_bot:
+            from bot import BotPlayer # bot.py usa le costanti di questo modulo
+            self.opponent = BotPlayer(self.registry, self.pool, seed=self.rng.getrandbits(64))
+
+    def create_shop(self, seed):
+        return ShopCore(self, self.registry, seed=seed, pool=self.pool)
+
+    def reset_player(self):
+        self.player_gold = STARTING_GOLD
+        self.player_hp = STARTING_HP
+        self.player_level = 1
+        self.board = []
+        self.bench = []
+        self.round_number = 1
+
+    def new_game(self):
+        """ Resettiamo i dati del giocatore per una nuova partita """
+        self.reset_player()
+        self.pool.reset() # Tutte le copie tornano disponibili
+        self.shop_manager.reset() # Ricarica lo shop
+        if self.opponent:
+            self.opponent.new_game()
+
+    def enemy_team_for_round(self):
+        """ La squadra da affrontare: quella del bot (dopo il suo shop) o una casuale """
+        if self.opponent:
+            return self.opponent.play_shop_phase(self.board)
+        return self.generate_enemy_team()
+
+    def generate_enemy_team(self):
+        """ Squadra nemica casuale del round """
+        enemy_team = []
+        for _ in range(ENEMY_TEAM_SIZE):
+            base_champ = self.rng.choice(self.champions_database)
+            level = 1
+            if self.rng.random() < ENEMY_LEVEL_UP_CHANCE:
+                level = 2 # Nemico potenziato
+            enemy_team.append(self.registry.create(base_champ.name, level))
+        return enemy_team
+
+    def apply_battle_result(self, winner):
+        """
+        Logica ricompense di fine round: oro base, bonus vittoria, danno
+        per la sconfitta, round e livello successivi, reroll gratuito.
+        Restituisce l'oro guadagnato.
+        """
+        self.last_battle_winner = winner
+        gold_earned = BASE_GOLD
+        if winner == "player":
+            gold_earned += WIN_GOLD
+        else:
+            self.player_hp -= LOSS_DAMAGE # Danno al giocatore
+        self.player_gold += gold_earned
+
+        # Incrementa il round (il livello sale da solo ogni 2 round: cambia le probabilità dello shop)
+        self.round_number += 1
+        self.player_level = min(MAX_PLAYER_LEVEL, 1 + self.round_number // 2)
+        if self.opponent:
+            self.opponent.end_round(winner == "enemy", self.round_number)
+
+        # Ricarica gratuita dello shop per il prossimo round
+        self.shop_manager.roll_shop(is_free=True)
+        return gold_earned
+
+    def is_game_over(self):
+        return self.player_hp <= 0
@@ -0,0 +1,283 @@
+# headless.py
+# Partite complete SENZA finestra: le azioni del giocatore (compra, vendi,
+# reroll, piazza, conferma) arrivano da uno script o da una "policy",
+# le battaglie si risolvono con BattleCore a passo fisso.
+# Ogni round produce una riga di traccia dell'economia.
+#
+# Uso da riga di comando:
+#   python headless.py -n 1000 --policy greedy --seed 42 --trace tracce.jsonl
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from registry import get_registry
+from game_core import GameCore
+from shop_core import BUY_COST, REROLL_COST
+from battle_core import BattleCore, FIXED_DT, MAX_BATTLE_TIME
+
+# Passo delle battaglie headless: lo stesso del gioco, così le tracce
+# dell'economia vedono le stesse percentuali di vittoria
+HEADLESS_DT = FIXED_DT
+# Passo largo, solo su richiesta (--coarse): circa 3 volte più veloce ma NON
+# equivalente, i timer d'attacco si arrotondano ai multipli di dt e spostano
+# le vittorie (Riven,Vi contro Garen,Shen: circa 0.67 a 1/60, 0.61 a 1/20)
+COARSE_DT = 1.0 / 20.0
+# Limite di round (una squadra che vince sempre non finirebbe mai)
+MAX_ROUNDS = 30
+# Quante partite manda ogni processo in un colpo solo
+CHUNK_SIZE = 16
+
+
+class HeadlessGame(GameCore):
+    """
+    Partita guidata da codice. Le azioni restituiscono True se valide;
+    confirm() combatte il round e ne restituisce la riga di traccia.
+    """
+    def __init__(self, seed=None, max_rounds=MAX_ROUNDS, dt=HEADLESS_DT, use_bot=False):
+        super().__init__(seed, use_bot)
+        self.max_rounds = max_rounds
+        self.dt = dt
+        self.trace = [] # Una riga (dizionario) per round
+        self.start_round()
+
+    def start_round(self):
+        """ Azzera i contatori del round che comincia """
+        self.round_gold_start = self.player_gold
+        self.round_bought = 0
+        self.round_sold = 0
+        self.round_rerolls = 0
+
+    @property
+    def shop(self):
+        """ Le carte in vendita (None = slot vuoto) """
+        return self.shop_manager.shop_champs
+
+    # --- Azioni ---
+    def buy(self, slot):
+        ok = self.shop_manager.buy_champion(self.shop[slot], slot)
+        self.round_bought += ok
+        return ok
+
+    def sell(self, where, index):
+        ok = self.shop_manager.sell_at(where, index)
+        self.round_sold += ok
+        return ok
+
+    def reroll(self):
+        ok = self.shop_manager.roll_shop()
+        self.round_rerolls += ok
+        return ok
+
+    def place(self, from_where, index, to_where="board", to_index=None):
+        return self.shop_manager.move_champion(from_where, index, to_where, to_index)
+
+    def confirm(self):
+        """ Combatte il round (contro il bot o una squadra casuale) e applica l'economia """
+        if self.is_over():
+            return None
+        enemy_team, seed = self.prepare_battle()
+        battle = BattleCore(self.board, enemy_team, self.registry, seed=seed)
+        winner = battle.run(self.dt, MAX_BATTLE_TIME)
+        return self.finish_round(winner, battle.elapsed_time)
+
+    def prepare_battle(self):
+        """
+        Prima metà di confirm(): la squadra avversaria del round e il seme della battaglia.
+        Chi risolve la battaglia altrove (server.py, in un altro processo) chiama poi finish_round().
+        """
+        enemy_team = self.enemy_team_for_round()
+        self.round_gold_before = self.player_gold
+        return enemy_team, self.rng.getrandbits(64)
+
+    def finish_round(self, winner, battle_time):
+        """ Seconda metà di confirm(): economia del round e riga di traccia """
+        round_number = self.round_number
+        board = [f"{c.name}:{c.level}" for c in self.board]
+        gold_earned = self.apply_battle_result(winner)
+
+        row = {
+            "round": round_number,
+            "level": self.player_level,
+            "gold_start": self.round_gold_start,
+            "gold_spent": self.round_gold_start - self.round_gold_before, # Netto (acquisti + reroll - vendite)
+            "bought": self.round_bought,
+            "sold": self.round_sold,
+            "rerolls": self.round_rerolls,
+            "board": board,
+            "bench": len(self.bench),
+            "winner": winner,
+            "battle_time": round(battle_time, 2),
+            "gold_earned": gold_earned,
+            "gold_end": self.player_gold,
+            "hp": self.player_hp,
+            "pool_left": sum(self.pool.counts),
+        }
+        self.trace.append(row)
+        self.start_round()
+        return row
+
+    def is_over(self):
+        return self.is_game_over() or self.round_number > self.max_rounds
+
+    def play(self, policy):
+        """ Gioca fino alla fine: a ogni round la policy agisce, poi si conferma """
+        while not self.is_over():
+            policy(self)
+            self.confirm()
+        return self.trace
+
+    def strength(self, champ):
+        """ Stima grezza della forza di un campione (per le policy) """
+        stats = self.registry.stats(champ.name, champ.level)
+        return stats.hp * stats.attack
+
+
+# --- Policy ---
+def fill_board(game):
+    """ Porta in scacchiera i campioni più forti della panchina (scambiando i più deboli) """
+    while game.bench and len(game.board) < game.board_slots:
+        best = max(range(len(game.bench)), key=lambda i: game.strength(game.bench[i]))
+        game.place("bench", best, "board")
+    if not game.bench or not game.board:
+        return
+    best = max(range(len(game.bench)), key=lambda i: game.strength(game.bench[i]))
+    worst = min(range(len(game.board)), key=lambda i: game.strength(game.board[i]))
+    if game.strength(game.bench[best]) > game.strength(game.board[worst]):
+        game.place("bench", best, "board", worst)
+
+
+def greedy_policy(game):
+    """
+    Compra prima ciò che completa un merge, poi le carte del tier più alto
+    finché c'è oro e spazio; un reroll se avanza molto oro; poi la scacchiera migliore.
+    """
+    shop = game.shop_manager
+    for _ in range(2): # Secondo giro: dopo un eventuale reroll
+        for slot, champ in enumerate(game.shop):
+            if champ and shop.completes_merge(champ):
+                game.buy(slot)
+        order = sorted((slot for slot, champ in enumerate(game.shop) if champ),
+                       key=lambda slot: -game.shop[slot].tier)
+        for slot in order:
+            if game.shop[slot] and shop.can_buy(game.shop[slot]) and game.player_gold >= BUY_COST * 2:
+                game.buy(slot)
+        if game.player_gold < REROLL_COST + BUY_COST * 3:
+            break
+        game.reroll()
+    # Panchina piena: si vende il più debole per fare spazio ai prossimi acquisti
+    if len(game.bench) >= game.bench_slots:
+        weakest = min(range(len(game.bench)), key=lambda i: game.strength(game.bench[i]))
+        game.sell("bench", weakest)
+    fill_board(game)
+
+
+def random_policy(game):
+    """ Azioni a caso (ma valide): utile come riferimento "rumoroso" """
+    rng = game.rng
+    for _ in range(rng.randint(0, 6)):
+        action = rng.random()
+        if action < 0.6:
+            game.buy(rng.randrange(len(game.shop)))
+        elif action < 0.8:
+            game.reroll()
+        elif game.bench:
+            game.sell("bench", rng.randrange(len(game.bench)))
+    fill_board(game)
+
+
+POLICIES = {
+    "greedy": greedy_policy,
+    "random": random_policy,
+}
+
+
+# --- Molte partite su più processi ---
+def play_game(seed, policy="greedy", max_rounds=MAX_ROUNDS, dt=HEADLESS_DT, use_bot=False):
+    """ Una partita completa: riepilogo (round, vittorie, oro e HP finali) + traccia per round """
+    game = HeadlessGame(seed, max_rounds, dt, use_bot)
+    game.play(POLICIES[policy])
+    return {
+        "seed": seed,
+        "policy": policy,
+        "rounds": len(game.trace),
+        "wins": sum(1 for row in game.trace if row["winner"] == "player"),
+        "final_gold": game.player_gold,
+        "final_hp": game.player_hp,
+        "trace": game.trace,
+    }
+
+
+def _init_worker():
+    get_registry() # Il registro si costruisce una volta per processo
+
+
+def _play_chunk(seeds, policy, max_rounds, dt, use_bot):
+    return [play_game(seed, policy, max_rounds, dt, use_bot) for seed in seeds]
+
+
+def run_games(games=100, seed=0, workers=None, policy="greedy", max_rounds=MAX_ROUNDS, dt=HEADLESS_DT,
+              use_bot=False):
+    """
+    Gioca 'games' partite indipendenti (semi derivati da 'seed': risultati
+    riproducibili e indipendenti dal numero di processi).
+    Con workers=1 tutto gira nel processo corrente.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Policy sconosciuta: {policy} (disponibili: {', '.join(POLICIES)})")
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.getrandbits(64) for _ in range(games)]
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, games, CHUNK_SIZE)]
+
+    results = []
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(_play_chunk(chunk, policy, max_rounds, dt, use_bot))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_play_chunk, chunk, policy, max_rounds, dt, use_bot)
+                       for chunk in chunks]
+            for future in futures: # In ordine: i risultati non dipendono dallo scheduling
+                results.extend(future.result())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partite complete senza finestra, con tracce dell'economia.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="Numero di partite")
+    parser.add_argument("--policy", default="greedy", choices=sorted(POLICIES), help="Come gioca il giocatore")
+    parser.add_argument("--seed", type=int, default=0, help="Seme (stessi argomenti = stesso risultato)")
+    parser.add_argument("--workers", type=int, default=None, help="Processi (default: tutti i core)")
+    parser.add_argument("--rounds", type=int, default=MAX_ROUNDS, help="Limite di round per partita")
+    parser.add_argument("--bot", action="store_true", help="Avversario bot (bot.py) invece di squadre casuali")
+    parser.add_argument("--trace", help="File JSONL: una riga per round di ogni partita")
+    parser.add_argument("--coarse", action="store_true",
+                        help=f"Battaglie a passo largo ({COARSE_DT:.3f}s): più veloci ma con vittorie distorte")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_games(args.games, args.seed, args.workers, args.policy, args.rounds,
+                        COARSE_DT if args.coarse else HEADLESS_DT, use_bot=args.bot)
+    elapsed = time.perf_counter() - start
+
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as f:
+            for game_index, result in enumerate(results):
+                for row in result["trace"]:
+                    f.write(json.dumps(dict(row, game=game_index, seed=result["seed"])))
+                    f.write("\n")
+
+    games = len(results)
+    print(f"Partite:          {games} ({args.policy}) in {elapsed:.1f}s "
+          f"({games / elapsed * 60:.0f} partite/min)")
+    print(f"Round medi:       {sum(r['rounds'] for r in results) / games:.1f}")
+    print(f"Vittorie medie:   {sum(r['wins'] for r in results) / games:.1f}")
+    print(f"Oro finale medio: {sum(r['final_gold'] for r in results) / games:.1f}")
+    return 0
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    sys.exit(main())
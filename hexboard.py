@@ -0,0 +1,249 @@
+# hexboard.py
+# Scacchiera esagonale della battaglia (niente pygame).
+# - celle numerate 0..N-1, con centri in pixel, vicini e distanze PRECALCOLATI
+# - occupazione: al massimo un campione per cella (niente più pedine sovrapposte)
+# - pathfinding a "flow field": una BFS dal bersaglio dà a ogni cella libera la
+#   sua distanza di percorso; chi insegue quel bersaglio scende verso lo 0.
+#   Il campo dipende solo da (celle occupate, cella bersaglio): lo mettiamo in
+#   cache con chiave (hash Zobrist dell'occupazione, bersaglio). L'hash si
+#   aggiorna in O(1) a ogni spostamento o morte, quindi una mossa "invalida"
+#   solo la chiave corrente e le configurazioni già viste restano in cache.
+#
+# Orientamento: esagoni "flat-top" a colonne sfalsate (odd-q). Le colonne vanno
+# da sinistra (giocatore) a destra (nemico): 4 colonne per lato x 7 righe,
+# cioè la scacchiera 7x8 di una lobby ruotata di 90 gradi.
+import math
+import random
+from collections import deque
+
+# --- Dimensioni di default ---
+HEX_COLS = 8 # Metà a sinistra per il giocatore, metà a destra per il nemico
+HEX_ROWS = 7
+HEX_SPACING = 72 # Distanza in pixel fra i centri di due celle vicine (< range melee 80)
+BOARD_CENTER = (600, 400) # Centro dell'arena (battle.ARENA_RECT)
+
+# Campi di flusso in cache (ognuno è una lista di N interi)
+FIELD_CACHE_LIMIT = 512
+# Campi nuovi calcolabili in un tick: oltre, chi deve ripianificare fa un
+# passo "greedy" (vicino libero più vicino al bersaglio), costo O(6)
+MAX_FIELDS_PER_TICK = 8
+
+UNREACHABLE = 1 << 30
+
+# Direzioni in coordinate cubiche (x, y, z con x + y + z = 0)
+CUBE_DIRECTIONS = ((1, -1, 0), (1, 0, -1), (0, 1, -1), (-1, 1, 0), (-1, 0, 1), (0, -1, 1))
+
+
+class HexBoard:
+    """
+    Scacchiera esagonale cols x rows. Le celle sono interi (col * rows + row).
+    Tabelle precalcolate: centers[cella], neighbors[cella], distance[a][b].
+    Occupazione: occupant[cella] -> campione o None, cell_of[campione] -> cella.
+    """
+    def __init__(self, cols=HEX_COLS, rows=HEX_ROWS, spacing=HEX_SPACING, center=BOARD_CENTER):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.spacing = float(spacing)
+        radius = spacing / math.sqrt(3) # Raggio dell'esagono (centro-vertice)
+
+        # --- Geometria ---
+        width = (cols - 1) * 1.5 * radius
+        height = (rows - 1) * spacing + (spacing / 2 if cols > 1 else 0)
+        origin_x = center[0] - width / 2
+        origin_y = center[1] - height / 2
+        self.radius = radius
+        self.centers = []
+        cubes = []
+        for cell in range(self.size):
+            col, row = divmod(cell, rows)
+            self.centers.append((origin_x + col * 1.5 * radius,
+                                 origin_y + row * spacing + (spacing / 2 if col & 1 else 0)))
+            x = col
+            z = row - (col - (col & 1)) // 2
+            cubes.append((x, -x - z, z))
+        cube_index = {cube: cell for cell, cube in enumerate(cubes)}
+
+        # --- Tabelle precalcolate ---
+        self.neighbors = []
+        for x, y, z in cubes:
+            self.neighbors.append(tuple(cube_index[(x + dx, y + dy, z + dz)]
+                                        for dx, dy, dz in CUBE_DIRECTIONS
+                                        if (x + dx, y + dy, z + dz) in cube_index))
+        self.distance = [[max(abs(ax - bx), abs(ay - by), abs(az - bz)) for bx, by, bz in cubes]
+                         for ax, ay, az in cubes]
+
+        # --- Occupazione + hash Zobrist (chiavi fisse: stessa scacchiera = stessi hash) ---
+        key_rng = random.Random(cols * 1000 + rows)
+        self.zobrist = [key_rng.getrandbits(64) for _ in range(self.size)]
+        self.occupant = [None] * self.size
+        self.cell_of = {}
+        self.occupancy_hash = 0
+
+        # --- Movimento e pathfinding ---
+        self.waypoints = {} # campione -> cella verso cui sta camminando
+        self.field_cache = {} # (hash occupazione, cella bersaglio) -> distanze
+        self.field_budget = MAX_FIELDS_PER_TICK
+        self.fields_built = 0 # Statistiche (cache miss totali)
+        self.field_hits = 0
+
+    # --- Geometria ---
+    def cell(self, col, row):
+        return col * self.rows + row
+
+    def col_row(self, cell):
+        return divmod(cell, self.rows)
+
+    def cell_at(self, x, y):
+        """ Cella il cui centro è più vicino al punto (x, y) """
+        best, best_d2 = 0, float('inf')
+        for cell, (cx, cy) in enumerate(self.centers):
+            d2 = (cx - x) ** 2 + (cy - y) ** 2
+            if d2 < best_d2:
+                best, best_d2 = cell, d2
+        return best
+
+    def range_in_cells(self, attack_range):
+        """ Gittata in pixel -> celle (melee = 1) """
+        return max(1, int(attack_range // self.spacing))
+
+    # --- Occupazione ---
+    def place(self, champ, cell):
+        """ Mette un campione in una cella libera e lo sposta al centro """
+        if self.occupant[cell] is not None:
+            raise ValueError(f"Cella {self.col_row(cell)} già occupata")
+        self._occupy(champ, cell)
+        champ.x, champ.y = self.centers[cell]
+
+    def _occupy(self, champ, cell):
+        self.occupant[cell] = champ
+        self.cell_of[champ] = cell
+        self.occupancy_hash ^= self.zobrist[cell]
+
+    def _vacate(self, champ):
+        cell = self.cell_of.pop(champ)
+        self.occupant[cell] = None
+        self.occupancy_hash ^= self.zobrist[cell]
+        return cell
+
+    def remove(self, champ):
+        """ Libera la cella di un campione (es. quando muore) """
+        if champ in self.cell_of:
+            self._vacate(champ)
+        self.waypoints.pop(champ, None)
+
+    def remove_dead(self):
+        """ Libera le celle dei campioni morti (una volta per tick) """
+        for champ in [c for c in self.cell_of if not c.is_alive()]:
+            self.remove(champ)
+
+    def deploy(self, team, left_side):
+        """
+        Schiera una squadra sulla sua metà: i melee nella colonna di prima linea,
+        gli altri dalla colonna più arretrata; le righe dal centro verso i bordi.
+        """
+        half = self.cols // 2
+        columns = list(range(half - 1, -1, -1)) if left_side else list(range(half, self.cols))
+        center_row = self.rows // 2
+        rows_order = sorted(range(self.rows), key=lambda r: (abs(r - center_row), r))
+        front_first = [self.cell(c, r) for c in columns for r in rows_order]
+        back_first = [self.cell(c, r) for c in reversed(columns) for r in rows_order]
+        for champ in team:
+            order = front_first if self.range_in_cells(champ.attack_range) <= 1 else back_first
+            free = next((cell for cell in order if self.occupant[cell] is None), None)
+            if free is None:
+                raise ValueError(f"Metà scacchiera piena: {len(team)} campioni su "
+                                 f"{half * self.rows} celle")
+            self.place(champ, free)
+
+    # --- Pathfinding ---
+    def begin_tick(self):
+        self.field_budget = MAX_FIELDS_PER_TICK
+
+    def flow_field(self, target_cell):
+        """
+        Distanze di percorso verso 'target_cell' passando solo per celle libere
+        (UNREACHABLE dove non si arriva). None se il budget del tick è finito.
+        """
+        key = (self.occupancy_hash, target_cell)
+        field = self.field_cache.get(key)
+        if field is not None:
+            self.field_hits += 1
+            return field
+        if self.field_budget <= 0:
+            return None
+        self.field_budget -= 1
+        self.fields_built += 1
+
+        field = [UNREACHABLE] * self.size
+        field[target_cell] = 0
+        occupant = self.occupant
+        neighbors = self.neighbors
+        queue = deque((target_cell,))
+        while queue:
+            cell = queue.popleft()
+            next_distance = field[cell] + 1
+            for other in neighbors[cell]:
+                if field[other] == UNREACHABLE and occupant[other] is None:
+                    field[other] = next_distance
+                    queue.append(other)
+
+        if len(self.field_cache) >= FIELD_CACHE_LIMIT:
+            del self.field_cache[next(iter(self.field_cache))] # Il più vecchio
+        self.field_cache[key] = field
+        return field
+
+    def next_step(self, cell, target_cell):
+        """ Prossima cella libera verso il bersaglio, o None se conviene aspettare """
+        field = self.flow_field(target_cell)
+        occupant = self.occupant
+        best = None
+        if field is not None:
+            best_value = UNREACHABLE
+            for other in self.neighbors[cell]:
+                if occupant[other] is None and field[other] < best_value:
+                    best, best_value = other, field[other]
+            if best is not None:
+                return best
+        # Budget finito o bersaglio irraggiungibile: un passo che accorci la distanza in linea d'aria
+        distance_to_target = self.distance[target_cell]
+        best_value = distance_to_target[cell]
+        for other in self.neighbors[cell]:
+            if occupant[other] is None and distance_to_target[other] < best_value:
+                best, best_value = other, distance_to_target[other]
+        return best
+
+    # --- Movimento dei campioni ---
+    def advance(self, champ, target, delta_time):
+        """
+        Un tick di movimento di 'champ' verso 'target'.
+        Restituisce True se si sta muovendo (o aspetta un varco),
+        False se è a distanza d'attacco e fermo al centro della sua cella.
+        """
+        waypoint = self.waypoints.get(champ)
+        if waypoint is None:
+            cell = self.cell_of[champ]
+            target_cell = self.cell_of.get(target)
+            if target_cell is None or \
+                    self.distance[cell][target_cell] <= self.range_in_cells(champ.attack_range):
+                return False
+            waypoint = self.next_step(cell, target_cell)
+            if waypoint is None:
+                return True # Bloccato: aspetta che si liberi un varco
+            # La cella di arrivo viene prenotata subito: nessun altro ci entra
+            self._vacate(champ)
+            self._occupy(champ, waypoint)
+            self.waypoints[champ] = waypoint
+
+        # Camminata in pixel verso il centro della cella prenotata
+        cx, cy = self.centers[waypoint]
+        dx, dy = cx - champ.x, cy - champ.y
+        remaining = math.hypot(dx, dy)
+        step = champ.move_speed * delta_time
+        if remaining <= step:
+            champ.x, champ.y = cx, cy
+            del self.waypoints[champ]
+        else:
+            champ.x += dx / remaining * step
+            champ.y += dy / remaining * step
+        return True
@@ -0,0 +1,183 @@
+# montecarlo.py
+# Stima Monte Carlo della percentuale di vittoria fra due composizioni.
+# Le battaglie girano in headless (BattleCore, o EventBattle con --events) su un pool di processi.
+#
+# Uso da riga di comando:
+#   python montecarlo.py "Vi:2,Ahri,Shen" "Garen,Garen,Garen" -n 2000 --seed 42
+#   python montecarlo.py "Vi:2,Ahri,Shen" "Garen,Garen,Garen" -n 20000 --events
+import argparse
+import math
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from registry import ChampionRegistry, get_registry
+from battle_core import BattleCore, FIXED_DT, MAX_BATTLE_TIME
+from event_battle import EventBattle
+
+# Quante battaglie manda ogni processo in un colpo solo
+CHUNK_SIZE = 64
+
+
+def parse_composition(text):
+    """
+    Converte "Vi:2,Ahri,Shen" in [("Vi", 2), ("Ahri", 1), ("Shen", 1)].
+    Il livello (stelle) è opzionale e vale 1 di default.
+    """
+    composition = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.partition(":")
+        composition.append((name.strip(), int(level) if level else 1))
+    if not composition:
+        raise ValueError(f"Composizione vuota: {text!r}")
+    return composition
+
+
+def build_team(composition, champions_database):
+    """
+    Crea la squadra base (come quella che il giocatore porta in battaglia)
+    da una lista di (nome, livello).
+    """
+    registry = ChampionRegistry.of(champions_database)
+    team = []
+    for name, level in composition:
+        if name not in registry:
+            raise ValueError(f"Campione sconosciuto: {name}")
+        team.append(registry.create(name, level))
+    return team
+
+
+class WinRateResult:
+    """ Esito di una stima Monte Carlo (dal punto di vista della squadra 'player') """
+    def __init__(self, battles, wins, losses, draws, total_duration, confidence=0.95):
+        self.battles = battles
+        self.wins = wins
+        self.losses = losses
+        self.draws = draws
+        self.confidence = confidence
+        self.win_rate = wins / battles if battles else 0.0
+        self.avg_duration = total_duration / battles if battles else 0.0
+        self.ci_low, self.ci_high = wilson_interval(wins, battles, confidence)
+
+    def as_dict(self):
+        return {
+            "battles": self.battles,
+            "wins": self.wins,
+            "losses": self.losses,
+            "draws": self.draws,
+            "win_rate": self.win_rate,
+            "ci_low": self.ci_low,
+            "ci_high": self.ci_high,
+            "confidence": self.confidence,
+            "avg_duration": self.avg_duration,
+        }
+
+    def __repr__(self):
+        return (f"WinRateResult(win_rate={self.win_rate:.3f}, "
+                f"ci=[{self.ci_low:.3f}, {self.ci_high:.3f}], battles={self.battles}, "
+                f"avg_duration={self.avg_duration:.1f}s)")
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """ Intervallo di confidenza di Wilson per una proporzione """
+    if trials == 0:
+        return 0.0, 1.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+# --- Lavoro nei processi figli ---
+def _init_worker():
+    get_registry() # Il registro si costruisce una volta per processo
+
+
+def _run_chunk(player_comp, enemy_comp, seeds, dt, max_time, events=False):
+    """ Simula una battaglia per ogni seme. Restituisce [(winner, durata), ...] """
+    database = get_registry()
+    player_team = build_team(player_comp, database)
+    enemy_team = build_team(enemy_comp, database)
+    results = []
+    for seed in seeds:
+        battle = (EventBattle if events else BattleCore)(player_team, enemy_team, database, seed)
+        battle.run(dt, max_time)
+        results.append((battle.winner, battle.elapsed_time))
+    return results
+
+
+def estimate_win_rate(player_comp, enemy_comp, battles=1000, seed=0, workers=None,
+                      confidence=0.95, dt=FIXED_DT, max_time=MAX_BATTLE_TIME, events=False):
+    """
+    Simula 'battles' battaglie indipendenti fra due composizioni [(nome, livello), ...].
+    Ogni battaglia ha il proprio seme, derivato da 'seed': il risultato è
+    riproducibile e non dipende dal numero di processi.
+    Con workers=1 tutto gira nel processo corrente.
+    Con events=True le battaglie usano il motore a eventi (event_battle.py).
+    """
+    # Validiamo subito le composizioni (errori chiari prima di lanciare i processi)
+    database = get_registry()
+    build_team(player_comp, database)
+    build_team(enemy_comp, database)
+
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.getrandbits(64) for _ in range(battles)]
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, battles, CHUNK_SIZE)]
+
+    outcomes = []
+    if workers == 1:
+        for chunk in chunks:
+            outcomes.extend(_run_chunk(player_comp, enemy_comp, chunk, dt, max_time, events))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_run_chunk, player_comp, enemy_comp, chunk, dt, max_time, events)
+                       for chunk in chunks]
+            for future in futures: # In ordine: i risultati non dipendono dallo scheduling
+                outcomes.extend(future.result())
+
+    wins = sum(1 for winner, _ in outcomes if winner == "player")
+    losses = sum(1 for winner, _ in outcomes if winner == "enemy")
+    draws = len(outcomes) - wins - losses
+    total_duration = sum(duration for _, duration in outcomes)
+    return WinRateResult(len(outcomes), wins, losses, draws, total_duration, confidence)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stima la percentuale di vittoria di una composizione contro un'altra.")
+    parser.add_argument("player", help='Composizione del player, es. "Vi:2,Ahri,Shen"')
+    parser.add_argument("enemy", help='Composizione avversaria, es. "Garen,Garen,Garen"')
+    parser.add_argument("-n", "--battles", type=int, default=1000, help="Numero di battaglie")
+    parser.add_argument("--seed", type=int, default=0, help="Seme (stessi argomenti = stesso risultato)")
+    parser.add_argument("--workers", type=int, default=None, help="Processi (default: tutti i core)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Livello di confidenza")
+    parser.add_argument("--events", action="store_true",
+                        help="Motore a eventi discreti (molto più veloce, risultati equivalenti in media)")
+    args = parser.parse_args(argv)
+
+    try:
+        player_comp = parse_composition(args.player)
+        enemy_comp = parse_composition(args.enemy)
+        result = estimate_win_rate(player_comp, enemy_comp, args.battles, args.seed,
+                                   args.workers, args.confidence, events=args.events)
+    except ValueError as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+
+    print(f"{args.player}  vs  {args.enemy}")
+    print(f"Battaglie:        {result.battles} (vittorie {result.wins}, sconfitte {result.losses}, pareggi {result.draws})")
+    print(f"Win rate:         {result.win_rate:.1%}")
+    print(f"IC {result.confidence:.0%}:           [{result.ci_low:.1%}, {result.ci_high:.1%}]")
+    print(f"Durata media:     {result.avg_duration:.1f}s")
+    return 0
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    sys.exit(main())
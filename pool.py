@@ -0,0 +1,202 @@
+# pool.py
+# Pool condiviso dei campioni: un numero FINITO di copie per ogni campione
+# (dipende dal tier), probabilità dei tier che cambiano col livello del giocatore.
+#
+# L'estrazione usa il metodo alias (Vose): dopo una costruzione O(n) ogni
+# estrazione costa O(1) - un solo numero casuale, un confronto, un indice.
+# Le tabelle si ricostruiscono SOLO quando i conteggi cambiano (lazy).
+#
+# Le copie escono dal pool quando vengono comprate e ci rientrano quando
+# vengono vendute (un Lvl 2 vale 3 copie, un Lvl 3 ne vale 9).
+import random
+
+from registry import ChampionRegistry
+
+# Copie disponibili per OGNI campione di quel tier
+TIER_COPIES = {1: 29, 2: 22, 3: 18}
+
+# Probabilità dei tier per livello del giocatore: LEVEL_ODDS[livello] = (tier 1, tier 2, tier 3)
+LEVEL_ODDS = {
+    1: (1.00, 0.00, 0.00),
+    2: (0.75, 0.25, 0.00),
+    3: (0.55, 0.35, 0.10),
+    4: (0.45, 0.35, 0.20),
+    5: (0.35, 0.40, 0.25),
+    6: (0.25, 0.40, 0.35),
+}
+MAX_PLAYER_LEVEL = max(LEVEL_ODDS)
+
+
+def copies_for_level(level):
+    """ Quante copie "da 1 stella" rappresenta un campione di quel livello """
+    return 3 ** (max(level, 1) - 1)
+
+
+class AliasTable:
+    """
+    Tabella alias per estrarre un indice con probabilità proporzionale ai pesi.
+    I pesi nulli non vengono mai estratti. ValueError se sono tutti nulli.
+    """
+    __slots__ = ("prob", "alias", "size")
+
+    def __init__(self, weights):
+        size = len(weights)
+        total = float(sum(weights))
+        if size == 0 or total <= 0:
+            raise ValueError("AliasTable: servono pesi positivi")
+        scaled = [w * size / total for w in weights]
+        prob = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Quello che resta (errori di arrotondamento) ha probabilità piena
+        self.prob = prob
+        self.alias = alias
+        self.size = size
+
+    def sample(self, rng):
+        u = rng.random() * self.size
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+
+class ChampionPool:
+    """
+    Pool condiviso fra i giocatori di una partita.
+    - counts[id]: copie ancora disponibili del campione 'id' (id del registro)
+    - draw/roll: estrazioni O(1) (tier secondo il livello, poi campione secondo le copie)
+    - take/put_back: aggiornano i conteggi e invalidano SOLO la tabella di quel tier
+    """
+    def __init__(self, champions_database, tier_copies=None, level_odds=None):
+        self.registry = ChampionRegistry.of(champions_database)
+        self.tier_copies = dict(tier_copies or TIER_COPIES)
+        self.level_odds = dict(level_odds or LEVEL_ODDS)
+        self.tiers = sorted(self.tier_copies)
+
+        # Campioni di ogni tier (id del registro)
+        self.tier_members = {tier: [] for tier in self.tiers}
+        for champ_id, template in enumerate(self.registry.templates):
+            if template.tier not in self.tier_members:
+                raise ValueError(f"{template.name}: tier {template.tier} senza copie nel pool")
+            self.tier_members[template.tier].append(champ_id)
+        self.reset()
+
+    def reset(self):
+        """ Pool pieno (nuova partita) """
+        self.counts = [self.tier_copies[t.tier] for t in self.registry.templates]
+        self.tier_totals = {tier: len(members) * self.tier_copies[tier]
+                            for tier, members in self.tier_members.items()}
+        self.tier_tables = {} # tier -> AliasTable (None = tier esaurito)
+        self.odds_tables = {} # (livello, tier non vuoti) -> (AliasTable, tier)
+
+    # --- Conteggi ---
+    def remaining(self, key):
+        """ Copie disponibili per nome o id """
+        return self.counts[self.registry._id(key)]
+
+    def take(self, key, copies=1):
+        """ Toglie copie dal pool. False (e nulla cambia) se non ce ne sono abbastanza """
+        champ_id = self.registry._id(key)
+        if self.counts[champ_id] < copies:
+            return False
+        self._change(champ_id, -copies)
+        return True
+
+    def put_back(self, key, copies=1):
+        """ Rimette copie nel pool (vendita, unità perse...) """
+        self._change(self.registry._id(key), copies)
+
+    def _change(self, champ_id, delta):
+        self.counts[champ_id] += delta
+        tier = self.registry.templates[champ_id].tier
+        self.tier_totals[tier] += delta
+        self.tier_tables.pop(tier, None) # Si ricostruisce alla prossima estrazione
+
+    def snapshot(self):
+        """ {nome: copie disponibili} """
+        return {t.name: count for t, count in zip(self.registry.templates, self.counts)}
+
+    # --- Tabelle alias (lazy) ---
+    def _tier_table(self, tier):
+        if tier not in self.tier_tables:
+            members = self.tier_members[tier]
+            weights = [self.counts[i] for i in members]
+            self.tier_tables[tier] = AliasTable(weights) if sum(weights) > 0 else None
+        return self.tier_tables[tier]
+
+    def _odds_table(self, level):
+        """ Tabella dei tier per il livello, solo fra i tier che hanno ancora copie """
+        level = min(max(level, 1), MAX_PLAYER_LEVEL)
+        odds = self.level_odds[level]
+        available = tuple(tier for tier, p in zip(self.tiers, odds)
+                          if p > 0 and self.tier_totals[tier] > 0)
+        if not available:
+            # Tier del livello esauriti: si pesca da quelli rimasti, in proporzione alle copie
+            available = tuple(tier for tier in self.tiers if self.tier_totals[tier] > 0)
+            if not available:
+                return None
+            return AliasTable([self.tier_totals[tier] for tier in available]), available
+        key = (level, available)
+        cached = self.odds_tables.get(key)
+        if cached is None:
+            weights = [odds[self.tiers.index(tier)] for tier in available]
+            cached = (AliasTable(weights), available)
+            self.odds_tables[key] = cached
+        return cached
+
+    # --- Estrazioni ---
+    def draw(self, level, rng=random):
+        """ Id di un campione estratto (None se il pool è vuoto). Non toglie copie """
+        odds = self._odds_table(level)
+        if odds is None:
+            return None
+        table, available = odds
+        tier = available[table.sample(rng)]
+        return self.tier_members[tier][self._tier_table(tier).sample(rng)]
+
+    def roll(self, level, rng=random, size=5):
+        """ Un'intera riga di shop: lista di id (None se il pool è vuoto) """
+        return [self.draw(level, rng) for _ in range(size)]
+
+    def roll_many(self, level, rolls, rng=random, size=5):
+        """
+        Molte righe di shop in blocco per i simulatori: lista piatta di
+        rolls*size id (riga k = [k*size:(k+1)*size]). I conteggi restano fermi
+        durante il blocco, quindi le tabelle si preparano una volta sola.
+        """
+        odds = self._odds_table(level)
+        if odds is None:
+            return [None] * (rolls * size)
+        table, available = odds
+        tier_prob, tier_alias, tier_size = table.prob, table.alias, table.size
+        # Per ogni tier: (prob, alias, size, membri) in liste locali
+        tiers = []
+        for tier in available:
+            champ_table = self._tier_table(tier)
+            tiers.append((champ_table.prob, champ_table.alias, champ_table.size,
+                          self.tier_members[tier]))
+        uniform = rng.random
+        out = []
+        append = out.append
+        for _ in range(rolls * size):
+            u = uniform() * tier_size
+            i = int(u)
+            if u - i >= tier_prob[i]:
+                i = tier_alias[i]
+            prob, alias, n, members = tiers[i]
+            u = uniform() * n
+            j = int(u)
+            if u - j >= prob[j]:
+                j = alias[j]
+            append(members[j])
+        return out
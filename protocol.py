@@ -0,0 +1,151 @@
+# protocol.py
+# Protocollo binario compatto fra server.py e i client (bot_client.py).
+# Ogni messaggio: intestazione di 5 byte + payload.
+#   <H lunghezza del payload> <B tipo> <H numero di richiesta>
+# Il server risponde a ogni richiesta con UN messaggio che ha lo stesso
+# numero di richiesta (STATE, RESULT o ERROR): il client misura la latenza
+# di ogni azione e non servono altri identificatori.
+#
+# I campioni viaggiano come (id nel registro, livello): 2 byte l'uno.
+# Uno STATE tipico (5 carte nello shop, 3 in campo, 2 in panchina) pesa ~25 byte.
+import struct
+
+HEADER = struct.Struct("<HBH")
+MAX_PAYLOAD = 0xFFFF
+
+# --- Client -> server ---
+JOIN = 1 # <Q seme> (0 = casuale)
+BUY = 2 # <B slot dello shop>
+SELL = 3 # <B dove> <B indice>
+REROLL = 4
+PLACE = 5 # <B da dove> <B da indice> <B verso dove> <B verso indice (NO_INDEX = in fondo)>
+READY = 6 # Conferma: si combatte il round
+LEAVE = 7
+
+# --- Server -> client ---
+STATE = 64 # Stato del giocatore (vedi encode_state)
+RESULT = 65 # <B vincitore> <B oro guadagnato> <f durata battaglia> + stato
+ERROR = 66 # <B codice>
+
+# Codici di errore
+ERR_MALFORMED = 1 # Messaggio non decodificabile
+ERR_INVALID = 2 # Azione non valida (oro, spazio, slot vuoto...)
+ERR_NO_LOBBY = 3 # Azione prima di JOIN
+ERR_FULL = 4 # Server pieno
+ERR_GAME_OVER = 5 # Partita finita
+ERROR_NAMES = {ERR_MALFORMED: "malformed", ERR_INVALID: "invalid", ERR_NO_LOBBY: "no_lobby",
+               ERR_FULL: "full", ERR_GAME_OVER: "game_over"}
+
+# Liste del giocatore
+WHERE_CODES = {"board": 0, "bench": 1}
+WHERE_NAMES = {code: name for name, code in WHERE_CODES.items()}
+NO_INDEX = 0xFF
+EMPTY_SLOT = 0xFF
+
+WINNER_CODES = {"player": 0, "enemy": 1, "draw": 2}
+WINNER_NAMES = {code: name for name, code in WINNER_CODES.items()}
+
+_JOIN = struct.Struct("<Q")
+_BYTE = struct.Struct("<B")
+_SELL = struct.Struct("<BB")
+_PLACE = struct.Struct("<BBBB")
+_STATE_HEAD = struct.Struct("<HhBBB") # oro, HP, livello, round, carte nello shop
+_RESULT_HEAD = struct.Struct("<BBf")
+
+
+class ProtocolError(ValueError):
+    """ Messaggio non valido (il server risponde ERR_MALFORMED) """
+
+
+def encode(kind, request_id, payload=b""):
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload troppo grande: {len(payload)} byte")
+    return HEADER.pack(len(payload), kind, request_id & 0xFFFF) + payload
+
+
+async def read_message(reader):
+    """ (tipo, numero di richiesta, payload) dal prossimo messaggio dello stream """
+    length, kind, request_id = HEADER.unpack(await reader.readexactly(HEADER.size))
+    payload = await reader.readexactly(length) if length else b""
+    return kind, request_id, payload
+
+
+# --- Payload delle richieste ---
+def join_payload(seed=0):
+    return _JOIN.pack(seed)
+
+
+def buy_payload(slot):
+    return _BYTE.pack(slot)
+
+
+def sell_payload(where, index):
+    return _SELL.pack(WHERE_CODES[where], index)
+
+
+def place_payload(from_where, from_index, to_where, to_index=None):
+    return _PLACE.pack(WHERE_CODES[from_where], from_index, WHERE_CODES[to_where],
+                       NO_INDEX if to_index is None else to_index)
+
+
+def decode_request(kind, payload):
+    """ Argomenti dell'azione; ProtocolError se il payload non torna """
+    try:
+        if kind == JOIN:
+            return _JOIN.unpack(payload)
+        if kind == BUY:
+            return _BYTE.unpack(payload)
+        if kind == SELL:
+            where, index = _SELL.unpack(payload)
+            return WHERE_NAMES[where], index
+        if kind == PLACE:
+            from_where, from_index, to_where, to_index = _PLACE.unpack(payload)
+            return (WHERE_NAMES[from_where], from_index, WHERE_NAMES[to_where],
+                    None if to_index == NO_INDEX else to_index)
+        if kind in (REROLL, READY, LEAVE) and not payload:
+            return ()
+    except (struct.error, KeyError):
+        pass
+    raise ProtocolError(f"Richiesta non valida (tipo {kind}, {len(payload)} byte)")
+
+
+# --- Stato del giocatore ---
+def encode_state(game):
+    """ Oro, HP, livello, round, shop, scacchiera e panchina di un GameCore """
+    registry = game.registry
+    shop = game.shop_manager.shop_champs
+    parts = [_STATE_HEAD.pack(game.player_gold, game.player_hp, game.player_level,
+                              min(game.round_number, 0xFF), len(shop))]
+    parts.append(bytes(EMPTY_SLOT if c is None else registry.id_of(c.name) for c in shop))
+    for champs in (game.board, game.bench):
+        units = bytearray((len(champs),))
+        for champ in champs:
+            units += bytes((registry.id_of(champ.name), champ.level))
+        parts.append(bytes(units))
+    return b"".join(parts)
+
+
+def decode_state(payload, offset=0):
+    """ Dizionario dello stato (i campioni come coppie (id, livello)) """
+    gold, hp, level, round_number, shop_size = _STATE_HEAD.unpack_from(payload, offset)
+    offset += _STATE_HEAD.size
+    shop = [None if b == EMPTY_SLOT else b for b in payload[offset:offset + shop_size]]
+    offset += shop_size
+    lists = []
+    for _ in range(2):
+        count = payload[offset]
+        offset += 1
+        lists.append([(payload[offset + 2 * i], payload[offset + 2 * i + 1]) for i in range(count)])
+        offset += 2 * count
+    return {"gold": gold, "hp": hp, "level": level, "round": round_number,
+            "shop": shop, "board": lists[0], "bench": lists[1]}
+
+
+def encode_result(winner, gold_earned, battle_time, game):
+    return _RESULT_HEAD.pack(WINNER_CODES[winner], gold_earned, battle_time) + encode_state(game)
+
+
+def decode_result(payload):
+    winner, gold_earned, battle_time = _RESULT_HEAD.unpack_from(payload)
+    return {"winner": WINNER_NAMES[winner], "gold_earned": gold_earned,
+            "battle_time": battle_time, "state": decode_state(payload, _RESULT_HEAD.size)}
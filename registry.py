@@ -0,0 +1,102 @@
+# registry.py
+# Registro dei campioni: costruito UNA volta dal database, indicizzato per
+# nome e per id intero, con le statistiche già calcolate per ogni livello (stelle).
+from champions import Champion, get_available_champions
+
+# Moltiplicatori di livello (Lvl 3+ usa sempre l'ultimo)
+LEVEL_MULTIPLIERS = {1: 1.0, 2: 1.6, 3: 2.5}
+MAX_LEVEL = max(LEVEL_MULTIPLIERS)
+
+
+class StatRow:
+    """ Statistiche di un campione a un certo livello (interi, già scalati) """
+    __slots__ = ("hp", "attack", "defense")
+
+    def __init__(self, hp, attack, defense):
+        self.hp = hp
+        self.attack = attack
+        self.defense = defense
+
+    def __repr__(self):
+        return f"StatRow(hp={self.hp}, attack={self.attack}, defense={self.defense})"
+
+
+class ChampionRegistry:
+    """
+    Tabella precompilata dei campioni disponibili.
+    - per nome o per id: lookup O(1)
+    - stats(nome, livello): riga precalcolata (HP e attacco scalano col livello,
+      la difesa no), niente moltiplicazioni durante la partita
+    - create(nome, livello): nuova istanza Champion che condivide il template
+    """
+    def __init__(self, champions_database):
+        self.champions = list(champions_database) # I campioni "da catalogo" (id = posizione)
+        self.templates = [c.template for c in self.champions]
+        self.ids = {}
+        self.stat_rows = [] # stat_rows[id][livello]
+        for champ_id, template in enumerate(self.templates):
+            self.ids[template.name] = champ_id
+            rows = [None] # Il livello 0 non esiste
+            for level in range(1, MAX_LEVEL + 1):
+                multiplier = LEVEL_MULTIPLIERS[level]
+                rows.append(StatRow(int(template.hp * multiplier),
+                                    int(template.attack * multiplier),
+                                    template.defense))
+            self.stat_rows.append(rows)
+
+    def __len__(self):
+        return len(self.champions)
+
+    def __iter__(self):
+        return iter(self.champions)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def id_of(self, name):
+        """ Id intero del campione (KeyError se non esiste) """
+        return self.ids[name]
+
+    def _id(self, key):
+        return key if isinstance(key, int) else self.ids[key]
+
+    def get(self, key):
+        """ Campione "da catalogo" per nome o per id """
+        return self.champions[self._id(key)]
+
+    def template(self, key):
+        return self.templates[self._id(key)]
+
+    def stats(self, key, level=1):
+        """ Riga di statistiche per nome/id e livello """
+        return self.stat_rows[self._id(key)][min(max(level, 1), MAX_LEVEL)]
+
+    def create(self, key, level=1):
+        """ Nuovo campione di quel livello, con le statistiche già scalate """
+        champ_id = self._id(key)
+        row = self.stat_rows[champ_id][min(max(level, 1), MAX_LEVEL)]
+        return Champion.from_template(self.templates[champ_id], level,
+                                      row.hp, row.attack, row.defense)
+
+    @staticmethod
+    def of(champions_database):
+        """
+        Restituisce un registro per 'champions_database': se è già un registro
+        lo restituisce così com'è, altrimenti ne costruisce uno nuovo.
+        Chi crea molti oggetti dallo stesso database passi il registro
+        (get_registry() o uno costruito una volta), non la lista.
+        """
+        if isinstance(champions_database, ChampionRegistry):
+            return champions_database
+        return ChampionRegistry(champions_database)
+
+
+_default_registry = None
+
+
+def get_registry():
+    """ Registro costruito una sola volta da get_available_champions() """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ChampionRegistry(get_available_champions())
+    return _default_registry
@@ -0,0 +1,343 @@
+# replay.py
+# Registrazione e riproduzione delle battaglie in formato binario compatto.
+#
+# Una replay contiene: le squadre iniziali (nome + livello), il seme, il passo
+# di simulazione, lo stato iniziale di ogni unità e, per ogni tick, SOLO le
+# unità che sono cambiate (posizione quantizzata a 1/4 di pixel, HP, mana,
+# abilità lanciata, popup danno). Tutto il corpo è compresso con zlib.
+#
+# Uso da riga di comando:
+#   python replay.py info battaglia.tftr
+#   python replay.py view battaglia.tftr     (apre la finestra pygame)
+import struct
+import sys
+import zlib
+
+from registry import ChampionRegistry
+
+MAGIC = b"TFTR"
+VERSION = 1
+POSITION_SCALE = 4 # Quarti di pixel
+
+# --- Bit della maschera per unità ---
+FIELD_X = 1
+FIELD_Y = 2
+FIELD_HP = 4
+FIELD_MANA = 8
+FIELD_CAST = 16
+FIELD_POPUPS = 32
+
+WINNER_CODES = {None: 0, "player": 1, "enemy": 2, "draw": 3}
+WINNER_NAMES = {code: name for name, code in WINNER_CODES.items()}
+
+CRIT_COLOR = (255, 0, 0)
+HIT_COLOR = (255, 255, 0)
+
+_HEADER = struct.Struct("<4sBQ") # magic, versione, seme
+_UNIT_INIT = struct.Struct("<hhiiHH") # x, y, hp, max_hp, mana, mana_max
+_UNIT_DELTA = struct.Struct("<HB") # indice unità, maschera
+_POS = struct.Struct("<h")
+_HP = struct.Struct("<i")
+_MANA = struct.Struct("<H")
+_POPUP = struct.Struct("<iB") # danno, crit
+_COUNT = struct.Struct("<H")
+_FRAME = struct.Struct("<fH") # delta_time del tick, unità cambiate
+_FOOTER = struct.Struct("<BI") # vincitore, numero di tick
+
+
+def _quantize(value):
+    return int(round(value * POSITION_SCALE))
+
+
+class Replay:
+    """
+    Replay decodificata.
+    - teams: ([(nome, livello), ...] player, [...] enemy)
+    - initial: [(x, y, hp, max_hp, mana, mana_max), ...] per unità (x, y quantizzati)
+    - frames: per ogni tick, lista di (indice, maschera, campi...) delle unità cambiate
+    - frame_dts: delta_time di ogni tick (costante in headless, variabile dal vivo)
+    """
+    def __init__(self, seed, teams, initial, frames, frame_dts, winner):
+        self.seed = seed
+        self.teams = teams
+        self.initial = initial
+        self.frames = frames
+        self.frame_dts = frame_dts
+        self.winner = winner
+
+    @property
+    def duration(self):
+        return sum(self.frame_dts)
+
+    # --- Codifica ---
+    def to_bytes(self):
+        body = bytearray()
+        for team in self.teams:
+            body += _COUNT.pack(len(team))
+            for name, level in team:
+                encoded = name.encode("utf-8")
+                body += struct.pack("<B", len(encoded)) + encoded + struct.pack("<B", level)
+        for unit in self.initial:
+            body += _UNIT_INIT.pack(*unit)
+        body += struct.pack("<I", len(self.frames))
+        for frame, dt in zip(self.frames, self.frame_dts):
+            body += _FRAME.pack(dt, len(frame))
+            for index, mask, x, y, hp, mana, popups in frame:
+                body += _UNIT_DELTA.pack(index, mask)
+                if mask & FIELD_X:
+                    body += _POS.pack(x)
+                if mask & FIELD_Y:
+                    body += _POS.pack(y)
+                if mask & FIELD_HP:
+                    body += _HP.pack(hp)
+                if mask & FIELD_MANA:
+                    body += _MANA.pack(mana)
+                if mask & FIELD_POPUPS:
+                    body += struct.pack("<B", len(popups))
+                    for damage, crit in popups:
+                        body += _POPUP.pack(damage, crit)
+        body += _FOOTER.pack(WINNER_CODES.get(self.winner, 0), len(self.frames))
+        return _HEADER.pack(MAGIC, VERSION, self.seed) + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Non è una replay TFT (magic errato)")
+        if version != VERSION:
+            raise ValueError(f"Versione replay non supportata: {version}")
+        body = zlib.decompress(data[_HEADER.size:])
+        offset = 0
+
+        def read(fmt):
+            nonlocal offset
+            values = fmt.unpack_from(body, offset)
+            offset += fmt.size
+            return values
+
+        teams = []
+        for _ in range(2):
+            (count,) = read(_COUNT)
+            team = []
+            for _ in range(count):
+                (length,) = struct.unpack_from("<B", body, offset)
+                offset += 1
+                name = body[offset:offset + length].decode("utf-8")
+                offset += length
+                (level,) = struct.unpack_from("<B", body, offset)
+                offset += 1
+                team.append((name, level))
+            teams.append(team)
+
+        n_units = len(teams[0]) + len(teams[1])
+        initial = [read(_UNIT_INIT) for _ in range(n_units)]
+
+        (n_frames,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        frames = []
+        frame_dts = []
+        for _ in range(n_frames):
+            dt, count = read(_FRAME)
+            frame_dts.append(dt)
+            frame = []
+            for _ in range(count):
+                index, mask = read(_UNIT_DELTA)
+                x = read(_POS)[0] if mask & FIELD_X else None
+                y = read(_POS)[0] if mask & FIELD_Y else None
+                hp = read(_HP)[0] if mask & FIELD_HP else None
+                mana = read(_MANA)[0] if mask & FIELD_MANA else None
+                popups = ()
+                if mask & FIELD_POPUPS:
+                    (n_popups,) = struct.unpack_from("<B", body, offset)
+                    offset += 1
+                    popups = tuple(read(_POPUP) for _ in range(n_popups))
+                frame.append((index, mask, x, y, hp, mana, popups))
+            frames.append(frame)
+
+        winner_code, _ = read(_FOOTER)
+        return cls(seed, (teams[0], teams[1]), initial, frames, frame_dts,
+                   WINNER_NAMES.get(winner_code))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """
+    Registra un BattleCore: si aggancia con battle.recorder = ReplayRecorder(battle)
+    e BattleCore.step() chiama capture() alla fine di ogni tick.
+    """
+    def __init__(self, battle):
+        self.battle = battle
+        self.units = battle.all_champs
+        self.teams = ([(c.name, c.level) for c in battle.player_team],
+                      [(c.name, c.level) for c in battle.enemy_team])
+        self.initial = []
+        self.last = []
+        for champ in self.units:
+            state = [_quantize(champ.x), _quantize(champ.y), champ.hp, champ.current_mana,
+                     champ.spell_animation_timer, champ.popups_added]
+            self.last.append(state)
+            self.initial.append((state[0], state[1], champ.hp, champ.max_hp,
+                                 champ.current_mana, champ.mana_max))
+        self.frames = []
+        self.frame_dts = []
+
+    def capture(self, delta_time):
+        """ Salva le differenze dell'ultimo tick (durato 'delta_time' secondi) """
+        frame = []
+        for index, champ in enumerate(self.units):
+            last = self.last[index]
+            mask = 0
+            x = _quantize(champ.x)
+            y = _quantize(champ.y)
+            if x != last[0]:
+                mask |= FIELD_X
+                last[0] = x
+            if y != last[1]:
+                mask |= FIELD_Y
+                last[1] = y
+            if champ.hp != last[2]:
+                mask |= FIELD_HP
+                last[2] = champ.hp
+            if champ.current_mana != last[3]:
+                mask |= FIELD_MANA
+                last[3] = champ.current_mana
+            if champ.spell_animation_timer > last[4]:
+                mask |= FIELD_CAST # Il timer è ripartito: nuova abilità
+            last[4] = champ.spell_animation_timer
+            popups = ()
+            new_popups = champ.popups_added - last[5]
+            if new_popups:
+                mask |= FIELD_POPUPS
+                last[5] = champ.popups_added
+                # I popup nuovi sono gli ultimi della lista
+                recent = champ.damage_popup_texts[-new_popups:] if champ.damage_popup_texts else ()
+                popups = tuple((int(p["text"]), 1 if p["color"] == CRIT_COLOR else 0) for p in recent)
+            if mask:
+                frame.append((index, mask, x, y, champ.hp, champ.current_mana, popups))
+        self.frames.append(frame)
+        self.frame_dts.append(delta_time)
+
+    def finish(self):
+        """ Replay della battaglia registrata (fin qui) """
+        battle = self.battle
+        return Replay(battle.seed, self.teams, self.initial, self.frames,
+                      self.frame_dts, battle.winner if battle.is_over else None)
+
+
+class ReplayPlayer:
+    """
+    Riproduce una Replay frame per frame SENZA simulare: ricrea i campioni
+    (per nome, colore e livello) e applica le differenze registrate.
+    Espone gli stessi attributi di BattleCore usati dal disegno
+    (player_team, enemy_team, all_champs, is_over, winner).
+    """
+    def __init__(self, replay, champions_database):
+        registry = ChampionRegistry.of(champions_database)
+        self.replay = replay
+        self.player_team = [registry.create(name, level) for name, level in replay.teams[0]]
+        self.enemy_team = [registry.create(name, level) for name, level in replay.teams[1]]
+        self.all_champs = self.player_team + self.enemy_team
+        for champ, (x, y, hp, max_hp, mana, mana_max) in zip(self.all_champs, replay.initial):
+            champ.x = x / POSITION_SCALE
+            champ.y = y / POSITION_SCALE
+            champ.hp = hp
+            champ.max_hp = max_hp
+            champ.current_mana = mana
+        self.frame_index = 0
+        self.is_over = not replay.frames
+        self.winner = replay.winner if self.is_over else None
+
+    def step(self):
+        """ Applica il prossimo frame della replay """
+        if self.is_over:
+            return
+        dt = self.replay.frame_dts[self.frame_index]
+        for index, mask, x, y, hp, mana, popups in self.replay.frames[self.frame_index]:
+            champ = self.all_champs[index]
+            if mask & FIELD_X:
+                champ.x = x / POSITION_SCALE
+            if mask & FIELD_Y:
+                champ.y = y / POSITION_SCALE
+            if mask & FIELD_HP:
+                champ.hp = hp
+            if mask & FIELD_MANA:
+                champ.current_mana = mana
+            if mask & FIELD_CAST:
+                champ.spell_animation_timer = 1.0 + dt # Come in BattleCore: il timer scende nello stesso tick
+            for damage, crit in popups:
+                champ.add_damage_popup(str(damage), CRIT_COLOR if crit else HIT_COLOR)
+
+        # Stesso invecchiamento di BattleCore.step
+        for champ in self.all_champs:
+            if champ.spell_animation_timer > 0:
+                champ.spell_animation_timer -= dt
+            if champ.damage_popup_texts:
+                for popup in list(champ.damage_popup_texts):
+                    popup["timer"] -= dt
+                    if popup["timer"] <= 0:
+                        champ.damage_popup_texts.remove(popup)
+
+        self.frame_index += 1
+        if self.frame_index >= len(self.replay.frames):
+            self.is_over = True
+            self.winner = self.replay.winner
+
+
+def view(path):
+    """ Apre una finestra pygame e riproduce la replay con BattleManager.draw """
+    import pygame
+    from config import WIDTH, HEIGHT
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"Replay - {path}")
+
+    from battle import ReplayViewer
+    from registry import get_registry
+    viewer = ReplayViewer(Replay.load(path), get_registry())
+    clock = pygame.time.Clock()
+    running = True
+    real_dt = 0.0
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            viewer.handle_event(event) # Velocità e salto al risultato
+        viewer.update(real_dt)
+        viewer.draw(screen)
+        pygame.display.flip()
+        real_dt = clock.tick(60) / 1000.0
+    pygame.quit()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] not in ("info", "view"):
+        print("Uso: python replay.py info|view <file.tftr>", file=sys.stderr)
+        return 2
+    command, path = argv
+    if command == "view":
+        view(path)
+        return 0
+    replay = Replay.load(path)
+    with open(path, "rb") as f:
+        size = len(f.read())
+    print(f"Seme:      {replay.seed}")
+    print(f"Player:    {replay.teams[0]}")
+    print(f"Nemici:    {replay.teams[1]}")
+    print(f"Durata:    {replay.duration:.1f}s ({len(replay.frames)} tick)")
+    print(f"Vincitore: {replay.winner}")
+    print(f"Dimensione: {size} byte")
+    return 0
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    sys.exit(main())
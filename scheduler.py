@@ -0,0 +1,53 @@
+# scheduler.py
+# Ritmo unico della simulazione: il loop del gioco misura il tempo reale con
+# UN solo clock e lo passa qui; lo scheduler decide quanti passi FISSI di
+# simulazione eseguire (accumulatore a passo fisso). Il rendering resta uno
+# per frame, qualunque sia il numero di passi.
+#
+# Dato che ogni passo è sempre lungo FIXED_DT, una battaglia finisce allo
+# stesso modo a 1x, 16x o saltando direttamente al risultato.
+from battle_core import FIXED_DT
+
+# Velocità disponibili (avanti veloce)
+SPEEDS = (1, 2, 4, 16)
+# Tempo reale massimo considerato in un frame (dopo uno scatto/blocco non si "recupera" tutto)
+MAX_FRAME_TIME = 0.1
+
+
+class FixedStepScheduler:
+    """
+    Accumulatore a passo fisso con moltiplicatore di velocità.
+        steps = scheduler.advance(real_dt)
+        for _ in range(steps): battle.step(scheduler.step_dt)
+    """
+    def __init__(self, step_dt=FIXED_DT, speed=1):
+        self.step_dt = step_dt
+        self.speed = speed
+        self.accumulator = 0.0
+        # Oltre questo numero di passi per frame si lascia indietro il tempo
+        # (evita la "spirale": frame lenti -> più passi -> frame ancora più lenti)
+        self.max_steps = int(MAX_FRAME_TIME * max(SPEEDS) / step_dt) + 1
+
+    def set_speed(self, speed):
+        if speed not in SPEEDS:
+            raise ValueError(f"Velocità non valida: {speed} (disponibili: {SPEEDS})")
+        self.speed = speed
+
+    def cycle_speed(self):
+        """ 1x -> 2x -> 4x -> 16x -> 1x """
+        self.speed = SPEEDS[(SPEEDS.index(self.speed) + 1) % len(SPEEDS)]
+        return self.speed
+
+    def advance(self, real_dt):
+        """ Quanti passi fissi eseguire per 'real_dt' secondi reali """
+        self.accumulator += min(real_dt, MAX_FRAME_TIME) * self.speed
+        steps = int(self.accumulator / self.step_dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_dt
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
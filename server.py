@@ -0,0 +1,255 @@
+# server.py
+# Server asyncio con MOLTE lobby contemporanee (niente pygame).
+# Ogni connessione è una lobby: una HeadlessGame (shop, pool ed economia di
+# GameCore) contro il bot di bot.py. I client mandano le azioni del giocatore
+# con il protocollo binario di protocol.py e ricevono lo stato aggiornato.
+#
+# Il loop asyncio fa solo lavoro breve (azioni dello shop, < 0.1 ms).
+# Le due cose lente sono tenute fuori o limitate:
+# - la battaglia del round (qualche ms di BattleCore) va in un ProcessPoolExecutor:
+#   al processo figlio arrivano solo composizioni (nome, livello) e seme,
+#   quindi l'esito è identico a quello di HeadlessGame.confirm()
+# - la fase di shop del bot (beam search a tempo) resta nel loop perché usa
+#   il pool di copie della lobby, ma con un budget ridotto (BOT_TIME_BUDGET)
+#
+# Uso:
+#   python server.py --port 8765 --workers 4 --max-lobbies 500
+#   python bot_client.py --port 8765 --lobbies 200   # carico da un altro terminale
+import argparse
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import protocol
+from registry import get_registry
+from battle_core import BattleCore, MAX_BATTLE_TIME
+from headless import HeadlessGame, HEADLESS_DT, MAX_ROUNDS
+from montecarlo import build_team
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_LOBBIES = 1000
+# Budget della fase di shop del bot sul server (il client grafico usa 50 ms):
+# è tempo in cui il loop non serve nessun'altra lobby
+BOT_TIME_BUDGET = 0.002
+# Tempi di servizio conservati per le statistiche (per tipo di messaggio)
+LATENCY_HISTORY = 10000
+STATS_INTERVAL = 10.0 # Secondi fra due righe di statistiche (0 = mai)
+
+
+# --- Lavoro nei processi figli ---
+def _init_worker():
+    get_registry() # Il registro si costruisce una volta per processo
+
+
+def resolve_battle(player_comp, enemy_comp, seed, dt=HEADLESS_DT):
+    """ Combatte un round fra due composizioni [(nome, livello), ...]. Restituisce (vincitore, durata) """
+    database = get_registry()
+    battle = BattleCore(build_team(player_comp, database), build_team(enemy_comp, database),
+                        database, seed=seed)
+    winner = battle.run(dt, MAX_BATTLE_TIME)
+    return winner, battle.elapsed_time
+
+
+def composition(team):
+    return [(c.name, c.level) for c in team]
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """ {p: valore} nearest-rank + "max" (come FrameTimer.percentiles) """
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    stats = {}
+    for p in points:
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+        stats[p] = ordered[rank]
+    stats["max"] = ordered[-1]
+    return stats
+
+
+class LobbyServer:
+    """
+    Server TCP: una lobby per connessione, richieste servite in ordine.
+    workers=0 risolve le battaglie nel loop stesso (utile per il debug).
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_lobbies=DEFAULT_MAX_LOBBIES,
+                 workers=None, bot_budget=BOT_TIME_BUDGET, dt=HEADLESS_DT, max_rounds=MAX_ROUNDS):
+        self.host = host
+        self.port = port
+        self.max_lobbies = max_lobbies
+        self.workers = workers
+        self.bot_budget = bot_budget
+        self.dt = dt
+        self.max_rounds = max_rounds
+        self.pool = None
+        self.server = None
+        self.connections = set() # Task dei client collegati (da chiudere all'arresto)
+        self.lobbies = 0
+        # Statistiche
+        self.messages = 0
+        self.battles = 0
+        self.games_finished = 0
+        self.latency = {} # tipo di richiesta -> deque di tempi di servizio (secondi)
+
+    # --- Avvio e arresto ---
+    async def start(self):
+        get_registry()
+        if self.workers != 0:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1] # Con port=0 la sceglie il sistema
+        return self
+
+    async def close(self):
+        """ Smette di accettare connessioni, chiude quelle aperte, poi ferma il pool """
+        if self.server:
+            self.server.close()
+        tasks = list(self.connections)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.server:
+            await self.server.wait_closed()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def serve_forever(self, stats_interval=STATS_INTERVAL):
+        await self.start()
+        print(f"Server su {self.host}:{self.port} (max {self.max_lobbies} lobby)")
+        try:
+            while True:
+                await asyncio.sleep(stats_interval or 3600)
+                if stats_interval:
+                    print(self.stats_line())
+        finally:
+            await self.close()
+
+    # --- Connessioni ---
+    async def handle_client(self, reader, writer):
+        """ Legge le richieste di un client e risponde a ognuna, finché non esce """
+        task = asyncio.current_task()
+        self.connections.add(task)
+        game = None
+        try:
+            while True:
+                try:
+                    kind, request_id, payload = await protocol.read_message(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                if kind == protocol.LEAVE:
+                    break
+                if kind == protocol.JOIN and game is None:
+                    game, reply_kind, reply = self.join(payload)
+                else:
+                    reply_kind, reply = await self.dispatch(game, kind, payload)
+                writer.write(protocol.encode(reply_kind, request_id, reply))
+                await writer.drain()
+                self.record(kind, time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            pass # Arresto del server (close()): la connessione si chiude qui sotto
+        finally:
+            self.connections.discard(task)
+            if game is not None:
+                self.lobbies -= 1
+                self.games_finished += game.is_over()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def join(self, payload):
+        """ Nuova lobby: (partita o None, tipo di risposta, payload) """
+        try:
+            seed, = protocol.decode_request(protocol.JOIN, payload)
+        except protocol.ProtocolError:
+            return None, protocol.ERROR, bytes((protocol.ERR_MALFORMED,))
+        if self.lobbies >= self.max_lobbies:
+            return None, protocol.ERROR, bytes((protocol.ERR_FULL,))
+        game = HeadlessGame(seed or None, self.max_rounds, self.dt, use_bot=True)
+        game.opponent.time_budget = self.bot_budget
+        self.lobbies += 1
+        return game, protocol.STATE, protocol.encode_state(game)
+
+    async def dispatch(self, game, kind, payload):
+        """ Esegue un'azione sulla partita: (tipo di risposta, payload) """
+        if game is None:
+            code = protocol.ERR_INVALID if kind == protocol.JOIN else protocol.ERR_NO_LOBBY
+            return protocol.ERROR, bytes((code,))
+        if kind == protocol.JOIN:
+            return protocol.ERROR, bytes((protocol.ERR_INVALID,)) # Già in una lobby
+        try:
+            args = protocol.decode_request(kind, payload)
+        except protocol.ProtocolError:
+            return protocol.ERROR, bytes((protocol.ERR_MALFORMED,))
+        if game.is_over():
+            return protocol.ERROR, bytes((protocol.ERR_GAME_OVER,))
+
+        if kind == protocol.READY:
+            return await self.play_round(game)
+        if kind == protocol.BUY:
+            ok = args[0] < len(game.shop) and game.buy(args[0])
+        elif kind == protocol.SELL:
+            ok = game.sell(*args)
+        elif kind == protocol.REROLL:
+            ok = game.reroll()
+        else:
+            ok = game.place(*args)
+        if not ok:
+            return protocol.ERROR, bytes((protocol.ERR_INVALID,))
+        return protocol.STATE, protocol.encode_state(game)
+
+    async def play_round(self, game):
+        """ Shop del bot nel loop, battaglia nel pool di processi, economia di nuovo nel loop """
+        enemy_team, seed = game.prepare_battle()
+        args = (composition(game.board), composition(enemy_team), seed, self.dt)
+        if self.pool is None:
+            winner, battle_time = resolve_battle(*args)
+        else:
+            loop = asyncio.get_running_loop()
+            winner, battle_time = await loop.run_in_executor(self.pool, resolve_battle, *args)
+        row = game.finish_round(winner, battle_time)
+        self.battles += 1
+        return protocol.RESULT, protocol.encode_result(winner, row["gold_earned"], battle_time, game)
+
+    # --- Statistiche ---
+    def record(self, kind, elapsed):
+        self.messages += 1
+        samples = self.latency.get(kind)
+        if samples is None:
+            samples = self.latency[kind] = deque(maxlen=LATENCY_HISTORY)
+        samples.append(elapsed)
+
+    def stats_line(self):
+        ready = percentiles(self.latency.get(protocol.READY, ()))
+        actions = percentiles([t for kind, samples in self.latency.items()
+                               if kind != protocol.READY for t in samples])
+        return (f"lobby {self.lobbies:4d}  messaggi {self.messages:8d}  battaglie {self.battles:7d}  "
+                f"azioni p99 {actions.get(99, 0.0) * 1e3:6.2f} ms  "
+                f"round p99 {ready.get(99, 0.0) * 1e3:7.2f} ms")
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server multi-lobby (asyncio + pool di processi)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processi per le battaglie (default: tutti i core, 0 = nel loop)")
+    parser.add_argument("--max-lobbies", type=int, default=DEFAULT_MAX_LOBBIES)
+    parser.add_argument("--bot-budget", type=float, default=BOT_TIME_BUDGET,
+                        help="Secondi per la fase di shop del bot")
+    parser.add_argument("--stats", type=float, default=STATS_INTERVAL,
+                        help="Secondi fra le righe di statistiche (0 = mai)")
+    args = parser.parse_args()
+
+    server = LobbyServer(args.host, args.port, args.max_lobbies, args.workers, args.bot_budget)
+    try:
+        asyncio.run(server.serve_forever(args.stats))
+    except KeyboardInterrupt:
+        pass
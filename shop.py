@@ -1,7 +1,6 @@
 # shop.py
 import pygame
-import random
-from champions import Champion, get_available_champions
+from shop_core import ShopCore, BUY_COST, REROLL_COST
 
 # Importo da config.py
 from config import (
@@ -9,21 +8,17 @@ from config import (
     BLUE, LIGHT_BLUE, GRAY, GOLD, BLACK, GREEN, WHITE, RED, WIDTH, HEIGHT
 )
 
-class ShopManager:
+class ShopManager(ShopCore):
     """
-    Gestisce la logica e il rendering dello shop.
+    Gestisce il rendering e l'input dello shop (le regole sono in ShopCore).
     È controllato da game.py
     """
-    def __init__(self, game, champions_database):
+    def __init__(self, game, champions_database, seed=None, pool=None):
         self.game = game  # Riferimento alla classe Game principale
-        self.shop_size = 5
         self.card_size = (150, 150)
         self.spacing_x = 200
         self.margin_y = 180
         
-        self.champions_pool = champions_database
-        self.shop_champs = [] # I 5 campioni in vendita
-        
         # Riferimenti ai bottoni per i click
         # Usiamo 'game.screen' per ottenere WIDTH e HEIGHT
         screen_width = self.game.screen.get_width()
@@ -38,126 +33,12 @@ class ShopManager:
         self.dragged_from_list = None # 'board' o 'bench'
         self.dragged_from_index = -1
         self.scroll_y = 0
+        self.last_drag_rect = None # Ultima posizione disegnata del campione trascinato
 
-        self.roll_shop(is_free=True)
-
-    def reset(self):
-        self.roll_shop(is_free=True)
-
-    def roll_shop(self, is_free=False):
-        if not is_free:
-            if self.game.player_gold >= 2:
-                self.game.player_gold -= 2
-            else:
-                print("Oro non sufficiente per il Reroll!")
-                return
-                
-        self.shop_champs = [random.choice(self.champions_pool) for _ in range(self.shop_size)]
-        
-        # for champ in self.shop_champs:
-            # Carichiamo le immagini
-            # if champ and champ.image_path:
-            #     try:
-            #         img = pygame.image.load(champ.image_path).convert_alpha()
-            #         champ.image = pygame.transform.scale(img, self.card_size)
-            #     except Exception as e:
-            #         print(f"Errore img shop: {e}")
-            #         champ.image = None
-        print("Shop ricaricato.")
-
-    # --- Acquisto Campione ---
-    def buy_champion(self, champ_to_buy, shop_slot_index):
-        # Controlla se la panchina è piena
-        if len(self.game.bench) >= self.game.bench_slots:
-            print("Panchina piena!")
-            return # Non comprare se non c'è spazio
-
-        if self.game.player_gold >= 3:
-            self.game.player_gold -= 3
-            
-            bought_champ = self.shop_champs[shop_slot_index]
-            self.shop_champs[shop_slot_index] = None # Slot vuoto
-            
-            # Aggiungi il campione alla panchina
-            self.game.bench.append(bought_champ)
-            print(f"Comprato: {bought_champ.name}. Aggiunto alla panchina.")
-            
-            # Controlla i merge dopo ogni acquisto
-            self.merge_champions(bought_champ)
-        else:
-            print("Oro non sufficiente!")
-
-    # --- Controllo Merge ---
-    def merge_champions(self, champ_just_added):
-        """
-        Controlla i merge per il campione appena aggiunto.
-        Scansiona sia board che bench.
-        """
-        if not champ_just_added:
-            return False
-
-        name_to_check = champ_just_added.name
-        level_to_check = getattr(champ_just_added, 'level', 1)
-        
-        # 1. Trova tutte le copie (in entrambe le liste)
-        copies_in_board = [c for c in self.game.board if c and c.name == name_to_check and getattr(c, 'level', 1) == level_to_check]
-        copies_in_bench = [c for c in self.game.bench if c and c.name == name_to_check and getattr(c, 'level', 1) == level_to_check]
-        all_copies = copies_in_board + copies_in_bench
-        
-        if len(all_copies) < 3:
-            return False # Non c'è un merge
+        super().__init__(game, champions_database, seed, pool)
 
-        print(f"MERGE DI {name_to_check} Lvl {level_to_check}!")
-        base_champ = all_copies[0]
-        
-        # 2. Rimuovi le 3 copie (da qualsiasi lista provengano)
-        count = 0
-        for champ_to_remove in all_copies[:3]:
-            if champ_to_remove in self.game.board:
-                self.game.board.remove(champ_to_remove)
-            elif champ_to_remove in self.game.bench:
-                self.game.bench.remove(champ_to_remove)
-            count += 1
-            
-        # 3. Crea il campione potenziato
-        new_level = level_to_check + 1
-        multiplier = 1.6 if new_level == 2 else 2.5 # Lvl 2 o Lvl 3+
-        
-        upgraded = Champion(
-            base_champ.name, 
-            int(base_champ.hp * multiplier), 
-            int(base_champ.base_attack * multiplier), 
-            # base_champ.image_path,
-            int(getattr(base_champ, 'defense', 0) * multiplier),
-            getattr(base_champ, 'crit_chance', 0.1),
-            getattr(base_champ, 'mana_max', 100),
-            getattr(base_champ, 'mana_start', 0),
-            getattr(base_champ, 'attack_speed', 0.7),
-            getattr(base_champ, 'attack_range', 1),
-            # getattr(base_champ, 'sprite_path', None), 
-            # getattr(base_champ, 'sprite_offset_y', 0)
-        )
-        upgraded.level = new_level
-        upgraded.max_hp = upgraded.hp
-        
-       #  if upgraded.image_path:
-           # try:
-             #   img = pygame.image.load(upgraded.image_path).convert_alpha()
-              #  upgraded.image = pygame.transform.scale(img, self.card_size)
-           # except Exception as e:
-           #     upgraded.image = None
-        
-        # 4. Aggiungi il campione potenziato alla panchina (se c'è spazio)
-        if len(self.game.bench) < self.game.bench_slots:
-            self.game.bench.append(upgraded)
-            print(f"Creato {upgraded.name} Lvl {upgraded.level} e messo in panchina.")
-            # Controlla ricorsivamente se questo nuovo campione crea un altro merge!
-            self.merge_champions(upgraded)
-        else:
-            print(f"Creato {upgraded.name} Lvl {upgraded.level}, ma panchina piena! Campione perso.")
-            # In un vero TFT, il campione verrebbe "spostato". Per ora, è perso.
-            
-        return True
+    def notify(self, message):
+        print(message)
 
     # Sostituisci l'intero metodo handle_event
     def handle_event(self, event):
@@ -215,14 +96,12 @@ class ShopManager:
                 # Controlla scacchiera
                 for i, rect in enumerate(board_rects):
                     if rect.collidepoint(mouse_pos) and i < len(self.game.board) and self.game.board[i]:
-                        champ_to_sell = self.game.board.pop(i)
-                        self.sell_champion(champ_to_sell)
+                        self.sell_at("board", i)
                         return # Venduto
                 # Controlla panchina
                 for i, rect in enumerate(bench_rects):
                     if rect.collidepoint(mouse_pos) and i < len(self.game.bench) and self.game.bench[i]:
-                        champ_to_sell = self.game.bench.pop(i)
-                        self.sell_champion(champ_to_sell)
+                        self.sell_at("bench", i)
                         return # Venduto
                 return # Click destro a vuoto
 
@@ -262,18 +141,13 @@ class ShopManager:
     
     # Aggiungi questi metodi alla classe ShopManager
 
-    def sell_champion(self, champion):
-        """ Logica di vendita """
-        # Per ora prezzo fisso, in futuro dipenderà dal costo/livello
-        sell_price = 2
-        self.game.player_gold += sell_price
-        print(f"Venduto {champion.name} per {sell_price}g. Oro totale: {self.game.player_gold}")
-
     def start_dragging(self, from_list, index):
         """ Prepara un campione per il trascinamento """
         if self.is_dragging: return # Stai già trascinando
         
         self.dragged_champ = from_list.pop(index) # Rimuovi e tieni in mano
+        self.copy_index.remove(self.dragged_champ) # In mano: fuori dall'indice
+        self.copy_index.reindex(self.list_name(from_list), from_list, index)
         self.dragged_from_list = from_list # Salva da dove è venuto (la lista stessa)
         self.dragged_from_index = index # Salva lo slot originale
         self.is_dragging = True
@@ -283,15 +157,14 @@ class ShopManager:
         """ Piazza il campione trascinato in uno slot (o scambia) """
         
         # Assicura che le liste non siano più grandi del loro max
-        while len(self.game.board) > self.game.board_slots: self.game.board.pop()
-        while len(self.game.bench) > self.game.bench_slots: self.game.bench.pop()
+        while len(self.game.board) > self.game.board_slots: self.copy_index.remove(self.game.board.pop())
+        while len(self.game.bench) > self.game.bench_slots: self.copy_index.remove(self.game.bench.pop())
         
         # Controlla se lo slot di destinazione è vuoto
         if target_index >= len(target_list):
+            # (Il campione è già stato tolto dalla lista d'origine in start_dragging:
+            # non c'è nessun segnaposto da rimuovere)
             target_list.append(self.dragged_champ)
-            # Rimuovi placeholder se necessario (dopo uno swap)
-            if self.dragged_from_list == target_list and self.dragged_from_index < len(target_list):
-                 target_list.pop(self.dragged_from_index)
         else:
             # Lo slot è occupato: SCAMBIA
             champ_in_slot = target_list[target_index]
@@ -299,6 +172,11 @@ class ShopManager:
             # Rimetti il campione scambiato da dove sei venuto
             self.dragged_from_list.insert(self.dragged_from_index, champ_in_slot)
             
+        # Un drop può far scorrere gli slot di entrambe le liste (anche se sono la stessa):
+        # è un evento raro, si riallineano per intero
+        self.copy_index.add(self.dragged_champ, self.list_name(target_list), 0)
+        self.copy_index.reindex("board", self.game.board)
+        self.copy_index.reindex("bench", self.game.bench)
         self.is_dragging = False
         self.dragged_champ = None
 
@@ -306,6 +184,10 @@ class ShopManager:
         """ Rimette il campione nello slot originale se il drop è invalido """
         if self.dragged_champ:
             self.dragged_from_list.insert(self.dragged_from_index, self.dragged_champ)
+            # (Se nel frattempo un merge ha accorciato la lista, insert lo mette in fondo)
+            where = self.list_name(self.dragged_from_list)
+            self.copy_index.add(self.dragged_champ, where, 0)
+            self.copy_index.reindex(where, self.dragged_from_list)
         self.is_dragging = False
         self.dragged_champ = None
 
@@ -329,6 +211,55 @@ class ShopManager:
             rects.append(pygame.Rect(x, y, 150, 150))
         return rects
 
+    def collect_dirty(self, regions):
+        """
+        Segna in 'regions' (DirtyRegions) le zone dello shop cambiate
+        dall'ultimo frame: contatori, carte, slot di scacchiera/panchina,
+        bottoni e campione trascinato.
+        """
+        screen_width = self.game.screen.get_width()
+        if regions.track("shop_scroll", self.scroll_y, regions.screen_rect):
+            regions.mark_all() # Lo scroll sposta tutto
+
+        # Contatori in alto (Oro, HP, Round)
+        regions.track("shop_header",
+                      (self.game.player_gold, self.game.player_hp, self.game.round_number),
+                      (0, 0, screen_width, 110))
+
+        # Carte in vendita + bottoni Compra (dipendono anche dall'oro)
+        shop_key = tuple((c.name, self.can_buy(c)) if c else None for c in self.shop_champs)
+        shop_top = self.margin_y + self.scroll_y
+        regions.track("shop_cards", shop_key, (0, shop_top - 5, screen_width, self.card_size[1] + 90))
+
+        # Scacchiera e panchina: etichetta col conteggio + uno slot alla volta
+        for list_name, champs, rects, label_y in (
+                ("board", self.game.board, self.get_board_rects(), HEIGHT - 330),
+                ("bench", self.game.bench, self.get_bench_rects(), HEIGHT - 100)):
+            label_rect = (0, label_y + self.scroll_y - 25, screen_width, 50)
+            regions.track(f"{list_name}_label", len(champs), label_rect)
+            for i, rect in enumerate(rects):
+                champ = champs[i] if i < len(champs) else None
+                key = (champ.name, getattr(champ, "level", 1)) if champ else None
+                # Lo slot + stelle sopra + nome sotto
+                area = pygame.Rect(rect.left - 20, rect.top - 20, rect.width + 40, rect.height + 55)
+                regions.track(f"{list_name}_{i}", key, area)
+
+        # Bottoni in basso
+        regions.track("shop_buttons", len(self.game.board) > 0,
+                      self.refresh_button_rect.union(self.confirm_button_rect))
+
+        # Campione trascinato: vecchia e nuova posizione del cerchio
+        drag_rect = None
+        if self.is_dragging and self.dragged_champ:
+            drag_rect = pygame.Rect(0, 0, 84, 84)
+            drag_rect.center = pygame.mouse.get_pos()
+        if drag_rect != self.last_drag_rect:
+            if self.last_drag_rect:
+                regions.mark(self.last_drag_rect)
+            if drag_rect:
+                regions.mark(drag_rect)
+            self.last_drag_rect = drag_rect
+
     # Sostituisci l'intero metodo draw con questo CORRETTO
     def draw(self, surface):
         surface.fill((20, 20, 20))
@@ -357,10 +288,9 @@ class ShopManager:
                 # Bottone Compra
                 buy_button = pygame.Rect(x, y + self.card_size[1] + 40, self.card_size[0], 40)
                 self.buy_buttons.append(buy_button) 
-                can_buy = self.game.player_gold >= 3 and len(self.game.bench) < self.game.bench_slots
-                btn_color = GREEN if can_buy else GRAY
+                btn_color = GREEN if self.can_buy(champ) else GRAY
                 pygame.draw.rect(surface, btn_color, buy_button, border_radius=8)
-                draw_text("Compra (3g)", TEXT_FONT, BLACK, surface, buy_button.centerx, buy_button.centery)
+                draw_text(f"Compra ({BUY_COST}g)", TEXT_FONT, BLACK, surface, buy_button.centerx, buy_button.centery)
             else:
                 pygame.draw.rect(surface, (30,30,30), card_rect, border_radius=10)
                 self.buy_buttons.append(pygame.Rect(0,0,0,0)) 
@@ -413,7 +343,7 @@ class ShopManager:
 
         # --- UI BASSA (FISSA) ---
         pygame.draw.rect(surface, LIGHT_BLUE, self.refresh_button_rect, border_radius=10)
-        draw_text("Reroll (-2g)", BUTTON_FONT, WHITE, surface, self.refresh_button_rect.centerx, self.refresh_button_rect.centery)
+        draw_text(f"Reroll (-{REROLL_COST}g)", BUTTON_FONT, WHITE, surface, self.refresh_button_rect.centerx, self.refresh_button_rect.centery)
         can_confirm = len(self.game.board) > 0 
         btn_color = BLUE if can_confirm else GRAY
         pygame.draw.rect(surface, btn_color, self.confirm_button_rect, border_radius=10)
@@ -0,0 +1,204 @@
+# shop_core.py
+# Logica dello shop SENZA pygame: estrazioni dal pool, acquisti, vendite,
+# merge e spostamenti fra scacchiera e panchina.
+# ShopManager (shop.py) eredita da qui e aggiunge input e rendering;
+# il simulatore headless (headless.py) la usa così com'è.
+import random
+
+from registry import ChampionRegistry
+from pool import ChampionPool, copies_for_level
+from copy_index import CopyIndex
+from events import LOG, INFO, MERGE, REROLL
+
+# --- Costi dello shop ---
+BUY_COST = 3
+REROLL_COST = 2
+SELL_PRICE = 2 # Per ora prezzo fisso, in futuro dipenderà dal costo/livello
+
+
+class ShopCore:
+    """
+    Stato e regole dello shop di UN giocatore.
+    'game' è chi possiede i dati del giocatore (GameCore o Game):
+    player_gold, player_level, board, bench, board_slots, bench_slots.
+    Le azioni restituiscono True se sono andate a buon fine.
+    """
+    def __init__(self, game, champions_database, seed=None, pool=None):
+        self.game = game  # Riferimento a chi possiede i dati del giocatore
+        self.rng = random.Random(seed) # Generatore dello shop (riproducibile col seme)
+        self.shop_size = 5
+
+        self.registry = ChampionRegistry.of(champions_database)
+        # Pool condiviso (copie finite per tier): di solito è quello della partita
+        self.pool = pool if pool is not None else ChampionPool(self.registry)
+        self.shop_champs = [] # I 5 campioni in vendita
+
+        # Copie possedute per (nome, livello): merge in O(1)
+        self.copy_index = CopyIndex()
+        self.copy_index.rebuild(self.game.board, self.game.bench)
+
+        self.roll_shop(is_free=True)
+
+    def notify(self, message):
+        """ Messaggio per il giocatore (headless: nessuno lo legge) """
+        pass
+
+    def reset(self):
+        self.copy_index.rebuild(self.game.board, self.game.bench)
+        self.roll_shop(is_free=True)
+
+    def roll_shop(self, is_free=False):
+        if not is_free:
+            if self.game.player_gold >= REROLL_COST:
+                self.game.player_gold -= REROLL_COST
+            else:
+                self.notify("Oro non sufficiente per il Reroll!")
+                return False
+
+        # Estrazione dal pool secondo il livello del giocatore (None = pool vuoto)
+        rolled = self.pool.roll(self.game.player_level, self.rng, self.shop_size)
+        self.shop_champs = [self.registry.get(i) if i is not None else None for i in rolled]
+
+        if LOG.level <= INFO:
+            LOG.emit(REROLL, INFO, value=self.game.player_gold,
+                     detail="gratis" if is_free else f"-{REROLL_COST}g")
+        return True
+
+    # --- Acquisto Campione ---
+    def buy_champion(self, champ_to_buy, shop_slot_index):
+        shop_champ = self.shop_champs[shop_slot_index]
+        if shop_champ is None:
+            return False
+        # Controlla se la panchina è piena (si può comprare lo stesso se completa un merge)
+        if len(self.game.bench) >= self.game.bench_slots and not self.completes_merge(shop_champ):
+            self.notify("Panchina piena!")
+            return False # Non comprare se non c'è spazio
+
+        if self.game.player_gold < BUY_COST:
+            self.notify("Oro non sufficiente!")
+            return False
+        if not self.pool.take(shop_champ.name):
+            self.notify(f"{shop_champ.name}: copie esaurite nel pool!")
+            return False
+        self.game.player_gold -= BUY_COST
+        self.shop_champs[shop_slot_index] = None # Slot vuoto
+
+        # Aggiungi alla panchina un campione NUOVO (quello dello shop è solo "da catalogo")
+        bought_champ = self.registry.create(shop_champ.name, 1)
+        self.game.bench.append(bought_champ)
+        self.copy_index.add(bought_champ, "bench", len(self.game.bench) - 1)
+        self.notify(f"Comprato: {bought_champ.name}. Aggiunto alla panchina.")
+
+        # Controlla i merge dopo ogni acquisto
+        self.merge_champions(bought_champ)
+        return True
+
+    def can_buy(self, champ):
+        """ Oro sufficiente e spazio in panchina (o l'acquisto completa un merge) """
+        return self.game.player_gold >= BUY_COST and (
+            len(self.game.bench) < self.game.bench_slots or self.completes_merge(champ))
+
+    def completes_merge(self, champ):
+        """ True se comprare 'champ' (Lvl 1) porta a 3 copie, cioè a un merge immediato """
+        return champ is not None and self.copy_index.count(champ.name, 1) >= 2
+
+    # --- Controllo Merge ---
+    def merge_champions(self, champ_just_added):
+        """
+        Controlla i merge per il campione appena aggiunto (anche a catena:
+        3 Lvl 1 -> Lvl 2, e se ci sono già 2 Lvl 2 -> Lvl 3).
+        Le copie e i loro slot si trovano nell'indice (O(1)); il campione
+        potenziato prende lo slot della prima copia (in scacchiera se ce n'è una lì).
+        """
+        merged = False
+        champ = champ_just_added
+        while champ:
+            trio = self.copy_index.merge_candidates(champ)
+            if trio is None:
+                break
+
+            # 1. Lo slot liberato: preferiamo una copia già in scacchiera
+            keep = next((c for c in trio if self.copy_index.where(c) == "board"), trio[0])
+
+            # 2. Rimuovi le altre 2 copie (da qualsiasi lista provengano)
+            for copy in trio:
+                if copy is not keep:
+                    self.remove_owned(copy)
+
+            # 3. Crea il campione potenziato (statistiche già pronte nel registro)
+            upgraded = self.registry.create(keep.name, getattr(keep, 'level', 1) + 1)
+
+            # 4. Mettilo al posto della copia tenuta (slot letto DOPO le rimozioni, che lo fanno scorrere)
+            where, slot = self.copy_index.slot_of(keep)
+            getattr(self.game, where)[slot] = upgraded
+            self.copy_index.remove(keep)
+            self.copy_index.add(upgraded, where, slot)
+            if LOG.level <= INFO:
+                LOG.emit(MERGE, INFO, upgraded.name, value=upgraded.level,
+                         detail="in scacchiera" if where == "board" else "in panchina")
+            merged = True
+            champ = upgraded # Il nuovo campione può creare un altro merge!
+        return merged
+
+    def remove_owned(self, champ):
+        """ Toglie un campione posseduto dalla sua lista (per slot) e dall'indice """
+        found = self.copy_index.slot_of(champ)
+        self.copy_index.remove(champ)
+        if found:
+            where, slot = found
+            champs = getattr(self.game, where)
+            del champs[slot]
+            self.copy_index.reindex(where, champs, slot)
+
+    # --- Vendita ---
+    def sell_champion(self, champion):
+        """ Logica di vendita (il campione è già stato tolto dalla sua lista) """
+        self.game.player_gold += SELL_PRICE
+        self.copy_index.remove(champion)
+        # Le copie tornano nel pool condiviso (un Lvl 2 ne vale 3)
+        self.pool.put_back(champion.name, copies_for_level(getattr(champion, 'level', 1)))
+        self.notify(f"Venduto {champion.name} per {SELL_PRICE}g. Oro totale: {self.game.player_gold}")
+        return True
+
+    def sell_at(self, where, index):
+        """ Vende il campione nello slot 'index' di 'board' o 'bench' """
+        champs = getattr(self.game, where)
+        if not 0 <= index < len(champs) or not champs[index]:
+            return False
+        self.sell_champion(champs.pop(index))
+        self.copy_index.reindex(where, champs, index)
+        return True
+
+    # --- Spostamenti (senza mouse) ---
+    def move_champion(self, from_where, from_index, to_where, to_index=None):
+        """
+        Sposta un campione fra 'board' e 'bench' (o dentro la stessa lista).
+        Slot vuoto (o to_index None): il campione va in fondo alla lista,
+        se c'è posto. Slot occupato: i due campioni si scambiano.
+        """
+        source = getattr(self.game, from_where)
+        target = getattr(self.game, to_where)
+        if not 0 <= from_index < len(source):
+            return False
+        champ = source[from_index]
+        if to_index is None or to_index >= len(target):
+            if target is not source and len(target) >= self.slots_of(to_where):
+                return False # Lista piena
+            source.pop(from_index)
+            target.append(champ)
+            self.copy_index.move(champ, to_where, len(target) - 1)
+            self.copy_index.reindex(from_where, source, from_index)
+        else:
+            other = target[to_index]
+            target[to_index] = champ
+            source[from_index] = other
+            self.copy_index.move(other, from_where, from_index)
+            self.copy_index.move(champ, to_where, to_index)
+        return True
+
+    def slots_of(self, where):
+        return self.game.board_slots if where == "board" else self.game.bench_slots
+
+    def list_name(self, champ_list):
+        """ 'board' o 'bench' (i nomi usati dall'indice delle copie) """
+        return "board" if champ_list is self.game.board else "bench"
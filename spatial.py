@@ -0,0 +1,146 @@
+# spatial.py
+# Indice spaziale a griglia uniforme (spatial hash) per le query di battaglia:
+# nemico più vicino e "tutti entro un raggio" senza scansionare l'intera squadra.
+import math
+
+# Lato di una cella in pixel (circa un range melee)
+DEFAULT_CELL_SIZE = 100
+
+
+class SpatialGrid:
+    """
+    Griglia uniforme di campioni di UNA squadra.
+    Ogni cella contiene coppie (ordine, campione): l'ordine è la posizione
+    nella squadra e serve a risolvere i pareggi di distanza esattamente come
+    la scansione lineare (vince il primo campione della lista).
+    Le query leggono sempre la posizione attuale (champ.x, champ.y):
+    basta chiamare update() quando un campione cambia cella.
+    """
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self.cells = {} # (cx, cy) -> lista di (ordine, campione)
+        self.cell_of = {} # campione -> (cx, cy)
+        self.order_of = {} # campione -> ordine nella squadra
+        self.min_cx = self.min_cy = 0
+        self.max_cx = self.max_cy = -1 # Griglia vuota
+
+    def cell_key(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def rebuild(self, champs):
+        """ Ricostruisce la griglia con i campioni vivi di 'champs' """
+        self.cells.clear()
+        self.cell_of.clear()
+        self.order_of.clear()
+        self.min_cx = self.min_cy = 0
+        self.max_cx = self.max_cy = -1
+        for order, champ in enumerate(champs):
+            if champ.is_alive():
+                self.order_of[champ] = order
+                self._insert(champ, self.cell_key(champ.x, champ.y))
+
+    def _insert(self, champ, key):
+        bucket = self.cells.get(key)
+        if bucket is None:
+            bucket = self.cells[key] = []
+            if self.max_cx < self.min_cx:
+                self.min_cx, self.min_cy = key
+                self.max_cx, self.max_cy = key
+            else:
+                self.min_cx = min(self.min_cx, key[0])
+                self.min_cy = min(self.min_cy, key[1])
+                self.max_cx = max(self.max_cx, key[0])
+                self.max_cy = max(self.max_cy, key[1])
+        bucket.append((self.order_of[champ], champ))
+        self.cell_of[champ] = key
+
+    def update(self, champ):
+        """ Da chiamare dopo che 'champ' si è mosso: cambia cella se serve """
+        old_key = self.cell_of.get(champ)
+        if old_key is None:
+            return
+        new_key = self.cell_key(champ.x, champ.y)
+        if new_key == old_key:
+            return
+        self.remove(champ)
+        self._insert(champ, new_key)
+
+    def remove(self, champ):
+        """ Toglie un campione dalla griglia (es. quando muore) """
+        key = self.cell_of.pop(champ, None)
+        if key is None:
+            return
+        bucket = self.cells[key]
+        for i, (_, other) in enumerate(bucket):
+            if other is champ:
+                bucket.pop(i)
+                break
+        if not bucket:
+            del self.cells[key]
+        # Il bounding box resta "largo": è solo un limite superiore per la ricerca
+
+    def nearest(self, x, y):
+        """
+        Campione vivo più vicino a (x, y), o None se la griglia è vuota.
+        Cerca ad anelli di celle crescenti attorno al punto e si ferma quando
+        nessuna cella più lontana può contenere un campione più vicino.
+        """
+        if not self.cells:
+            return None
+        cx, cy = self.cell_key(x, y)
+        # Oltre questo anello non ci sono celle occupate
+        max_ring = max(abs(cx - self.min_cx), abs(cx - self.max_cx),
+                       abs(cy - self.min_cy), abs(cy - self.max_cy))
+
+        best = None
+        best_d2 = float('inf')
+        best_order = 0
+        for ring in range(max_ring + 1):
+            # Ogni punto nell'anello 'ring' (e oltre) dista almeno (ring - 1) * cell_size
+            if best is not None and ring > 1:
+                limit = (ring - 1) * self.cell_size
+                if best_d2 < limit * limit:
+                    break
+            for key in self._ring_cells(cx, cy, ring):
+                bucket = self.cells.get(key)
+                if not bucket:
+                    continue
+                for order, champ in bucket:
+                    if not champ.is_alive():
+                        continue
+                    d2 = (champ.x - x) ** 2 + (champ.y - y) ** 2
+                    if d2 < best_d2 or (d2 == best_d2 and order < best_order):
+                        best, best_d2, best_order = champ, d2, order
+        return best
+
+    def query_radius(self, x, y, radius):
+        """ Campioni vivi a distanza STRETTAMENTE minore di 'radius', in ordine di squadra """
+        if not self.cells:
+            return []
+        r2 = radius * radius
+        min_cx, min_cy = self.cell_key(x - radius, y - radius)
+        max_cx, max_cy = self.cell_key(x + radius, y + radius)
+        found = []
+        for gx in range(max(min_cx, self.min_cx), min(max_cx, self.max_cx) + 1):
+            for gy in range(max(min_cy, self.min_cy), min(max_cy, self.max_cy) + 1):
+                bucket = self.cells.get((gx, gy))
+                if not bucket:
+                    continue
+                for order, champ in bucket:
+                    if champ.is_alive() and (champ.x - x) ** 2 + (champ.y - y) ** 2 < r2:
+                        found.append((order, champ))
+        found.sort(key=lambda item: item[0])
+        return [champ for _, champ in found]
+
+    @staticmethod
+    def _ring_cells(cx, cy, ring):
+        """ Celle sul perimetro del quadrato di raggio 'ring' attorno a (cx, cy) """
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for gx in range(cx - ring, cx + ring + 1):
+            yield (gx, cy - ring)
+            yield (gx, cy + ring)
+        for gy in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, gy)
+            yield (cx + ring, gy)
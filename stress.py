@@ -0,0 +1,162 @@
+# stress.py
+# Battaglie "di stress" con squadre grandi quanto si vuole, schierate da
+# battle_core.formation_positions, fatte girare dal BattleManager vero
+# (update + draw, come nel gioco) su una finestra fuori schermo.
+# Per ogni numero di unità misura:
+# - tick di simulazione al secondo (solo update)
+# - tempo di frame (update + draw) p50/p95/max, con FrameTimer
+# - memoria Python allocata da battaglia e primi frame (tracemalloc: le
+#   Surface di pygame stanno fuori dall'heap Python e non sono contate)
+# e dice da quante unità in su il frame non sta più nel budget dei 60 FPS.
+#
+# Uso:
+#   python stress.py                           # 6 -> 1000 unità
+#   python stress.py --sizes 60,600 --frames 300
+#   python stress.py --headless --json stress.json
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+
+from frame_timing import FrameTimer, FRAME_BUDGET
+from registry import get_registry
+
+DEFAULT_SIZES = (6, 20, 60, 120, 250, 500, 1000)
+DEFAULT_FRAMES = 180 # 3 secondi di gioco a 60 FPS
+MEMORY_FRAMES = 30 # Frame eseguiti sotto tracemalloc (è lento: ne bastano pochi)
+FRAME_DT = 1.0 / 60.0
+SEED = 1234
+
+
+def make_team(size, rng):
+    """ Squadra casuale di 'size' campioni (un quinto a 2 stelle) """
+    registry = get_registry()
+    return [registry.create(rng.choice(registry.champions).name, 2 if rng.random() < 0.2 else 1)
+            for _ in range(size)]
+
+
+def make_battle(units, headless=False, seed=SEED):
+    """ Battaglia con 'units' unità in totale, metà per squadra """
+    rng = random.Random(seed)
+    half = units // 2
+    player, enemy = make_team(half, rng), make_team(units - half, rng)
+    if headless:
+        from battle_core import BattleCore
+        return BattleCore(player, enemy, get_registry(), seed)
+    from battle import BattleManager
+    return BattleManager(player, enemy, get_registry(), seed)
+
+
+def offscreen_surface():
+    """ pygame senza finestra vera (driver "dummy"); la Surface è grande come lo schermo """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from config import WIDTH, HEIGHT
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((WIDTH, HEIGHT))
+    return pygame.display.get_surface()
+
+
+def run_frames(battle, frames, timer, surface=None):
+    """
+    'frames' frame del gioco, misurati da 'timer' (FrameTimer): update (a 1x
+    è un passo fisso per frame) e, se c'è una Surface, draw.
+    Restituisce i tick simulati.
+    """
+    start_ticks = battle.ticks
+    for _ in range(frames):
+        if battle.is_over:
+            break
+        timer.begin_frame()
+        with timer.phase("update"):
+            if surface is None:
+                battle.step(FRAME_DT)
+            else:
+                battle.update(FRAME_DT)
+        if surface is not None:
+            with timer.phase("draw"):
+                battle.draw(surface)
+        timer.end_frame()
+    return battle.ticks - start_ticks
+
+
+def measure_memory(units, headless=False):
+    """ Memoria Python (MB) della battaglia appena creata e picco nei primi frame """
+    surface = None if headless else offscreen_surface()
+    tracemalloc.start()
+    try:
+        battle = make_battle(units, headless)
+        built = tracemalloc.get_traced_memory()[0]
+        run_frames(battle, MEMORY_FRAMES, FrameTimer(history=MEMORY_FRAMES), surface)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return built / 2 ** 20, peak / 2 ** 20
+
+
+def measure(units, frames=DEFAULT_FRAMES, headless=False):
+    """ Una riga di risultati per 'units' unità """
+    surface = None if headless else offscreen_surface()
+    start = time.perf_counter()
+    battle = make_battle(units, headless)
+    setup_time = time.perf_counter() - start
+
+    timer = FrameTimer(history=frames)
+    ticks = run_frames(battle, frames, timer, surface)
+    phases = timer.phase_averages()
+    update_time = phases.get("update", 0.0) * len(timer.frames)
+    stats = timer.percentiles((50, 95))
+    built_mb, peak_mb = measure_memory(units, headless)
+    return {
+        "units": units,
+        "setup_ms": setup_time * 1e3,
+        "frames": len(timer.frames),
+        "ticks_per_second": ticks / update_time if update_time else 0.0,
+        "update_ms": phases.get("update", 0.0) * 1e3,
+        "draw_ms": phases.get("draw", 0.0) * 1e3,
+        "frame_p50_ms": stats.get(50, 0.0) * 1e3,
+        "frame_p95_ms": stats.get(95, 0.0) * 1e3,
+        "frame_max_ms": stats.get("max", 0.0) * 1e3,
+        "memory_mb": built_mb,
+        "memory_peak_mb": peak_mb,
+        "alive": sum(1 for c in battle.all_champs if c.is_alive()),
+    }
+
+
+def print_row(row):
+    print(f"{row['units']:>6d} {row['ticks_per_second']:>10.0f} {row['update_ms']:>9.2f} "
+          f"{row['draw_ms']:>8.2f} {row['frame_p50_ms']:>8.2f} {row['frame_p95_ms']:>8.2f} "
+          f"{row['memory_mb']:>8.2f} {row['memory_peak_mb']:>8.2f} {row['alive']:>6d}")
+
+
+#--- AVVIO DA RIGA DI COMANDO ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Battaglie di stress: scalabilità con il numero di unità")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Unità totali per battaglia, separate da virgola")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Frame misurati per battaglia")
+    parser.add_argument("--headless", action="store_true", help="Solo simulazione (BattleCore), niente draw")
+    parser.add_argument("--json", default=None, help="Salva i risultati in questo file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    print(f"{'unità':>6s} {'tick/s':>10s} {'update ms':>9s} {'draw ms':>8s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'mem MB':>8s} {'picco MB':>8s} {'vivi':>6s}")
+    rows = []
+    for units in sizes:
+        row = measure(units, args.frames, args.headless)
+        rows.append(row)
+        print_row(row)
+
+    over_budget = [row["units"] for row in rows if row["frame_p95_ms"] > FRAME_BUDGET * 1e3]
+    if over_budget:
+        print(f"Oltre il budget di {FRAME_BUDGET * 1e3:.1f} ms (p95) da {over_budget[0]} unità")
+    else:
+        print(f"Tutti i frame nel budget di {FRAME_BUDGET * 1e3:.1f} ms (p95)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
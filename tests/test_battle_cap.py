@@ -0,0 +1,57 @@
+# tests/test_battle_cap.py
+# Il limite di MAX_BATTLE_TIME vale per ogni modo di far avanzare la battaglia:
+# update() del BattleManager (partita guardata) e run() (salto al risultato).
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from battle import BattleManager
+from battle_core import MAX_BATTLE_TIME
+from champions import Champion, ChampionTemplate
+from scheduler import MAX_FRAME_TIME
+
+
+def stalemate_database():
+    """ Un solo campione fermo e melee: schierati ai lati non si raggiungono mai """
+    template = ChampionTemplate("Statua", hp=500, attack=10, attack_range=1, move_speed=0)
+    return [Champion.from_template(template)]
+
+
+class BattleCapTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def make_battle(self):
+        database = stalemate_database()
+        return BattleManager(database, database, database, seed=1)
+
+    def test_update_ends_in_draw_after_max_time(self):
+        battle = self.make_battle()
+        battle.scheduler.set_speed(16)
+        frames = int((MAX_BATTLE_TIME + 10) / (MAX_FRAME_TIME * 16)) + 1
+        for _ in range(frames):
+            battle.update(MAX_FRAME_TIME)
+        self.assertTrue(battle.is_over)
+        self.assertEqual(battle.winner, "draw")
+        self.assertAlmostEqual(battle.elapsed_time, MAX_BATTLE_TIME, places=6)
+
+    def test_update_and_skip_end_alike(self):
+        watched = self.make_battle()
+        while not watched.is_over:
+            watched.update(MAX_FRAME_TIME)
+        skipped = self.make_battle()
+        skipped.skip_to_result()
+        self.assertEqual(watched.winner, skipped.winner)
+        self.assertEqual(watched.ticks, skipped.ticks)
+
+
+if __name__ == "__main__":
+    unittest.main()